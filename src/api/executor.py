@@ -0,0 +1,80 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Worker pool sizing, overridable through the environment.
+DEFAULT_WORKERS = int(os.getenv("API_WORKERS", "4"))
+DEFAULT_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "16"))
+DEFAULT_TIMEOUT = float(os.getenv("API_REQUEST_TIMEOUT", "600"))
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the waiting queue is full."""
+
+
+class RequestTimeout(Exception):
+    """Raised when a job did not finish within its per-request timeout."""
+
+
+class CrewExecutor:
+    """
+    Bounded worker pool for blocking crew kickoffs.
+
+    At most `workers` jobs run at once and at most `max_queue` more wait for a worker. A job
+    submitted beyond that is rejected immediately with PoolSaturated (mapped to HTTP 429), so
+    requests never pile up unbounded behind long LLM runs. A job that does not finish within its
+    timeout raises RequestTimeout; its admission slot is only released when the underlying thread
+    actually finishes, so the backpressure stays accurate.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew-worker")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently running or queued."""
+        return self._in_flight
+
+    def _admit(self):
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated(f"All {self.workers} workers are busy and {self.max_queue} requests are queued")
+        with self._lock:
+            self._in_flight += 1
+
+    def _done(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs):
+        """Admit and schedule `func` on the pool, returning a concurrent.futures.Future."""
+        self._admit()
+        try:
+            future = self._pool.submit(func, *args, **kwargs)
+        except Exception:
+            self._done()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    async def run(self, func: Callable[..., Any], *args, timeout: float = None, **kwargs) -> Any:
+        """Run `func` on the pool without blocking the event loop, honouring the request timeout."""
+        future = self.submit(func, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # Drop it if it has not started yet; a running kickoff cannot be interrupted
+            future.cancel()
+            raise RequestTimeout(f"Request did not complete within {timeout or self.timeout} seconds")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
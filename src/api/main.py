@@ -0,0 +1,37 @@
+from contextlib import asynccontextmanager
+import os
+import threading
+
+from fastapi import FastAPI
+
+from api.executor import CrewExecutor
+from api.routes import router, warm_orchestrator
+
+# Build the ArgoCD orchestrator (and its index on a cold start) in the background at startup,
+# instead of on the first ArgoCD request.
+API_WARM_ARGOCD = os.getenv("API_WARM_ARGOCD", "true").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One bounded worker pool per process for the blocking crew kickoffs
+    app.state.executor = CrewExecutor()
+    if API_WARM_ARGOCD:
+        threading.Thread(target=warm_orchestrator, args=(app.state.executor.workers,),
+                         name="argocd-warm-up", daemon=True).start()
+    try:
+        yield
+    finally:
+        app.state.executor.shutdown()
+
+
+app = FastAPI(title="DevOps Support API", lifespan=lifespan)
+app.include_router(router)
+
+
+def serve():
+    """
+    Serve the API with uvicorn: `uvicorn api.main:app` (from src/) or the `serve` script.
+    """
+    import uvicorn
+    uvicorn.run(app, host=os.getenv("API_HOST", "0.0.0.0"), port=int(os.getenv("API_PORT", "8000")))
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import threading
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from api.executor import PoolSaturated, RequestTimeout
+from devops_support.session_memory import DEFAULT_SESSION
+
+router = APIRouter()
+
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+# Seconds an ArgoCD stream waits for a free warm crew before it is rejected with 429.
+ARGOCD_CHECKOUT_TIMEOUT = float(os.getenv("ARGOCD_CHECKOUT_TIMEOUT", "5"))
+
+
+class CrewRequest(BaseModel):
+    query: str = Field(..., description="Natural-language question, e.g. 'can you check the status for application AuthService?'")
+    days: int = Field(20, ge=1, le=30, description="Number of days of data to analyze.")
+    timeout: float | None = Field(None, gt=0, description="Per-request timeout in seconds (defaults to the server setting).")
+
+
+class ArgoCDRequest(BaseModel):
+    query: str = Field(..., description="Question about ArgoCD.")
+    session_id: str = Field(DEFAULT_SESSION, min_length=1, description="Conversation the query and its answer belong to.")
+    timeout: float | None = Field(None, gt=0, description="Per-request timeout in seconds (defaults to the server setting).")
+
+
+class CrewResponse(BaseModel):
+    source: str
+    query: str
+    result: str
+    cached: bool = False
+
+
+def get_orchestrator(max_concurrency: int):
+    """Shared, warm orchestrator (built on the first ArgoCD request)."""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            from devops_support.orchestrator.orchestrator import Orchestator
+            _orchestrator = Orchestator(max_concurrency=max_concurrency)
+        return _orchestrator
+
+
+def warm_orchestrator(max_concurrency: int):
+    """
+    Build the shared orchestrator, its query engine (crawling and ingesting the documentation on a
+    cold start) and the docs fingerprint ahead of the first ArgoCD request.
+    """
+    try:
+        orchestrator = get_orchestrator(max_concurrency)
+        orchestrator.warm_up()
+        orchestrator.docs_fingerprint()
+    except Exception as e:
+        print(f"Warming up the ArgoCD orchestrator failed: {e}")
+
+
+def build_splunk_crew():
+    from devops_support.agents.splunk_agent import SplunkCrew
+    return SplunkCrew().crew()
+
+
+def build_datadog_crew():
+    from devops_support.agents.datadog_agent import DatadogCrew
+    return DatadogCrew().crew()
+
+
+def fetch_splunk(query: str, days: int) -> dict:
+    """Request state of a Splunk query: its inputs and its logs, fetched once for the whole request."""
+    from devops_support.agents.splunk_agent import fetch_splunk_data
+    inputs = {"query": query, "days": days}
+    return {"inputs": inputs, "data": fetch_splunk_data(inputs)}
+
+
+def fetch_datadog(query: str, days: int) -> dict:
+    """Request state of a Datadog query: its inputs and its data, fetched once for the whole request."""
+    from devops_support.agents.datadog_agent import fetch_datadog_data
+    inputs = {"query": query, "days": days}
+    return {"inputs": inputs, "data": fetch_datadog_data(inputs)}
+
+
+def fetch_argocd(query: str, max_concurrency: int, session_id: str) -> dict:
+    return {"query": query, "max_concurrency": max_concurrency, "session_id": session_id}
+
+
+def splunk_fingerprint(query: str, days: int) -> str:
+    from devops_support.agents.splunk_agent import splunk_fingerprint as fingerprint
+    return fingerprint({"query": query, "days": days})
+
+
+def datadog_fingerprint(query: str, days: int) -> str:
+    from devops_support.agents.datadog_agent import datadog_fingerprint as fingerprint
+    return fingerprint({"query": query, "days": days})
+
+
+def argocd_fingerprint(query: str, max_concurrency: int, session_id: str) -> str:
+    return get_orchestrator(max_concurrency).docs_fingerprint()
+
+
+def run_splunk(state: dict) -> str:
+    from devops_support.agents.splunk_agent import splunk_kickoff_inputs, splunk_precheck
+    inputs, data = state["inputs"], state["data"]
+    # Healthy apps are answered by the anomaly pre-pass, without any LLM call
+    answer = splunk_precheck(inputs, data)
+    if answer is not None:
+        return answer
+    return build_splunk_crew().kickoff(inputs=splunk_kickoff_inputs(inputs, data)).raw
+
+
+def run_datadog(state: dict) -> str:
+    from devops_support.agents.datadog_agent import datadog_kickoff_inputs, datadog_precheck
+    inputs, data = state["inputs"], state["data"]
+    answer = datadog_precheck(inputs, data)
+    if answer is not None:
+        return answer
+    return build_datadog_crew().kickoff(inputs=datadog_kickoff_inputs(inputs, data)).raw
+
+
+def run_argocd(state: dict) -> str:
+    return get_orchestrator(state["max_concurrency"]).run_argocd(state["query"], state["session_id"]).raw
+
+
+async def _stream(request: Request, crew_factory, inputs: dict, timeout) -> StreamingResponse:
+    """Start a crew on the worker pool and stream its progress as Server-Sent Events."""
+    from devops_support.streaming import CrewStream, to_sse
+    executor = request.app.state.executor
+    crew = await asyncio.to_thread(crew_factory)
+    stream = CrewStream(crew, inputs, timeout=timeout or executor.timeout, submit=executor.submit)
+    try:
+        stream.start()
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return StreamingResponse(to_sse(iter(stream)), media_type="text/event-stream")
+
+
+def _answer(source: str, query: str, fetch, fingerprint, func, args: tuple) -> tuple[str, bool]:
+    """
+    One request, run on a worker: answer from the response cache when the same (or a near-duplicate)
+    query was already answered against unchanged data (`fingerprint(*args)`, which reads no data),
+    otherwise fetch its data once (`fetch(*args)`), run `func` (pre-pass and kickoff) on that state
+    and cache its answer.
+
+    :return: (answer, whether it came from the cache).
+    """
+    from devops_support.response_cache import get_response_cache
+    cache = get_response_cache()
+    key = None
+    if cache is not None:
+        try:
+            key = fingerprint(*args)
+            cached = cache.get(source, query, key)
+        except Exception as e:
+            print(f"Response cache lookup failed: {e}")
+            key, cached = None, None
+        if cached is not None:
+            return cached, True
+    result = func(fetch(*args))
+    if key is not None:
+        cache.put(source, query, key, result)
+    return result, False
+
+
+async def _execute(request: Request, source: str, query: str, timeout, fetch, fingerprint, func, *args) -> CrewResponse:
+    """
+    Answer a request on the worker pool (see _answer). The fetch, the cache key and the cache lookup
+    run inside the admitted job, so the pool bound, the queue limit and the request timeout cover
+    them too: a request rejected with 429 costs nothing.
+    """
+    executor = request.app.state.executor
+    try:
+        result, cached = await executor.run(_answer, source, query, fetch, fingerprint, func, args, timeout=timeout)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    except RequestTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while running the crew: {e}")
+    return CrewResponse(source=source, query=query, result=result, cached=cached)
+
+
+@router.get("/health")
+async def health(request: Request) -> dict:
+    executor = request.app.state.executor
+    from devops_support.response_cache import get_response_cache
+    cache = get_response_cache()
+    return {"status": "ok", "workers": executor.workers, "in_flight": executor.in_flight,
+            "max_queue": executor.max_queue, "cache": cache.stats() if cache is not None else None}
+
+
+@router.post("/splunk", response_model=CrewResponse)
+async def splunk(body: CrewRequest, request: Request) -> CrewResponse:
+    return await _execute(request, "splunk", body.query, body.timeout, fetch_splunk, splunk_fingerprint, run_splunk,
+                          body.query, body.days)
+
+
+@router.post("/datadog", response_model=CrewResponse)
+async def datadog(body: CrewRequest, request: Request) -> CrewResponse:
+    return await _execute(request, "datadog", body.query, body.timeout, fetch_datadog, datadog_fingerprint, run_datadog,
+                          body.query, body.days)
+
+
+@router.post("/argocd", response_model=CrewResponse)
+async def argocd(body: ArgoCDRequest, request: Request) -> CrewResponse:
+    workers = request.app.state.executor.workers
+    return await _execute(request, "argocd", body.query, body.timeout, fetch_argocd, argocd_fingerprint, run_argocd,
+                          body.query, workers, body.session_id)
+
+
+@router.post("/splunk/stream")
+async def splunk_stream(body: CrewRequest, request: Request) -> StreamingResponse:
+    return await _stream(request, build_splunk_crew, {"query": body.query, "days": body.days}, body.timeout)
+
+
+@router.post("/datadog/stream")
+async def datadog_stream(body: CrewRequest, request: Request) -> StreamingResponse:
+    return await _stream(request, build_datadog_crew, {"query": body.query, "days": body.days}, body.timeout)
+
+
+@router.post("/argocd/stream")
+async def argocd_stream(body: ArgoCDRequest, request: Request) -> StreamingResponse:
+    from devops_support.orchestrator.orchestrator import CrewsBusy
+    from devops_support.streaming import to_sse
+    executor = request.app.state.executor
+    orchestrator = await asyncio.to_thread(get_orchestrator, executor.workers)
+    try:
+        # Bounded wait: the worker thread of to_thread must not block on a busy crew pool
+        stream = await asyncio.to_thread(orchestrator.stream_argocd, body.query,
+                                         timeout=body.timeout or executor.timeout, submit=executor.submit,
+                                         checkout_timeout=ARGOCD_CHECKOUT_TIMEOUT, session_id=body.session_id)
+    except (PoolSaturated, CrewsBusy) as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return StreamingResponse(to_sse(iter(stream)), media_type="text/event-stream")
@@ -2,66 +2,101 @@ from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, task, crew
 from crewai_tools import LlamaIndexTool
 from pydantic import PrivateAttr
-import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+from devops_support.backends import get_crew_llm
+from devops_support.session_memory import DEFAULT_SESSION, SessionMemory, get_log_writer, get_session_memory
 
 class ArgoCDAgentWithLogging(Agent):
-    _query_history: list = PrivateAttr(default_factory=list)
+    """
+    Agent keeping a bounded per-session query history (see session_memory) and logging every
+    interaction to `log_file` through a background writer, so queries never wait on file I/O.
+    Every task the agent executes in a crew kickoff is recorded (see execute_task).
+    """
+    _memory_store: SessionMemory = PrivateAttr(default=None)
+    _session_id: str = PrivateAttr(default=DEFAULT_SESSION)
     _log_file: str = PrivateAttr(default=None)
 
-    def __init__(self, *args, log_file=None, **kwargs):
+    def __init__(self, *args, log_file=None, session_memory: SessionMemory = None,
+                 session_id: str = DEFAULT_SESSION, **kwargs):
         super().__init__(*args, **kwargs)
         self._log_file = log_file
+        self._memory_store = session_memory or get_session_memory()
+        self._session_id = session_id
+
+    def use_session(self, session_id: str):
+        """Record the next interactions under `session_id` (an agent is reused across requests)."""
+        self._session_id = session_id or DEFAULT_SESSION
 
-    def _log(self, query: str, answer: str) -> str:
-        self._query_history.append({"query": query, "answer": answer})
+    @property
+    def query_history(self) -> list[dict]:
+        return self._memory_store.history(self._session_id)
+
+    def _log(self, query: str, answer: str, session_id: str = None) -> str:
+        self._memory_store.append(session_id or self._session_id, {"query": query, "answer": answer})
         if self._log_file:
-            try:
-                with open(self._log_file, 'a', encoding='utf-8') as f:
-                    f.write(f"Q: {query}\nA: {answer}\n---\n")
-            except Exception as e:
-                print(f"Logging error: {e}")
+            get_log_writer(self._log_file).submit(f"Q: {query}\nA: {answer}\n---\n")
         return answer
 
-    def run(self, query: str) -> str:
-        answer = super().run(query)
-        return self._log(query, answer)
+    def execute_task(self, task: Task, context: str = None, tools: list = None) -> str:
+        # What crewAI calls for each of the agent's tasks during a kickoff; the task description
+        # already has the {query} input interpolated
+        answer = super().execute_task(task, context=context, tools=tools)
+        return self._log(task.description, str(answer))
 
-    def reset_conversation(self):
+    def reset_conversation(self, session_id: str = None):
         if hasattr(self, 'memory') and self.memory:
             self.memory.clear()
-        self._query_history = []
+        self._memory_store.clear(session_id or self._session_id)
+
+def build_query_tool(query_engine) -> LlamaIndexTool:
+    """
+    Wrap a llama_index query engine into the LlamaIndexTool used by the ArgoCD agent.
+    """
+    return LlamaIndexTool.from_query_engine(
+        query_engine,
+        name="ArgoCD_DocSearch",
+        description="Tool to query ArgoCD documentation."
+    )
+
 
 @CrewBase
 class ArgoCDCrew:
     """
     Crew for handling ArgoCD Q&A tasks.
     
-    The crew uses an externally provided QueryEngine instance to initialize its LlamaIndexTool.
-    The QueryEngine must be assigned to the class attribute `query_engine_obj` before the crew is kicked off.
+    The crew uses an externally provided query engine (or a ready-made LlamaIndexTool wrapping it),
+    passed per instance so several crews with different engines can run side by side.
     """
-    # This attribute must be set externally to an instance of QueryEngine
-    query_engine = None
+
+    def __init__(self, query_engine=None, query_tool=None, session_id: str = DEFAULT_SESSION):
+        """
+        :param query_engine: llama_index query engine over the ArgoCD documentation.
+        :param query_tool: Prebuilt tool (see build_query_tool) to share between crews. Takes
+                           precedence over `query_engine`.
+        :param session_id: Session the agent records its queries under (see use_session).
+        """
+        self.query_engine = query_engine
+        self.query_tool = query_tool
+        self.session_id = session_id or DEFAULT_SESSION
+
+    def use_session(self, session_id: str):
+        """
+        Switch a pooled crew to another session: the agent is built once per crew instance.
+        """
+        self.session_id = session_id or DEFAULT_SESSION
+        self.argocd_agent().use_session(self.session_id)
 
     @agent
     def argocd_agent(self) -> Agent:
         """
         Creates an ArgoCD agent that uses the external QueryEngine.
         """
-        if not self.query_engine:
-            raise ValueError("QueryEngine instance not provided. Please assign one to ArgoCDCrew.query_engine_obj")
-        
-        # Retrieve the query engine from the external QueryEngine object.
-        query_engine = self.query_engine
-        
-        # Wrap the query engine using LlamaIndexTool.
-        query_tool = LlamaIndexTool.from_query_engine(
-            query_engine,
-            name="ArgoCD_DocSearch",
-            description="Tool to query ArgoCD documentation."
-        )
+        if self.query_tool is None:
+            if not self.query_engine:
+                raise ValueError("QueryEngine instance not provided. Please pass one to ArgoCDCrew(query_engine=...)")
+            # Wrap the query engine using LlamaIndexTool.
+            self.query_tool = build_query_tool(self.query_engine)
+        query_tool = self.query_tool
         
         return ArgoCDAgentWithLogging(
             role="ArgoCD Documentation Expert",
@@ -71,7 +106,9 @@ class ArgoCDCrew:
                        "and log all interactions for traceability."),
             tools=[query_tool],
             memory=True,
-            log_file="argocd_agent.log"  # Update the path as needed
+            llm=get_crew_llm(),
+            log_file="argocd_agent.log",  # Update the path as needed
+            session_id=self.session_id
         )
 
     @task
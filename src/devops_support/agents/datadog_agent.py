@@ -1,8 +1,11 @@
-import json
 from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, task, crew, before_kickoff, after_kickoff
 import re
 
+from devops_support.analysis.anomaly import detect_anomalies, format_anomalies, healthy_answer
+from devops_support.analysis.context import ContextBudget
+from devops_support.analysis.health import HealthAggregator, format_health
+from devops_support.backends import get_crew_llm
 from devops_support.data.datadog_api import DatadogApi
 
 ###################
@@ -19,12 +22,61 @@ def mock_datadog_api1(app_id: str, app_name: str) -> dict:
         "timestamp": "2025-04-14 10:42:00"
     }
 
-def mock_datadog_api(app_id: str, app_name: str) -> list[dict]:
+# Number of days of data fetched when the kickoff inputs don't specify `days`.
+DEFAULT_DAYS = 20
+
+
+def mock_datadog_api(app_id: str, app_name: str, days: int = DEFAULT_DAYS) -> list[dict]:
     datadog_api = DatadogApi()
-    logs_data = datadog_api.get_logs(app_name, 20)
+    logs_data = datadog_api.get_logs(app_name, days)
     return logs_data
 
 
+def build_datadog_context(data: list[dict], max_tokens: int = None) -> str:
+    """
+    Reduce fetched Datadog data to a bounded prompt context: the precomputed health summary and
+    the anomalies flagged by the statistical pre-pass, followed by the deduplicated, budgeted
+    log templates.
+    """
+    health = format_health(HealthAggregator(bucket_minutes=24 * 60).summarize(data))
+    anomalies = format_anomalies(detect_anomalies(data))
+    budget = ContextBudget(max_tokens=max_tokens) if max_tokens else ContextBudget()
+    return budget.build(data, preamble=f"{health}\n{anomalies}" if anomalies else health)
+
+
+def fetch_datadog_data(inputs: dict) -> list[dict]:
+    """The data a kickoff with these inputs analyzes. Fetch it once per request and pass it on."""
+    app_id, app_name = parse_app_info(inputs.get("query", ""))
+    return mock_datadog_api(app_id, app_name, int(inputs.get("days", DEFAULT_DAYS)))
+
+
+def datadog_precheck(inputs: dict, data: list[dict] = None) -> str:
+    """
+    Statistical pre-pass run before the crew: the answer when the app is healthy (the kickoff and
+    its LLM calls can be skipped), None when it has anomalies to analyze.
+
+    :param data: The request's data (see fetch_datadog_data), fetched when not given.
+    """
+    _, app_name = parse_app_info(inputs.get("query", ""))
+    data = fetch_datadog_data(inputs) if data is None else data
+    return healthy_answer(detect_anomalies(data, [app_name]), "Datadog")
+
+
+def datadog_kickoff_inputs(inputs: dict, data: list[dict]) -> dict:
+    """Kickoff inputs with the {context} built from already fetched data (prepare_inputs won't fetch)."""
+    return {**inputs, "context": build_datadog_context(data, inputs.get("max_context_tokens"))}
+
+
+def datadog_fingerprint(inputs: dict) -> str:
+    """
+    Version of the data a kickoff with these inputs analyzes (response cache key). Built from the
+    store's identity, size and window (see DatadogApi.logs_version): nothing is fetched or hashed.
+    """
+    _, app_name = parse_app_info(inputs.get("query", ""))
+    days = int(inputs.get("days", DEFAULT_DAYS))
+    return f"{DatadogApi().logs_version(app_name, days)}:{inputs.get('max_context_tokens')}"
+
+
 def parse_app_info(query: str) -> (str, str):
     app_id_match = re.search(r"(?i)app\s?id\s?(\d+)", query)
     app_name_match = re.search(r"(?i)app\s?name\s?(\w+)", query)
@@ -44,6 +96,10 @@ class DatadogCrew:
     def prepare_inputs(self, inputs):
         # Modify inputs before the crew starts
         inputs['additional_data'] = "Some extra information"
+        # Fetch the data once and pass it to the tasks as a bounded context input, unless the
+        # caller already did (see datadog_kickoff_inputs)
+        if 'context' not in inputs:
+            inputs['context'] = build_datadog_context(fetch_datadog_data(inputs), inputs.get("max_context_tokens"))
         return inputs
 
     @after_kickoff
@@ -57,25 +113,18 @@ class DatadogCrew:
         """
         DatadogAgent:
 
-        This agent processes raw Datadog infrastructure data based on an input query.
+        This agent processes Datadog infrastructure data based on an input query.
         The expected query should contain both the application id and name.
-        The agent extracts the application id and name from the query, simulates retrieving the corresponding metrics (via a mock API),
-        and produces a formatted report without speculation.
+        The data itself is not part of the agent: it is fetched once before kickoff, reduced to a
+        token-budgeted context (see build_datadog_context) and handed to the task as the {context} input.
         """
-        def handle_datadog_query(inputs: dict) -> str:
-            query = inputs.get("query", "")
-            app_id, app_name = parse_app_info(query)
-            data = mock_datadog_api(app_id, app_name)   
-            return data
-
-        datadog_context_json = handle_datadog_query({"query": "can you check the status for appID app-002 with app name backend_service?"})
-        datadog_context = json.dumps(datadog_context_json)
-        backstory = "Specialized agent for retrieving and summarizing Datadog infrastructure metrics. It strictly uses provided data without adding any speculation. Input queries must include an app id and an app name.\nContext:: {}".format(datadog_context.replace('{', '{{').replace('}', '}}'))
+        backstory = "Specialized agent for retrieving and summarizing Datadog infrastructure metrics. It strictly uses provided data without adding any speculation. Input queries must include an app id and an app name."
         return Agent(
             role="DatadogAgent",
             backstory=backstory,
             goal="Answer questions related to Datadog metrics and analytics based on the input query that can be consumed by customers these might not have infrastructure knowlage.",
             verbose=True,
+            llm=get_crew_llm(),
         )
 
     @agent
@@ -90,6 +139,7 @@ class DatadogCrew:
             backstory="Agent that summarizes or reports on Datadog data without adding speculation.",
             goal="Provide short, factual summaries of the given infrastructure data.",
             verbose=True,
+            llm=get_crew_llm(),
         )
 
     @task
@@ -101,7 +151,7 @@ class DatadogCrew:
         The expected output is a detailed, raw Datadog infrastructure report based on the provided input query.
         """
         return Task(
-            description="Answer the following query about Datadog: {query}",
+            description="Answer the following query about Datadog: {query}\n\nDatadog data for the application:\n{context}",
             expected_output="Raw Datadog infrastructure report based on the input provided as context. provide insight about how the application is doing and any recommandation if applicable. No structure data.",
             agent=self.datadog_agent()
             #output_file='datadog_summary.md'
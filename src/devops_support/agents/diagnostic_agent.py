@@ -0,0 +1,56 @@
+from crewai import Agent, Crew, Task, Process
+from crewai.project import CrewBase, agent, task, crew
+
+from devops_support.backends import get_crew_llm
+
+# What the {context} input holds for an incident gathered by Orchestator.run_incident
+INCIDENT_CONTEXT = "Merged timeline of Splunk logs, Datadog logs/events and ArgoCD documentation context"
+
+
+@CrewBase
+class DiagnosticCrew:
+    """
+    Crew for a single reasoning pass over an incident.
+
+    The Splunk, Datadog and ArgoCD context is gathered beforehand (see Orchestator.run_incident)
+    and passed in as the {context} input, merged into one timeline.
+    """
+
+    def __init__(self, context_description: str = INCIDENT_CONTEXT, output_file: str = "incident_report.md"):
+        """
+        :param context_description: What the {context} input holds, as told to the agent.
+        :param output_file: File the report is written to (None: not written). Crews running at
+                            the same time need different files.
+        """
+        self.context_description = context_description
+        self.output_file = output_file
+
+    @agent
+    def diagnostic_agent(self) -> Agent:
+        return Agent(
+            role="IncidentAnalyst",
+            backstory="Site reliability engineer correlating application logs, infrastructure metrics and deployment "
+                      "knowledge into a root-cause analysis. It strictly uses provided data without adding any speculation.",
+            goal="Explain what happened during an incident, the most likely root cause and the next steps to resolve it.",
+            verbose=True,
+            llm=get_crew_llm(),
+        )
+
+    @task
+    def diagnosis_task(self) -> Task:
+        return Task(
+            description="Analyze the following incident: {query}\n\n" + self.context_description + ":\n{context}",
+            expected_output="An incident report: timeline of the key events, most likely root cause with the supporting "
+                            "evidence, impact, and recommended next steps.",
+            agent=self.diagnostic_agent(),
+            output_file=self.output_file
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        return Crew(
+            agents=[self.diagnostic_agent()],
+            tasks=[self.diagnosis_task()],
+            process=Process.sequential,
+            verbose=True,
+        )
@@ -1,18 +1,27 @@
 from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, task, crew
+from devops_support.backends import get_crew_llm
+from devops_support.session_memory import SessionMemory, get_session_memory
 import logging
 
 
 @CrewBase
 class PlanningCrew:
-     
+
+    def __init__(self, session_memory: SessionMemory = None):
+        """
+        :param session_memory: Bounded session memory holding the plans (defaults to the shared one).
+        """
+        self.session_memory = session_memory or get_session_memory()
+
     def _handle_planning_query(self, query: str, context: dict[str, any]) -> str:
         """Handle a planning query using the PlanningAgent (creating a multi-step action plan)."""
         session_id = context.get("session_id", "")
         # Create a PlanningAgent focused on strategic multi-step solutions
         planning_agent = Agent(
             role="PlanningAgent",
-            goal="Develop a step-by-step plan to address complex issues or achieve the user's goal"
+            goal="Develop a step-by-step plan to address complex issues or achieve the user's goal",
+            llm=get_crew_llm(),
         )
         # Incorporate known context (issue or app info) into the plan prompt
         issue_description = ""
@@ -38,7 +47,5 @@ class PlanningCrew:
         plan = str(result)
         # Save the plan in memory for future reference
         if session_id:
-            mem = self.session_memory.get(session_id, {})
-            mem["plan"] = plan
-            self.session_memory[session_id] = mem
+            self.session_memory.set(session_id, "plan", plan)
         return plan
\ No newline at end of file
@@ -1,20 +1,71 @@
-import json
 from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, task, crew, before_kickoff, after_kickoff
 import re
 import datetime
 
+from devops_support.analysis.anomaly import detect_anomalies, format_anomalies, healthy_answer
+from devops_support.analysis.context import ContextBudget
+from devops_support.backends import get_crew_llm
 from devops_support.data.splunk_api import SplunkApi
 
 ###################
 # Mock / Helpers
 ###################
-def mock_splunk_api(app_id: str, app_name: str) -> list[dict]:
+# Number of days of logs fetched when the kickoff inputs don't specify `days`.
+DEFAULT_DAYS = 20
+# Buckets of the anomaly pre-pass: the Splunk logs come in a few entries per app and day.
+ANOMALY_BUCKET_MINUTES = 24 * 60
+
+
+def mock_splunk_api(app_id: str, app_name: str, days: int = DEFAULT_DAYS) -> list[dict]:
     splunk_api = SplunkApi()
-    logs_data = splunk_api.get_logs(app_name, 20)
+    logs_data = splunk_api.get_logs(app_name, days)
     return logs_data
 
 
+def build_splunk_context(data: list[dict], app_name: str, max_tokens: int = None) -> str:
+    """
+    Reduce fetched Splunk logs to a bounded prompt context of deduplicated, budgeted log templates.
+    """
+    budget = ContextBudget(max_tokens=max_tokens) if max_tokens else ContextBudget()
+    anomalies = format_anomalies(detect_anomalies(data, [app_name], ANOMALY_BUCKET_MINUTES))
+    return budget.build(data, preamble=f"{anomalies}\nSplunk logs for application {app_name}:")
+
+
+def fetch_splunk_data(inputs: dict) -> list[dict]:
+    """The logs a kickoff with these inputs analyzes. Fetch them once per request and pass them on."""
+    app_id, app_name = parse_app_info(inputs.get("query", ""))
+    return mock_splunk_api(app_id, app_name, int(inputs.get("days", DEFAULT_DAYS)))
+
+
+def splunk_precheck(inputs: dict, data: list[dict] = None) -> str:
+    """
+    Statistical pre-pass run before the crew: the answer when the app is healthy (the kickoff and
+    its LLM calls can be skipped), None when it has anomalies to analyze.
+
+    :param data: The request's logs (see fetch_splunk_data), fetched when not given.
+    """
+    _, app_name = parse_app_info(inputs.get("query", ""))
+    data = fetch_splunk_data(inputs) if data is None else data
+    return healthy_answer(detect_anomalies(data, [app_name], ANOMALY_BUCKET_MINUTES), "Splunk")
+
+
+def splunk_kickoff_inputs(inputs: dict, data: list[dict]) -> dict:
+    """Kickoff inputs with the {context} built from already fetched logs (prepare_inputs won't fetch)."""
+    _, app_name = parse_app_info(inputs.get("query", ""))
+    return {**inputs, "context": build_splunk_context(data, app_name, inputs.get("max_context_tokens"))}
+
+
+def splunk_fingerprint(inputs: dict) -> str:
+    """
+    Version of the data a kickoff with these inputs analyzes (response cache key). Built from the
+    store's identity, size and window (see SplunkApi.logs_version): nothing is fetched or hashed.
+    """
+    _, app_name = parse_app_info(inputs.get("query", ""))
+    days = int(inputs.get("days", DEFAULT_DAYS))
+    return f"{SplunkApi().logs_version(app_name, days)}:{inputs.get('max_context_tokens')}"
+
+
 def parse_app_info(query: str) -> (str, str):
     app_id_match = re.search(r"(?i)app\s?id\s?(\d+)", query)
     app_name_match = re.search(r"(?i)app\s?name\s?(\w+)", query)
@@ -35,6 +86,12 @@ class SplunkCrew:
     def prepare_inputs(self, inputs: dict) -> dict:
         # Add additional context/data before the crew execution starts
         inputs['additional_data'] = "Extra data for Splunk analysis"
+        # Fetch the logs once and pass them to the tasks as a bounded context input, unless the
+        # caller already did (see splunk_kickoff_inputs)
+        if 'context' not in inputs:
+            _, app_name = parse_app_info(inputs.get("query", ""))
+            data = fetch_splunk_data(inputs)
+            inputs['context'] = build_splunk_context(data, app_name, inputs.get("max_context_tokens"))
         return inputs
 
     @after_kickoff
@@ -45,22 +102,15 @@ class SplunkCrew:
 
     @agent
     def splunk_agent(self) -> Agent:
-        def handle_splunk_query(inputs: dict) -> str:
-            query = inputs.get("query", "")
-            app_id, app_name = parse_app_info(query)
-            data = mock_splunk_api(app_id, app_name)   
-            return data
-
-        splunk_context_json = handle_splunk_query({"query": "can you check the status for application AuthService?"})
-        splunk_context = json.dumps(splunk_context_json)
-        backstory = "Agent specialized in analyzing Splunk logs for applications. It strictly uses provided data without adding any speculation.\nContext:: {}".format(splunk_context.replace('{', '{{').replace('}', '}}'))
-        print(f"Splunk context: {backstory}")
+        # The logs are not embedded here: they are fetched once before kickoff and handed to the
+        # task as the token-budgeted {context} input (see build_splunk_context).
+        backstory = "Agent specialized in analyzing Splunk logs for applications. It strictly uses provided data without adding any speculation."
         return Agent(
             role="SplunkAgent",
             backstory=backstory,
             goal="Provide detailed Splunk log analytics and insights.",
-            handle=handle_splunk_query,
             verbose=True,
+            llm=get_crew_llm(),
         )
 
     @agent
@@ -70,12 +120,13 @@ class SplunkCrew:
             backstory="Summarizes detailed Splunk logs into concise reports.",
             goal="Generate concise, factual summaries from Splunk log analysis.",
             verbose=True,
+            llm=get_crew_llm(),
         )
 
     @task
     def query_task(self) -> Task:
         return Task(
-            description="Answer the following query about Splunk logs: {query}",
+            description="Answer the following query about Splunk logs: {query}\n\n{context}",
             expected_output="Detailed Splunk log analysis.",
             agent=self.splunk_agent()
             #output_name="splunk_response"
@@ -0,0 +1,329 @@
+import math
+import os
+from collections import deque
+from typing import Any, Iterable, Optional
+
+from devops_support.data.columnar import format_timestamp, parse_timestamp
+
+# Width of the time buckets the per-app/per-host series are built from.
+ANOMALY_BUCKET_MINUTES = int(os.getenv("ANOMALY_BUCKET_MINUTES", "60"))
+# |z| (distance to the EWMA baseline in standard deviations) from which a bucket is anomalous.
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3.0"))
+# Weight of the newest bucket in the EWMA baseline.
+ANOMALY_EWMA_ALPHA = float(os.getenv("ANOMALY_EWMA_ALPHA", "0.3"))
+# Closed buckets a series needs before z-scores are trusted; until then only the ceilings apply.
+ANOMALY_MIN_HISTORY = int(os.getenv("ANOMALY_MIN_HISTORY", "6"))
+# Answer healthy apps (no anomaly) with the pre-pass summary instead of running the crew.
+SKIP_HEALTHY_APPS = os.getenv("SKIP_HEALTHY_APPS", "true").lower() in ("1", "true", "yes")
+
+# A bucket's error rate is only judged with enough logs and errors in it.
+MIN_BUCKET_LOGS = 5
+MIN_BUCKET_ERRORS = 3
+# Absolute ceilings flagged even without a baseline (cold start).
+ERROR_RATE_CEILING = 0.5
+CPU_CEILING = 95.0
+# Smallest standard deviation used per metric (absolute, and relative to the baseline mean), so a
+# flat series doesn't turn every small wiggle into a huge z-score.
+_STD_FLOOR = {"error_rate": 0.05, "cpu": 2.0, "memory": 50.0}
+_STD_FLOOR_RATIO = 0.05
+
+# Event titles watched for bursts: occurrences within EVENT_BURST_MINUTES that make a burst.
+EVENT_BURST_THRESHOLDS = {"Deployment failed": 2, "Database Outage": 1}
+EVENT_BURST_MINUTES = 60
+
+ERROR_LEVELS = ("ERROR", "CRITICAL")
+# Anomalies kept per app (oldest dropped first)
+_MAX_ANOMALIES = 500
+
+
+def _app_of(entry: dict[str, Any]) -> str:
+    """Application name of a Datadog (`app:` tag / `app` field) or Splunk (`application` field) entry."""
+    if "application" in entry:
+        return entry["application"]
+    for tag in entry.get("tags", ()):
+        if tag.startswith("app:"):
+            return tag[4:]
+    return entry.get("app", "unknown")
+
+
+def _timestamp_ms(value) -> int:
+    return value if isinstance(value, int) else parse_timestamp(value)
+
+
+class _Ewma:
+    """Exponentially weighted mean and variance of one metric, updated one value at a time."""
+
+    __slots__ = ("mean", "var", "n")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.var = 0.0
+        self.n = 0
+
+    def update(self, value: float, alpha: float):
+        if self.n == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.var = (1 - alpha) * (self.var + diff * increment)
+        self.n += 1
+
+    def z(self, value: float, metric: str) -> float:
+        std = max(math.sqrt(self.var), _STD_FLOOR[metric], _STD_FLOOR_RATIO * abs(self.mean))
+        return (value - self.mean) / std
+
+
+class _Bucket:
+    """Counters of one app/host time bucket."""
+
+    __slots__ = ("index", "logs", "errors", "cpu", "memory")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.logs = 0
+        self.errors = 0
+        self.cpu = None
+        self.memory = None
+
+    def add(self, entry: dict[str, Any]):
+        self.logs += 1
+        if str(entry.get("level", "")).upper() in ERROR_LEVELS:
+            self.errors += 1
+        # Peak of the bucket: short spikes must not be averaged away
+        if entry.get("cpu") is not None:
+            self.cpu = max(self.cpu, entry["cpu"]) if self.cpu is not None else entry["cpu"]
+        if entry.get("memory") is not None:
+            self.memory = max(self.memory, entry["memory"]) if self.memory is not None else entry["memory"]
+
+    def values(self) -> dict[str, float]:
+        values = {}
+        if self.logs >= MIN_BUCKET_LOGS:
+            values["error_rate"] = self.errors / self.logs
+        if self.cpu is not None:
+            values["cpu"] = float(self.cpu)
+        if self.memory is not None:
+            values["memory"] = float(self.memory)
+        return values
+
+
+class _Series:
+    """Open bucket and EWMA baselines of one app/host."""
+
+    __slots__ = ("bucket", "baselines", "late")
+
+    def __init__(self):
+        self.bucket: Optional[_Bucket] = None
+        self.baselines = {"error_rate": _Ewma(), "cpu": _Ewma(), "memory": _Ewma()}
+        self.late = 0
+
+
+class AnomalyDetector:
+    """
+    Incremental statistical pre-pass over the log/metric series of `get_logs` results.
+
+    Entries are bucketed per app/host (ANOMALY_BUCKET_MINUTES). When a bucket closes (an entry of
+    a later bucket arrives), its error rate and cpu/memory peaks are scored against the series'
+    EWMA baseline of the previous buckets, then folded into it, so every entry is looked at once
+    and the state per series is a handful of numbers. Watched deployment/database events are
+    counted in a sliding window per app to detect bursts.
+
+    The detector can be fed a whole `get_logs` result or the deltas of `get_logs_since` / a
+    follow tail: feeding the same data in one call or in many gives the same anomalies. Entries
+    older than a series' open bucket arrive too late to be scored and are only counted.
+    """
+
+    def __init__(self, bucket_minutes: int = ANOMALY_BUCKET_MINUTES, z_threshold: float = ANOMALY_Z_THRESHOLD,
+                 alpha: float = ANOMALY_EWMA_ALPHA, min_history: int = ANOMALY_MIN_HISTORY,
+                 event_thresholds: dict[str, int] = None, event_window_minutes: int = EVENT_BURST_MINUTES):
+        """
+        :param bucket_minutes: Width of the time buckets.
+        :param z_threshold: z-score from which a bucket is anomalous.
+        :param alpha: Weight of the newest bucket in the EWMA baselines.
+        :param min_history: Closed buckets needed before z-scores are used.
+        :param event_thresholds: Event title -> occurrences within the window that make a burst.
+        :param event_window_minutes: Sliding window of the event bursts.
+        """
+        self.bucket_ms = bucket_minutes * 60 * 1000
+        self.z_threshold = z_threshold
+        self.alpha = alpha
+        self.min_history = min_history
+        self.event_thresholds = event_thresholds if event_thresholds is not None else EVENT_BURST_THRESHOLDS
+        self.event_window_ms = event_window_minutes * 60 * 1000
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._events: dict[tuple[str, str], deque] = {}
+        self._anomalies: dict[str, deque] = {}
+        self._entries: dict[str, int] = {}
+
+    def update(self, entries: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Feed new entries (oldest first). Returns the anomalies of the buckets they closed and of
+        the event bursts they completed.
+        """
+        found = []
+        for entry in entries:
+            app = _app_of(entry)
+            self._entries[app] = self._entries.get(app, 0) + 1
+            ts = _timestamp_ms(entry["timestamp"])
+            if entry.get("type") == "event":
+                found.extend(self._add_event(app, entry, ts))
+                continue
+            host = entry.get("host", "unknown")
+            series = self._series.get((app, host))
+            if series is None:
+                series = self._series[(app, host)] = _Series()
+            index = ts // self.bucket_ms
+            bucket = series.bucket
+            if bucket is None or index > bucket.index:
+                if bucket is not None:
+                    found.extend(self._close(app, host, series))
+                bucket = series.bucket = _Bucket(index)
+            elif index < bucket.index:
+                series.late += 1
+                continue
+            bucket.add(entry)
+        for anomaly in found:
+            self._anomalies.setdefault(anomaly["app"], deque(maxlen=_MAX_ANOMALIES)).append(anomaly)
+        return found
+
+    def _close(self, app: str, host: str, series: _Series) -> list[dict[str, Any]]:
+        anomalies = self._score(app, host, series)
+        for metric, value in series.bucket.values().items():
+            series.baselines[metric].update(value, self.alpha)
+        return anomalies
+
+    def _score(self, app: str, host: str, series: _Series) -> list[dict[str, Any]]:
+        """Anomalies of the series' open bucket against its baseline (the baseline is not updated)."""
+        bucket = series.bucket
+        anomalies = []
+        for metric, value in bucket.values().items():
+            baseline = series.baselines[metric]
+            z = baseline.z(value, metric) if baseline.n >= self.min_history else None
+            if metric == "error_rate":
+                if bucket.errors < MIN_BUCKET_ERRORS:
+                    continue
+                ceiling = ERROR_RATE_CEILING
+            else:
+                ceiling = CPU_CEILING if metric == "cpu" else None
+            over_ceiling = ceiling is not None and value >= ceiling
+            if not over_ceiling and (z is None or z < self.z_threshold):
+                continue
+            severity = "critical" if over_ceiling or z >= 2 * self.z_threshold else "warning"
+            anomaly = self._anomaly(app, host, metric, bucket.index * self.bucket_ms,
+                                    (bucket.index + 1) * self.bucket_ms, severity)
+            anomaly["value"] = round(value, 3)
+            anomaly["baseline"] = round(baseline.mean, 3) if baseline.n else None
+            anomaly["z"] = round(z, 1) if z is not None else None
+            if metric == "error_rate":
+                anomaly["detail"] = f"{bucket.errors}/{bucket.logs} errors"
+            else:
+                anomaly["detail"] = f"peak {round(value, 1):g}" + (f" >= {ceiling:g}" if over_ceiling else "")
+            anomalies.append(anomaly)
+        return anomalies
+
+    def _add_event(self, app: str, entry: dict[str, Any], ts: int) -> list[dict[str, Any]]:
+        title = entry.get("title", "")
+        threshold = self.event_thresholds.get(title)
+        if threshold is None:
+            return []
+        window = self._events.setdefault((app, title), deque())
+        window.append((ts, entry.get("host", "")))
+        while window and window[0][0] <= ts - self.event_window_ms:
+            window.popleft()
+        if len(window) != threshold:
+            # Flag a burst once, when it reaches the threshold
+            return []
+        hosts = sorted({host for _, host in window if host})
+        anomaly = self._anomaly(app, ", ".join(hosts), "event:" + title, window[0][0], ts, "critical")
+        anomaly["value"] = len(window)
+        anomaly["baseline"] = None
+        anomaly["z"] = None
+        anomaly["detail"] = f"{len(window)} x {title}"
+        return [anomaly]
+
+    @staticmethod
+    def _anomaly(app: str, host: str, metric: str, start_ms: int, end_ms: int, severity: str) -> dict[str, Any]:
+        return {"app": app, "host": host, "metric": metric, "severity": severity,
+                "window_start": format_timestamp(start_ms), "window_end": format_timestamp(end_ms)}
+
+    def report(self, apps: Iterable[str] = None) -> dict[str, Any]:
+        """
+        Health verdict per app: the anomalies found so far plus the provisional ones of the still
+        open buckets.
+
+        :param apps: Apps to report on (default: every app seen). Apps without entries have the
+                     status "no_data" and are not healthy: nothing was checked.
+        :return: {"bucket_minutes": ..., "apps": {app: {"status", "healthy", "entries", "anomalies", "hosts",
+                  "late"}}} with status "healthy", "degraded" or "no_data".
+        """
+        apps = list(apps) if apps is not None else list(self._entries)
+        report = {"bucket_minutes": self.bucket_ms // 60000, "apps": {}}
+        for app in apps:
+            anomalies = list(self._anomalies.get(app, ()))
+            late = 0
+            for (series_app, host), series in self._series.items():
+                if series_app != app:
+                    continue
+                late += series.late
+                if series.bucket is not None:
+                    anomalies.extend(self._score(app, host, series))
+            anomalies.sort(key=lambda anomaly: (anomaly["window_start"], anomaly["host"], anomaly["metric"]))
+            entries = self._entries.get(app, 0)
+            status = "degraded" if anomalies else "healthy" if entries else "no_data"
+            report["apps"][app] = {
+                "status": status,
+                "healthy": status == "healthy",
+                "entries": entries,
+                "anomalies": anomalies,
+                "hosts": sorted({anomaly["host"] for anomaly in anomalies if anomaly["host"]}),
+                "late": late,
+            }
+        return report
+
+
+def detect_anomalies(entries: Iterable[dict[str, Any]], apps: Iterable[str] = None,
+                     bucket_minutes: int = ANOMALY_BUCKET_MINUTES) -> dict[str, Any]:
+    """Convenience wrapper: run an AnomalyDetector over `entries` and return its report."""
+    detector = AnomalyDetector(bucket_minutes=bucket_minutes)
+    detector.update(entries)
+    return detector.report(apps)
+
+
+def format_anomalies(report: dict[str, Any], max_lines: int = 20) -> str:
+    """Render an `AnomalyDetector.report` as compact text for a prompt (critical anomalies first)."""
+    lines = []
+    for app, app_report in report["apps"].items():
+        if app_report["status"] == "no_data":
+            lines.append(f"Anomaly pre-pass for {app}: no data (no entries found, nothing was checked).")
+            continue
+        if app_report["healthy"]:
+            lines.append(f"Anomaly pre-pass for {app}: healthy ({app_report['entries']} entries, no anomaly).")
+            continue
+        anomalies = sorted(app_report["anomalies"], key=lambda anomaly: anomaly["severity"] != "critical")
+        lines.append(f"Anomaly pre-pass for {app}: {len(anomalies)} anomalies on hosts "
+                     f"{', '.join(app_report['hosts']) or 'n/a'}:")
+        for anomaly in anomalies[:max_lines]:
+            line = (f"  [{anomaly['severity']}] {anomaly['window_start']}..{anomaly['window_end']} "
+                    f"{anomaly['host'] or '-'} {anomaly['metric']}={anomaly['value']}")
+            if anomaly["baseline"] is not None:
+                line += f" (baseline {anomaly['baseline']}"
+                line += f", z={anomaly['z']})" if anomaly["z"] is not None else ")"
+            lines.append(f"{line} {anomaly['detail']}")
+        if len(anomalies) > max_lines:
+            lines.append(f"  ... {len(anomalies) - max_lines} more")
+    return "\n".join(lines)
+
+
+def healthy_answer(report: dict[str, Any], source: str) -> Optional[str]:
+    """
+    Answer for a query whose apps the pre-pass found healthy, so the crew (and its LLM calls) can
+    be skipped. None when an app has anomalies or no entries at all (e.g. a misspelled or unknown
+    app: nothing was checked), or when SKIP_HEALTHY_APPS is off.
+    """
+    if not SKIP_HEALTHY_APPS or not report["apps"] or not all(app["healthy"] for app in report["apps"].values()):
+        return None
+    lines = [f"{app} is healthy: no anomaly in {app_report['entries']} {source} entries "
+             f"(error-rate, cpu/memory and event-burst checks over {report['bucket_minutes']}-minute buckets)."
+             for app, app_report in report["apps"].items()]
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+import os
+from typing import Any, Optional
+
+from devops_support.analysis.templates import TemplateMiner
+
+# Default prompt budget for the log context handed to an agent, overridable through the environment.
+DEFAULT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+
+# Rough chars-per-token ratio used to estimate prompt size without a tokenizer.
+CHARS_PER_TOKEN = 4
+
+# Lower value = higher priority when filling the budget.
+_LEVEL_PRIORITY = {"CRITICAL": 0, "ERROR": 0, "WARNING": 1, "WARN": 1, "EVENT": 2, "INFO": 3, "DEBUG": 4}
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _level_of(entry: dict[str, Any]) -> str:
+    if entry.get("type") == "event":
+        return "EVENT"
+    return str(entry.get("level", "INFO")).upper()
+
+
+def _text_of(entry: dict[str, Any]) -> str:
+    if entry.get("type") == "event":
+        return f"{entry.get('title', '')} ({entry.get('alert_type', '')}): {entry.get('text', '')}"
+    return str(entry.get("message", ""))
+
+
+class ContextBudget:
+    """
+    Builds a bounded, deduplicated text context from a `get_logs` result.
+
+    Entries are clustered into (level, message template) groups by a streaming template miner,
+    with counts, first/last seen, hosts and sample parameter values. Groups are then added by
+    priority (ERROR, WARNING, events, then a sample of the most frequent INFO templates) until the
+    token budget is used up, so the prompt size stays bounded no matter how many days of data
+    were fetched.
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_TOKEN_BUDGET, info_samples: int = 5):
+        """
+        :param max_tokens: Upper bound on the estimated tokens of the produced context.
+        :param info_samples: Number of INFO templates to keep (the most frequent ones).
+        """
+        self.max_tokens = max_tokens
+        self.info_samples = info_samples
+
+    def group(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Cluster entries into templates (see TemplateMiner), in first-seen order."""
+        miner = TemplateMiner().add_entries(entries, _text_of, _level_of)
+        return [{
+            "level": cluster.level,
+            "template": cluster.template,
+            "sample": cluster.sample[len(cluster.level) + 1:],
+            "params": cluster.parameter_values(),
+            "count": cluster.count,
+            "first_seen": cluster.first_seen,
+            "last_seen": cluster.last_seen,
+            "hosts": cluster.hosts,
+        } for cluster in miner.clusters]
+
+    def rank(self, groups: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Order groups by priority and drop all but the most frequent INFO templates.
+
+        :return: (kept groups in priority order, sampled-out INFO groups)
+        """
+        ranked = sorted(groups, key=lambda g: (_LEVEL_PRIORITY.get(g["level"], 5), -g["count"]))
+        kept, dropped = [], []
+        info_kept = 0
+        for group in ranked:
+            if group["level"] in ("INFO", "DEBUG"):
+                if info_kept >= self.info_samples:
+                    dropped.append(group)
+                    continue
+                info_kept += 1
+            kept.append(group)
+        return kept, dropped
+
+    @staticmethod
+    def format_group(group: dict[str, Any]) -> str:
+        line = f"[{group['level']}] x{group['count']} {group['template']}"
+        params = [values for values in group.get("params", []) if values]
+        if params and group["count"] > 1:
+            # Sample values of each <*> instead of re-listing the messages
+            line += " values: " + "; ".join(", ".join(values) for values in params)
+        elif group["template"] != group["sample"]:
+            line += f" (e.g. \"{group['sample']}\")"
+        if group["count"] > 1:
+            line += f" first={group['first_seen']} last={group['last_seen']}"
+        else:
+            line += f" at={group['first_seen']}"
+        if group["hosts"]:
+            line += f" hosts={','.join(sorted(group['hosts']))}"
+        return line
+
+    def build(self, entries: list[dict[str, Any]], preamble: Optional[str] = None) -> str:
+        """
+        Build the context text for `entries`.
+
+        :param entries: Log/event dictionaries as returned by DatadogApi/SplunkApi.get_logs.
+        :param preamble: Optional text (e.g. a precomputed health summary) placed first and
+                         counted against the same budget.
+        """
+        budget_chars = self.max_tokens * CHARS_PER_TOKEN
+        lines = []
+        if preamble:
+            if len(preamble) > budget_chars // 2:
+                preamble = preamble[:budget_chars // 2] + "...(truncated)"
+            lines.append(preamble)
+
+        levels: dict[str, int] = {}
+        for entry in entries:
+            level = _level_of(entry)
+            levels[level] = levels.get(level, 0) + 1
+        if entries:
+            window = f"{entries[0]['timestamp']} .. {entries[-1]['timestamp']}"
+        else:
+            window = "no data"
+        counts = ", ".join(f"{level}={count}" for level, count in sorted(levels.items()))
+        lines.append(f"{len(entries)} entries ({counts}) over {window}. Repeated messages are grouped by template:")
+
+        kept, dropped = self.rank(self.group(entries))
+        used = sum(len(line) + 1 for line in lines)
+        # Keep room for the two trailing "not listed" / "omitted" notes
+        limit = budget_chars - 160
+        omitted = 0
+        for group in kept:
+            line = self.format_group(group)
+            if used + len(line) + 1 > limit:
+                omitted += 1
+                continue
+            lines.append(line)
+            used += len(line) + 1
+        if dropped:
+            lines.append(f"... {len(dropped)} less frequent INFO templates "
+                         f"({sum(g['count'] for g in dropped)} entries) not listed.")
+        if omitted:
+            lines.append(f"... {omitted} more groups omitted to fit the context budget.")
+        return "\n".join(lines)
+
+
+def build_context(entries: list[dict[str, Any]], max_tokens: int = DEFAULT_TOKEN_BUDGET,
+                  preamble: Optional[str] = None) -> str:
+    """Convenience wrapper around ContextBudget.build."""
+    return ContextBudget(max_tokens=max_tokens).build(entries, preamble=preamble)
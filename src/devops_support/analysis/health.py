@@ -0,0 +1,265 @@
+from typing import Any, Iterable
+
+import numpy as np
+
+from devops_support.data.columnar import format_timestamp, parse_timestamp
+
+# Percentiles reported for the cpu / memory series.
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+ERROR_LEVELS = ("ERROR", "CRITICAL")
+
+
+def _app_of(entry: dict[str, Any]) -> str:
+    """Application name of a Datadog (`app:` tag) or Splunk (`application` field) entry."""
+    if "application" in entry:
+        return entry["application"]
+    for tag in entry.get("tags", []):
+        if tag.startswith("app:"):
+            return tag[4:]
+    return "unknown"
+
+
+def _grouped_percentiles(groups: np.ndarray, values: np.ndarray, n_groups: int,
+                         percentiles: Iterable[int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Linear-interpolated percentiles of `values` within each group, computed in one sort.
+
+    NaN values are ignored. Returns (percentiles array of shape (n_groups, len(percentiles)),
+    count of non-NaN values per group); groups without values get NaN percentiles.
+    """
+    percentiles = list(percentiles)
+    mask = ~np.isnan(values)
+    groups = groups[mask]
+    values = values[mask]
+    counts = np.bincount(groups, minlength=n_groups)
+    result = np.full((n_groups, len(percentiles)), np.nan)
+    if values.size == 0:
+        return result, counts
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    for column, q in enumerate(percentiles):
+        position = (counts[present] - 1) * (q / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        base = starts[present]
+        low_values = sorted_values[base + lower]
+        high_values = sorted_values[base + upper]
+        result[present, column] = low_values + (high_values - low_values) * fraction
+    return result, counts
+
+
+def _stats(row: np.ndarray, percentiles: list[int], maximum: float) -> dict[str, float]:
+    stats = {f"p{q}": round(float(value), 1) for q, value in zip(percentiles, row)}
+    stats["max"] = round(float(maximum), 1)
+    return stats
+
+
+class HealthAggregator:
+    """
+    Batched health aggregation over a `get_logs` result (Datadog or Splunk entries).
+
+    All entries are converted to NumPy columns once, then per-app/per-host time buckets,
+    cpu/memory percentiles, error rates by level, pod-status counts and the deployment-event
+    timeline are computed with grouped array operations instead of per-entry Python logic.
+    """
+
+    def __init__(self, bucket_minutes: int = 60, percentiles: Iterable[int] = DEFAULT_PERCENTILES):
+        """
+        :param bucket_minutes: Width of the time buckets the series are grouped into.
+        :param percentiles: Percentiles to report for cpu and memory.
+        """
+        self.bucket_ms = bucket_minutes * 60 * 1000
+        self.percentiles = list(percentiles)
+
+    def summarize(self, entries: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Aggregate `entries` into a compact per-app health summary.
+
+        :param entries: Log/event dictionaries as returned by DatadogApi/SplunkApi.get_logs.
+        :return: {"bucket_minutes": ..., "apps": {app_name: {...}}}
+        """
+        n = len(entries)
+        summary = {"bucket_minutes": self.bucket_ms // 60000, "apps": {}}
+        if n == 0:
+            return summary
+
+        # --- Single pass from dicts to columns ---
+        timestamps = np.empty(n, dtype=np.int64)
+        cpu = np.full(n, np.nan)
+        memory = np.full(n, np.nan)
+        app_names, hosts, levels, kinds, pod_statuses, ready = [], [], [], [], [], []
+        events = []
+        for i, entry in enumerate(entries):
+            timestamps[i] = parse_timestamp(entry["timestamp"])
+            app_names.append(_app_of(entry))
+            hosts.append(entry.get("host", "unknown"))
+            levels.append(str(entry.get("level", "")).upper())
+            kind = entry.get("type", "log")
+            kinds.append(kind)
+            if "cpu" in entry:
+                cpu[i] = entry["cpu"]
+            if "memory" in entry:
+                memory[i] = entry["memory"]
+            pod_statuses.append(entry.get("pod_status", ""))
+            ready.append(entry.get("ready"))
+            if kind == "event":
+                events.append(i)
+
+        app_values, app_codes = np.unique(np.array(app_names), return_inverse=True)
+        host_values, host_codes = np.unique(np.array(hosts), return_inverse=True)
+        level_values, level_codes = np.unique(np.array(levels), return_inverse=True)
+        is_log = np.array(kinds) != "event"
+        is_error = np.isin(np.array(levels), ERROR_LEVELS) & is_log
+        buckets = timestamps // self.bucket_ms
+        bucket_values, bucket_codes = np.unique(buckets, return_inverse=True)
+
+        n_apps = len(app_values)
+        n_hosts = len(host_values)
+        n_levels = len(level_values)
+        n_buckets = len(bucket_values)
+
+        # --- Level counts and error rates per app ---
+        level_counts = np.bincount(app_codes[is_log] * n_levels + level_codes[is_log],
+                                   minlength=n_apps * n_levels).reshape(n_apps, n_levels)
+        log_counts = level_counts.sum(axis=1)
+        error_counts = np.bincount(app_codes[is_error], minlength=n_apps)
+
+        # --- Per app/host overall percentiles ---
+        app_host = app_codes * n_hosts + host_codes
+        n_app_hosts = n_apps * n_hosts
+        cpu_overall, _ = _grouped_percentiles(app_host, cpu, n_app_hosts, self.percentiles)
+        mem_overall, _ = _grouped_percentiles(app_host, memory, n_app_hosts, self.percentiles)
+        cpu_max = np.full(n_app_hosts, np.nan)
+        mem_max = np.full(n_app_hosts, np.nan)
+        np.fmax.at(cpu_max, app_host, cpu)
+        np.fmax.at(mem_max, app_host, memory)
+        host_entries = np.bincount(app_host, minlength=n_app_hosts)
+        host_logs = np.bincount(app_host[is_log], minlength=n_app_hosts)
+        host_errors = np.bincount(app_host[is_error], minlength=n_app_hosts)
+
+        # --- Per app/host/bucket series ---
+        series_key = app_host * n_buckets + bucket_codes
+        series_values, series_codes = np.unique(series_key, return_inverse=True)
+        n_series = len(series_values)
+        cpu_series, _ = _grouped_percentiles(series_codes, cpu, n_series, self.percentiles)
+        mem_series, _ = _grouped_percentiles(series_codes, memory, n_series, self.percentiles)
+        series_logs = np.bincount(series_codes[is_log], minlength=n_series)
+        series_errors = np.bincount(series_codes[is_error], minlength=n_series)
+
+        # --- Pod status counts per app ---
+        pod_status_array = np.array(pod_statuses)
+        has_status = pod_status_array != ""
+        status_counts = {}
+        if has_status.any():
+            status_values, status_codes = np.unique(pod_status_array[has_status], return_inverse=True)
+            counts = np.bincount(app_codes[has_status] * len(status_values) + status_codes,
+                                 minlength=n_apps * len(status_values)).reshape(n_apps, len(status_values))
+            for a in range(n_apps):
+                status_counts[a] = {str(s): int(c) for s, c in zip(status_values, counts[a]) if c}
+        ready_array = np.array([r is False for r in ready])
+        not_ready = np.bincount(app_codes[ready_array], minlength=n_apps)
+
+        # --- Window per app ---
+        first_seen = np.full(n_apps, np.iinfo(np.int64).max)
+        last_seen = np.full(n_apps, np.iinfo(np.int64).min)
+        np.minimum.at(first_seen, app_codes, timestamps)
+        np.maximum.at(last_seen, app_codes, timestamps)
+        app_entries = np.bincount(app_codes, minlength=n_apps)
+
+        # --- Assemble ---
+        for a, app in enumerate(app_values):
+            app_summary = {
+                "window": {
+                    "start": format_timestamp(int(first_seen[a])),
+                    "end": format_timestamp(int(last_seen[a])),
+                    "entries": int(app_entries[a]),
+                },
+                "levels": {str(level): int(c) for level, c in zip(level_values, level_counts[a]) if c and level},
+                "error_rate": round(float(error_counts[a]) / log_counts[a], 3) if log_counts[a] else 0.0,
+                "pod_status": status_counts.get(a, {}),
+                "not_ready": int(not_ready[a]),
+                "hosts": {},
+                "events": [],
+            }
+            for h, host in enumerate(host_values):
+                key = a * n_hosts + h
+                if not host_entries[key]:
+                    continue
+                host_summary = {
+                    "logs": int(host_logs[key]),
+                    "error_rate": round(float(host_errors[key]) / host_logs[key], 3) if host_logs[key] else 0.0,
+                }
+                if not np.isnan(cpu_max[key]):
+                    host_summary["cpu"] = _stats(cpu_overall[key], self.percentiles, cpu_max[key])
+                if not np.isnan(mem_max[key]):
+                    host_summary["memory"] = _stats(mem_overall[key], self.percentiles, mem_max[key])
+                host_summary["buckets"] = self._buckets(key, n_buckets, series_values, bucket_values,
+                                                        cpu_series, mem_series, series_logs, series_errors)
+                app_summary["hosts"][str(host)] = host_summary
+            summary["apps"][str(app)] = app_summary
+
+        # --- Event timeline (events are already few; keep them in time order) ---
+        for i in sorted(events, key=lambda i: timestamps[i]):
+            entry = entries[i]
+            summary["apps"][_app_of(entry)]["events"].append({
+                "timestamp": entry["timestamp"],
+                "title": entry.get("title", ""),
+                "alert_type": entry.get("alert_type", ""),
+                "host": entry.get("host", ""),
+            })
+        return summary
+
+    def _buckets(self, key, n_buckets, series_values, bucket_values, cpu_series, mem_series,
+                 series_logs, series_errors) -> list[dict[str, Any]]:
+        """Bucketed series of one app/host, skipping empty buckets."""
+        first = np.searchsorted(series_values, key * n_buckets)
+        last = np.searchsorted(series_values, (key + 1) * n_buckets)
+        median = self.percentiles.index(50) if 50 in self.percentiles else 0
+        rows = []
+        for s in range(first, last):
+            bucket = bucket_values[series_values[s] - key * n_buckets]
+            row = {
+                "start": format_timestamp(int(bucket * self.bucket_ms)),
+                "logs": int(series_logs[s]),
+                "errors": int(series_errors[s]),
+            }
+            if not np.isnan(cpu_series[s, median]):
+                row[f"cpu_p{self.percentiles[median]}"] = round(float(cpu_series[s, median]), 1)
+                row[f"cpu_p{self.percentiles[-1]}"] = round(float(cpu_series[s, -1]), 1)
+            if not np.isnan(mem_series[s, median]):
+                row[f"memory_p{self.percentiles[median]}"] = round(float(mem_series[s, median]), 1)
+                row[f"memory_p{self.percentiles[-1]}"] = round(float(mem_series[s, -1]), 1)
+            rows.append(row)
+        return rows
+
+
+def format_health(summary: dict[str, Any]) -> str:
+    """Render a `HealthAggregator.summarize` result as compact text (bucketed series left out)."""
+    lines = []
+    for app, app_summary in summary["apps"].items():
+        levels = " ".join(f"{level}={count}" for level, count in app_summary["levels"].items())
+        line = (f"{app}: {app_summary['window']['entries']} entries from {app_summary['window']['start']} "
+                f"to {app_summary['window']['end']}, levels {levels}, error_rate={app_summary['error_rate']}")
+        if app_summary["pod_status"]:
+            statuses = " ".join(f"{status}={count}" for status, count in app_summary["pod_status"].items())
+            line += f", pod_status {statuses}, not_ready={app_summary['not_ready']}"
+        lines.append(line)
+        for host, host_summary in app_summary["hosts"].items():
+            line = f"  host {host}: logs={host_summary['logs']} error_rate={host_summary['error_rate']}"
+            for metric in ("cpu", "memory"):
+                if metric in host_summary:
+                    stats = "/".join(str(value) for value in host_summary[metric].values())
+                    line += f" {metric} {'/'.join(host_summary[metric])}={stats}"
+            lines.append(line)
+        for event in app_summary["events"]:
+            lines.append(f"  event {event['timestamp']} {event['title']} ({event['alert_type']}) on {event['host']}")
+    return "\n".join(lines)
+
+
+def summarize_health(entries: list[dict[str, Any]], bucket_minutes: int = 60) -> dict[str, Any]:
+    """Convenience wrapper around HealthAggregator.summarize."""
+    return HealthAggregator(bucket_minutes=bucket_minutes).summarize(entries)
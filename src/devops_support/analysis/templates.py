@@ -0,0 +1,186 @@
+import re
+from typing import Any, Iterable, Optional
+
+# Drain parameters: similarity needed to join a cluster, number of leading tokens routing a
+# message down the parse tree, and fan-out of a tree node before extra tokens share a wildcard child.
+TEMPLATE_SIMILARITY = 0.5
+TEMPLATE_TREE_DEPTH = 4
+TEMPLATE_MAX_CHILDREN = 100
+# Distinct values kept per template parameter
+TEMPLATE_MAX_SAMPLES = 5
+
+WILDCARD = "<*>"
+_SEEN_LIMIT = 100_000
+
+# Variable parts masked before clustering (ids, numbers, uuids)
+_VARIABLE_PATTERNS = [
+    re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"),
+    re.compile(r"\b0x[0-9a-fA-F]+\b"),
+    re.compile(r"\d+(\.\d+)?"),
+]
+_HAS_DIGIT = re.compile(r"\d")
+
+
+def mask_variables(message: str) -> str:
+    """Mask the variable parts (ids, numbers, uuids) of a log message so repeats collapse together."""
+    for pattern in _VARIABLE_PATTERNS:
+        message = pattern.sub(WILDCARD, message)
+    return message
+
+
+class LogCluster:
+    """One mined template with its occurrences."""
+
+    def __init__(self, cluster_id: int, tokens: list[str], raw_tokens: list[str], timestamp: str,
+                 host: Optional[str], max_samples: int):
+        self.cluster_id = cluster_id
+        self.tokens = tokens
+        self.sample = " ".join(raw_tokens)
+        self.count = 0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.hosts: set[str] = set()
+        self.max_samples = max_samples
+        # Distinct values seen at each parameter position
+        self.params: dict[int, list[str]] = {}
+        self._sample_tokens = raw_tokens
+        self.add(raw_tokens, timestamp, host)
+
+    @property
+    def level(self) -> str:
+        return self.tokens[0]
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens[1:])
+
+    def add(self, raw_tokens: list[str], timestamp: str, host: Optional[str]):
+        self.count += 1
+        if timestamp < self.first_seen:
+            self.first_seen = timestamp
+        if timestamp > self.last_seen:
+            self.last_seen = timestamp
+        if host:
+            self.hosts.add(host)
+        for position, token in enumerate(self.tokens):
+            if WILDCARD in token:
+                self._record(position, raw_tokens[position])
+
+    def _record(self, position: int, value: str):
+        token = self.tokens[position]
+        if token.count(WILDCARD) == 1 and token != WILDCARD:
+            # "<*>." / "id=<*>": keep only the variable part
+            prefix, suffix = token.split(WILDCARD)
+            if value.startswith(prefix) and value.endswith(suffix) and len(value) > len(prefix) + len(suffix):
+                value = value[len(prefix):len(value) - len(suffix)]
+        values = self.params.setdefault(position, [])
+        if len(values) < self.max_samples and value not in values:
+            values.append(value)
+
+    def merge(self, masked: list[str]):
+        """Generalize the template to also match `masked`: differing positions become wildcards."""
+        for position, (token, other) in enumerate(zip(self.tokens, masked)):
+            if token != other and token != WILDCARD:
+                self.tokens[position] = WILDCARD
+                # The first occurrence's value, the others are recorded by add()
+                self._record(position, self._sample_tokens[position])
+
+    def parameter_values(self) -> list[list[str]]:
+        """Sample values of each parameter, in template order."""
+        return [self.params.get(position, []) for position, token in enumerate(self.tokens) if WILDCARD in token]
+
+
+class TemplateMiner:
+    """
+    Streaming log template miner (Drain, He et al. 2017).
+
+    Messages are masked (numbers, ids), split into tokens and routed down a fixed-depth parse
+    tree by their length and first tokens; within the leaf, a message joins the most similar
+    cluster (share of identical tokens >= `similarity`), whose template then turns the differing
+    tokens into <*> wildcards, or starts a new one. Each message costs one tree walk, so the miner
+    keeps up with streams and its memory grows with the number of templates, not of messages.
+
+    The level is the first token, so templates never mix levels.
+    """
+
+    def __init__(self, similarity: float = TEMPLATE_SIMILARITY, depth: int = TEMPLATE_TREE_DEPTH,
+                 max_children: int = TEMPLATE_MAX_CHILDREN, max_samples: int = TEMPLATE_MAX_SAMPLES):
+        """
+        :param similarity: Minimum share of identical tokens for a message to join a cluster.
+        :param depth: Depth of the parse tree (number of routing tokens + 2).
+        :param max_children: Maximum children of a tree node before routing to a wildcard child.
+        :param max_samples: Distinct values kept per template parameter.
+        """
+        self.similarity = similarity
+        self.depth = max(depth, 3)
+        self.max_children = max_children
+        self.max_samples = max_samples
+        self.clusters: list[LogCluster] = []
+        self._root: dict[int, dict] = {}
+        # Masked message -> its cluster: exact repeats skip the tree walk (bounded)
+        self._seen: dict[tuple, LogCluster] = {}
+
+    def add(self, message: str, level: str = "INFO", timestamp: str = "", host: Optional[str] = None) -> LogCluster:
+        """Add one message; returns the cluster it joined."""
+        raw_tokens = [level] + message.split()
+        masked = [level] + mask_variables(message).split()
+        if len(masked) != len(raw_tokens):
+            # Masking never changes the token count; be safe with odd whitespace anyway
+            raw_tokens = masked
+        key = tuple(masked)
+        cluster = self._seen.get(key)
+        if cluster is not None:
+            # Already generalized to cover this message
+            cluster.add(raw_tokens, timestamp, host)
+            return cluster
+        leaf = self._leaf(masked)
+        cluster = self._match(leaf, masked)
+        if cluster is None:
+            cluster = LogCluster(len(self.clusters), masked, raw_tokens, timestamp, host, self.max_samples)
+            self.clusters.append(cluster)
+            leaf.append(cluster)
+        else:
+            cluster.merge(masked)
+            cluster.add(raw_tokens, timestamp, host)
+        if len(self._seen) < _SEEN_LIMIT:
+            self._seen[key] = cluster
+        return cluster
+
+    def add_entries(self, entries: Iterable[dict[str, Any]], text_of, level_of) -> "TemplateMiner":
+        """Add log/event entries, using `text_of(entry)` and `level_of(entry)` to read them."""
+        for entry in entries:
+            self.add(text_of(entry), level_of(entry), entry.get("timestamp", ""), entry.get("host"))
+        return self
+
+    def _leaf(self, tokens: list[str]) -> list[LogCluster]:
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            if WILDCARD in token or _HAS_DIGIT.search(token):
+                token = WILDCARD
+            child = node.get(token)
+            if child is None:
+                if len(node) >= self.max_children:
+                    token = WILDCARD
+                child = node.setdefault(token, {})
+            node = child
+        return node.setdefault(None, [])
+
+    def _match(self, leaf: list[LogCluster], tokens: list[str]) -> Optional[LogCluster]:
+        best, best_score, best_wildcards = None, -1.0, 0
+        for cluster in leaf:
+            same = wildcards = 0
+            for token, other in zip(cluster.tokens, tokens):
+                if token == WILDCARD:
+                    wildcards += 1
+                elif token == other:
+                    same += 1
+            score = same / len(tokens)
+            # Ties go to the more specific template
+            if score > best_score or (score == best_score and wildcards < best_wildcards):
+                best, best_score, best_wildcards = cluster, score, wildcards
+        if best is not None and best_score + best_wildcards / len(tokens) >= self.similarity:
+            return best
+        return None
+
+    def __len__(self) -> int:
+        return len(self.clusters)
@@ -0,0 +1,47 @@
+import heapq
+from typing import Any, Iterable
+
+from devops_support.data.columnar import parse_timestamp
+
+
+def normalize_entry(entry: dict[str, Any], source: str) -> dict[str, Any]:
+    """
+    Bring a Splunk/Datadog entry into the common timeline shape, tagging it with its source.
+
+    Logs keep type/timestamp/level/host/message, events keep type/timestamp/host/title/text/alert_type.
+    The source is also prefixed to the message (or event title) so it survives template grouping.
+    """
+    if entry.get("type") == "event":
+        return {
+            "type": "event",
+            "timestamp": entry["timestamp"],
+            "source": source,
+            "host": entry.get("host", ""),
+            "title": f"[{source}] {entry.get('title', '')}",
+            "text": entry.get("text", ""),
+            "alert_type": entry.get("alert_type", ""),
+        }
+    return {
+        "type": "log",
+        "timestamp": entry["timestamp"],
+        "source": source,
+        "level": str(entry.get("level", "INFO")).upper(),
+        "host": entry.get("host", ""),
+        "message": f"[{source}] {entry.get('message', '')}",
+    }
+
+
+def _keyed(entries: Iterable[dict[str, Any]], source: str):
+    for index, entry in enumerate(entries):
+        yield parse_timestamp(entry["timestamp"]), index, normalize_entry(entry, source)
+
+
+def merge_timeline(sources: dict[str, Iterable[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """
+    Merge per-source entry lists (each already oldest first, as get_logs returns them) into one
+    chronological timeline with a k-way merge.
+
+    :param sources: Mapping of source name ("splunk", "datadog", ...) to its entries.
+    """
+    streams = [_keyed(entries, source) for source, entries in sources.items()]
+    return [entry for _, _, entry in heapq.merge(*streams, key=lambda item: (item[0], item[1]))]
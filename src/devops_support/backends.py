@@ -0,0 +1,66 @@
+import os
+
+# Backend selection. "ollama" keeps the model server; "canned" / "hashing" run fully offline.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "ollama")
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "ollama")
+OLLAMA_LLM_MODEL = os.getenv("OLLAMA_LLM_MODEL", "phi:latest")
+OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "phi:latest")
+# Simulated latency (seconds per call) of the canned LLM, to model inference time when profiling
+CANNED_LLM_LATENCY = float(os.getenv("CANNED_LLM_LATENCY", "0"))
+EMBED_DIM = int(os.getenv("EMBED_DIM", "384"))
+
+
+def _check(kind: str, value: str, choices: tuple[str, ...]):
+    if value not in choices:
+        raise ValueError(f"Unknown {kind} backend '{value}'. Expected one of: {', '.join(choices)}")
+
+
+def get_crew_llm(backend: str = None):
+    """
+    LLM for the crews' agents. None keeps crewAI's default (the MODEL / API_BASE environment).
+    """
+    backend = backend or LLM_BACKEND
+    _check("LLM", backend, ("ollama", "canned"))
+    if backend == "canned":
+        from devops_support.offline_backends import CannedLLM
+        return CannedLLM()
+    return None
+
+
+def get_index_llm(backend: str = None):
+    """LLM used by llama_index (query engine answer synthesis)."""
+    backend = backend or LLM_BACKEND
+    _check("LLM", backend, ("ollama", "canned"))
+    if backend == "canned":
+        from devops_support.offline_backends import CannedIndexLLM
+        return CannedIndexLLM()
+    from llama_index.llms.ollama import Ollama
+    return Ollama(model=OLLAMA_LLM_MODEL)
+
+
+def get_embed_model(backend: str = None, cache_dir: str = None):
+    """
+    Embedding model used to build and query the documentation index.
+
+    Model-served embeddings go through a content-addressed embedding cache (EMBED_CACHE_DIR, or
+    `cache_dir`), so a text is only ever embedded once; an empty directory disables it.
+    """
+    backend = backend or EMBED_BACKEND
+    _check("embedding", backend, ("ollama", "hashing"))
+    if backend == "hashing":
+        # Cheaper to recompute than to look up
+        from devops_support.offline_backends import HashingEmbedding
+        return HashingEmbedding()
+    from llama_index.embeddings.ollama import OllamaEmbedding
+    from devops_support.knowledge.embedding_cache import EMBED_CACHE_DIR, CachedEmbedding
+    model = OllamaEmbedding(model_name=OLLAMA_EMBED_MODEL)
+    cache_dir = EMBED_CACHE_DIR if cache_dir is None else cache_dir
+    return CachedEmbedding(model, cache_dir=cache_dir) if cache_dir else model
+
+
+def configure_llama_index(llm_backend: str = None, embed_backend: str = None):
+    """Install the configured LLM and embedding model as llama_index's global Settings."""
+    from llama_index.core import Settings
+    Settings.llm = get_index_llm(llm_backend)
+    Settings.embed_model = get_embed_model(embed_backend)
+
@@ -0,0 +1,112 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+
+def environment() -> dict[str, Any]:
+    """Where and on what the benchmarks ran, so results can be compared across commits."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Latency statistics, in milliseconds, of timing samples given in seconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {
+        "runs": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "p95_ms": round(p95, 4),
+        "min_ms": round(ms[0], 4),
+        "max_ms": round(ms[-1], 4),
+        "stdev_ms": round(statistics.stdev(ms), 4) if len(ms) > 1 else 0.0,
+    }
+
+
+class BenchmarkRecorder:
+    """Times benchmark cases and collects the results as JSON-serializable records."""
+
+    def __init__(self, repeat: int = 5, warmup: int = 1):
+        """
+        :param repeat: Default number of timed runs per case.
+        :param warmup: Default number of untimed runs before timing.
+        """
+        self.repeat = repeat
+        self.warmup = warmup
+        self.results: list[dict[str, Any]] = []
+
+    def measure(self, name: str, func: Callable[[], Any], params: dict = None, repeat: Optional[int] = None,
+                warmup: Optional[int] = None, info: Callable[[Any], dict] = None) -> dict[str, Any]:
+        """
+        Time `func` and record the result under `name`.
+
+        :param info: Builds extra fields for the record from the last run's return value
+                     (e.g. the number of rows returned).
+        """
+        repeat = self.repeat if repeat is None else repeat
+        warmup = self.warmup if warmup is None else warmup
+        samples = []
+        value = None
+        for run in range(warmup + repeat):
+            start = time.perf_counter()
+            value = func()
+            elapsed = time.perf_counter() - start
+            if run >= warmup:
+                samples.append(elapsed)
+        return self.record(name, samples, params, **(info(value) if info is not None else {}))
+
+    def record(self, name: str, samples: list[float], params: dict = None, **extra) -> dict[str, Any]:
+        """Record timing samples (in seconds) measured by the caller."""
+        record = {"name": name, "params": params or {}, **summarize(samples), **extra}
+        self.results.append(record)
+        print(f"{name} {json.dumps(params or {})}: median {record['median_ms']} ms, p95 {record['p95_ms']} ms")
+        return record
+
+    def report(self, config: dict = None) -> dict[str, Any]:
+        return {"environment": environment(), "config": config or {}, "results": self.results}
+
+    def write(self, path: str, config: dict = None) -> dict[str, Any]:
+        report = self.report(config)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+def _key(record: dict) -> str:
+    return record["name"] + json.dumps(record.get("params", {}), sort_keys=True)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.2) -> list[dict[str, Any]]:
+    """
+    Compare two reports case by case on median latency.
+
+    :param threshold: Ratio (current / baseline) above which a case is flagged as a regression.
+    :return: One entry per case present in both reports.
+    """
+    previous = {_key(record): record for record in baseline["results"] if "median_ms" in record}
+    rows = []
+    for record in current["results"]:
+        before = previous.get(_key(record))
+        if before is None or "median_ms" not in record or not before["median_ms"]:
+            continue
+        ratio = record["median_ms"] / before["median_ms"]
+        rows.append({"name": record["name"], "params": record["params"], "baseline_ms": before["median_ms"],
+                     "current_ms": record["median_ms"], "ratio": round(ratio, 3),
+                     "regression": ratio > threshold})
+    return rows
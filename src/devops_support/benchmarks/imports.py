@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Import-time budgets of the entry points: (budget in ms, top-level packages that must not be loaded).
+# CLI runs and job pods are short-lived, so every entry point only pays for what its command uses.
+IMPORT_BUDGETS = {
+    "devops_support.main": (150, ("crewai", "llama_index", "chromadb", "weave", "litellm")),
+    "devops_support.backends": (50, ("crewai", "llama_index", "chromadb", "numpy")),
+    "devops_support.data.splunk_api": (100, ("crewai", "llama_index", "chromadb", "numpy")),
+    "devops_support.data.datadog_api": (100, ("crewai", "llama_index", "chromadb", "numpy")),
+    "devops_support.analysis.context": (100, ("crewai", "llama_index", "chromadb")),
+    "devops_support.analysis.anomaly": (50, ("crewai", "llama_index", "chromadb", "numpy")),
+    "devops_support.agents.splunk_agent": (6000, ("llama_index", "weave")),
+    "devops_support.agents.datadog_agent": (6000, ("llama_index", "weave")),
+    "api.main": (1500, ("crewai", "llama_index", "chromadb", "weave")),
+}
+# Multiplier applied to every budget (slower CI machines)
+IMPORT_BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+# A plain import statement: -X importtime does not attribute importlib.import_module() to the module
+_PROBE = "import {module}; import json, sys; print(json.dumps(sorted(sys.modules)))"
+
+
+def measure_import(module: str) -> dict:
+    """
+    Import `module` in a fresh interpreter (python -X importtime) and return its cumulative import
+    time in ms and the top-level packages it loaded.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}"
+        return {"module": module, "error": error}
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match and match.group(4) == module:
+            cumulative_us = int(match.group(2))
+    packages = sorted({name.split(".")[0] for name in json.loads(result.stdout.strip().splitlines()[-1])})
+    return {"module": module, "ms": cumulative_us / 1000, "packages": packages}
+
+
+def check_imports(modules: list[str] = None, repeat: int = 3) -> list[dict]:
+    """
+    Measure each entry point (best of `repeat` cold imports) against its IMPORT_BUDGETS entry.
+    Every result carries the violations found ("violations": [] when within budget).
+    """
+    results = []
+    for module in modules or list(IMPORT_BUDGETS):
+        budget_ms, forbidden = IMPORT_BUDGETS.get(module, (None, ()))
+        runs = [measure_import(module) for _ in range(max(1, repeat))]
+        failed = [run for run in runs if "error" in run]
+        if failed:
+            results.append({**failed[0], "violations": [f"import failed: {failed[0]['error']}"]})
+            continue
+        best = min(runs, key=lambda run: run["ms"])
+        violations = []
+        if budget_ms is not None and best["ms"] > budget_ms * IMPORT_BUDGET_SCALE:
+            violations.append(f"{best['ms']:.0f} ms > budget {budget_ms * IMPORT_BUDGET_SCALE:.0f} ms")
+        loaded = sorted(set(forbidden) & set(best["packages"]))
+        if loaded:
+            violations.append(f"loads {', '.join(loaded)}")
+        results.append({**best, "budget_ms": budget_ms, "violations": violations})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the entry points against their budgets.")
+    parser.add_argument("modules", nargs="*", help=f"Modules to check (default: {', '.join(IMPORT_BUDGETS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold imports per module; the fastest counts")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = check_imports(args.modules, args.repeat)
+    for result in results:
+        status = "FAIL" if result["violations"] else "ok"
+        took = f"{result['ms']:8.1f} ms" if "ms" in result else "       - ms"
+        print(f"{status:4}  {took}  {result['module']}  {'; '.join(result['violations'])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if any(result["violations"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+from devops_support.benchmarks.harness import BenchmarkRecorder, compare
+
+SUITES = ("data", "prompt", "retrieval", "crew")
+
+_TOPICS = ["application", "sync", "rollback", "health", "cluster", "repository", "project", "RBAC",
+           "hook", "manifest", "Helm", "Kustomize", "namespace", "secret", "webhook", "diff", "prune"]
+_VERBS = ["configures", "reconciles", "deploys", "monitors", "restricts", "renders", "compares", "reports"]
+_QUERIES = ["How do I roll back an application?", "How does automated sync prune resources?",
+            "How are RBAC policies configured for a project?", "What does the health status of an application mean?"]
+
+
+def synthetic_documents(count: int, seed: int = 0, sentences: int = 40) -> list:
+    """ArgoCD-flavoured documents of `sentences` sentences each, for index build/query benchmarks."""
+    from llama_index.core import Document
+    rng = np.random.default_rng(seed)
+    documents = []
+    for i in range(count):
+        words = rng.integers(0, len(_TOPICS), (sentences, 3))
+        verbs = rng.integers(0, len(_VERBS), sentences)
+        text = " ".join(f"The {_TOPICS[a]} controller {_VERBS[v]} the {_TOPICS[b]} of each {_TOPICS[c]}."
+                        for (a, b, c), v in zip(words.tolist(), verbs.tolist()))
+        documents.append(Document(text=text, metadata={"URL": f"https://argocd.example/docs/{i}"}))
+    return documents
+
+
+def build_stores(sizes: list[int], seed: int) -> dict:
+    """Datadog and Splunk LogStores of each size, plus the busiest application name."""
+    from devops_support.data.synthetic import SyntheticDataGenerator
+    stores = {}
+    for size in sizes:
+        generator = SyntheticDataGenerator(seed=seed, records=size, apps=max(10, size // 1000))
+        entry = {"app": generator.app_names[int(np.argmax(generator.app_weights))]}
+        for flavor in ("datadog", "splunk"):
+            start = time.perf_counter()
+            entry[flavor] = generator.build_store(flavor)
+            entry[f"{flavor}_load_s"] = time.perf_counter() - start
+        stores[size] = entry
+    return stores
+
+
+def bench_data(recorder: BenchmarkRecorder, stores: dict):
+    from devops_support.data.datadog_api import DatadogApi
+    from devops_support.data.splunk_api import SplunkApi
+    for size, entry in stores.items():
+        for flavor, api in (("datadog", DatadogApi(store=entry["datadog"])), ("splunk", SplunkApi(store=entry["splunk"]))):
+            recorder.record(f"{flavor}.load_store", [entry[f"{flavor}_load_s"]], {"records": size})
+            for days in (1, 7, 30):
+                recorder.measure(f"{flavor}.get_logs", lambda: api.get_logs(entry["app"], days),
+                                 params={"records": size, "days": days}, info=lambda rows: {"rows": len(rows)})
+
+
+def bench_prompt(recorder: BenchmarkRecorder, stores: dict):
+    from devops_support.agents.datadog_agent import build_datadog_context
+    from devops_support.agents.splunk_agent import build_splunk_context
+    from devops_support.data.datadog_api import DatadogApi
+    from devops_support.data.splunk_api import SplunkApi
+    for size, entry in stores.items():
+        app = entry["app"]
+        datadog = DatadogApi(store=entry["datadog"]).get_logs(app, 30)
+        splunk = SplunkApi(store=entry["splunk"]).get_logs(app, 30)
+        recorder.measure("prompt.datadog_context", lambda: build_datadog_context(datadog),
+                         params={"records": size}, info=lambda text: {"entries": len(datadog), "chars": len(text)})
+        recorder.measure("prompt.splunk_context", lambda: build_splunk_context(splunk, app),
+                         params={"records": size}, info=lambda text: {"entries": len(splunk), "chars": len(text)})
+
+
+def build_engine(documents: list):
+    from devops_support.knowledge.query import QueryEngine
+    from devops_support.knowledge.vector_store import VectorStore
+    return QueryEngine(VectorStore(f"bench_{uuid.uuid4().hex}"), documents).get_query_engine()
+
+
+def bench_retrieval(recorder: BenchmarkRecorder, doc_counts: list[int], seed: int) -> object:
+    """Index build and query latency. Returns the engine over the largest corpus (for the crew suite)."""
+    from devops_support.backends import configure_llama_index
+    configure_llama_index("canned", "hashing")
+    engine = None
+    for count in doc_counts:
+        documents = synthetic_documents(count, seed)
+        recorder.measure("query_engine.build", lambda: build_engine(documents), params={"documents": count},
+                         repeat=max(1, recorder.repeat // 2), warmup=0)
+        engine = build_engine(documents)
+        queries = iter(_QUERIES * (recorder.repeat + recorder.warmup))
+        recorder.measure("query_engine.query", lambda: engine.query(next(queries)), params={"documents": count})
+    return engine
+
+
+def _offline_crew(crew_instance, llm):
+    """Build the crew of a CrewBase instance with every agent on the canned LLM and output muted."""
+    crew = crew_instance.crew()
+    crew.verbose = False
+    for crew_agent in crew.agents:
+        crew_agent.llm = llm
+        crew_agent.verbose = False
+    return crew
+
+
+def bench_crew(recorder: BenchmarkRecorder, engine=None):
+    from devops_support.agents.datadog_agent import DatadogCrew
+    from devops_support.agents.splunk_agent import SplunkCrew
+    from devops_support.offline_backends import CannedLLM
+    llm = CannedLLM(latency=0.0)
+    cases = [
+        ("splunk", SplunkCrew, {"query": "can you check the status for application AuthService?", "days": 20}),
+        ("datadog", DatadogCrew, {"query": "can you check the status for appID app-002 with app name backend_service?",
+                                  "days": 20}),
+    ]
+    if engine is not None:
+        from devops_support.agents.argocd_agent import ArgoCDCrew
+        cases.append(("argocd", lambda: ArgoCDCrew(query_engine=engine),
+                      {"query": "I want to list steps to set up ArgoCD in EKS cluster."}))
+    for name, factory, inputs in cases:
+        # Cold: a new crew instance per kickoff; warm: one instance kicked off repeatedly
+        recorder.measure(f"crew.{name}.kickoff_cold", lambda: _offline_crew(factory(), llm).kickoff(inputs=dict(inputs)),
+                         repeat=max(1, recorder.repeat // 2))
+        warm = factory()
+        recorder.measure(f"crew.{name}.kickoff_warm", lambda: _offline_crew(warm, llm).kickoff(inputs=dict(inputs)),
+                         repeat=max(1, recorder.repeat // 2))
+
+
+def _ints(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data, prompt, retrieval and crew paths offline.")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated subset of {SUITES}")
+    parser.add_argument("--sizes", type=_ints, default=[10_000, 100_000, 300_000],
+                        help="Dataset sizes (records) for the data and prompt suites")
+    parser.add_argument("--documents", type=_ints, default=[20, 100], help="Corpus sizes for the retrieval suite")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+
+    # Keep crew runs fully local
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+    suites = [suite for suite in args.suites.split(",") if suite]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    recorder = BenchmarkRecorder(repeat=args.repeat, warmup=args.warmup)
+    stores = build_stores(args.sizes, args.seed) if {"data", "prompt"} & set(suites) else {}
+    if "data" in suites:
+        bench_data(recorder, stores)
+    if "prompt" in suites:
+        bench_prompt(recorder, stores)
+    engine = None
+    if "retrieval" in suites or "crew" in suites:
+        engine = bench_retrieval(recorder, args.documents if "retrieval" in suites else [args.documents[0]], args.seed)
+    if "crew" in suites:
+        bench_crew(recorder, engine)
+
+    report = recorder.write(args.output, config=vars(args))
+    print(f"Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(json.load(f), report, args.threshold)
+        regressions = [row for row in rows if row["regression"]]
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{flag:>10} {row['name']} {json.dumps(row['params'])}: "
+                  f"{row['baseline_ms']} -> {row['current_ms']} ms (x{row['ratio']})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
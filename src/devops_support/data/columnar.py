@@ -0,0 +1,242 @@
+import bisect
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Optional
+
+# Code used in every interned column for "no value on this row".
+MISSING = -1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    """Convert a datetime (naive datetimes are treated as UTC) into epoch milliseconds."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_MS
+
+
+def parse_timestamp(value: str) -> int:
+    """
+    Convert an ISO 8601 UTC timestamp ("2025-03-16T04:19:14.854Z" or "2025-03-16T04:19:14Z")
+    into epoch milliseconds.
+    """
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+        except ValueError:
+            dt = datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    return to_epoch_ms(dt)
+
+
+def format_timestamp(ts_ms: int, precision: str = "ms") -> str:
+    """
+    Format epoch milliseconds back into the ISO 8601 UTC strings used by the mock APIs.
+
+    :param precision: "ms" for "2025-03-16T04:19:14.854Z", "s" for "2025-03-16T04:19:14Z".
+    """
+    dt = _EPOCH + timedelta(milliseconds=ts_ms)
+    if precision == "s":
+        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ts_ms % 1000:03d}Z"
+
+
+class StringTable:
+    """Interned strings addressed by an integer code."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def code_of(self, value: str) -> int:
+        """Return the code of `value` without interning it (MISSING if unknown)."""
+        return self._codes.get(value, MISSING)
+
+    def lookup(self, code: int) -> Optional[str]:
+        return None if code == MISSING else self.values[code]
+
+
+class CategoryColumn:
+    """Dense column holding one interned code per row (level, host, app, message...)."""
+
+    def __init__(self, table: StringTable = None):
+        self.table = table if table is not None else StringTable()
+        self.codes = array("i")
+
+    def append(self, value: Optional[str]):
+        self.codes.append(self.table.intern(value))
+
+    def get(self, row: int) -> Optional[str]:
+        return self.table.lookup(self.codes[row])
+
+
+class SparseColumn:
+    """
+    Column with values on a minority of rows, stored as parallel (row, value) arrays in row order.
+
+    :param kind: "int", "bool" or "category".
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.rows = array("q")
+        self.table = None
+        if kind == "int":
+            self.values = array("q")
+        elif kind == "bool":
+            self.values = array("b")
+        elif kind == "category":
+            self.table = StringTable()
+            self.values = array("i")
+        else:
+            raise ValueError(f"Unknown sparse column kind: {kind}")
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def set(self, row: int, value: Any):
+        """Record `value` for `row`. Rows must be set in increasing order."""
+        self.rows.append(row)
+        if self.kind == "category":
+            self.values.append(self.table.intern(value))
+        else:
+            self.values.append(int(value))
+
+    def get(self, row: int, default: Any = None) -> Any:
+        pos = bisect.bisect_left(self.rows, row)
+        if pos == len(self.rows) or self.rows[pos] != row:
+            return default
+        return self._decode(self.values[pos])
+
+    def items(self) -> Iterable[tuple[int, Any]]:
+        for row, value in zip(self.rows, self.values):
+            yield row, self._decode(value)
+
+    def _decode(self, value: int) -> Any:
+        if self.kind == "bool":
+            return bool(value)
+        if self.kind == "category":
+            return self.table.lookup(value)
+        return value
+
+
+class Schema:
+    """
+    Describes how a source's records map onto a RecordBatch.
+
+    :param fields: Output field order of the dict views (including "timestamp").
+    :param categories: Low-cardinality fields stored as per-column interned codes.
+    :param strings: Free-text fields stored as codes into the batch-wide string table.
+    :param sparse: Optional fields mapped to their sparse kind ("int", "bool", "category").
+    :param timestamp_precision: "ms" or "s", used when formatting timestamps back to strings.
+    :param app_field: Field holding the application name (used for indexing).
+    :param app_id_field: Field holding the application id, if the source has one.
+    :param pack: Optional hook turning a raw entry into the flat field dict stored in the batch.
+    :param unpack: Optional hook turning a flat field dict back into the source's entry shape.
+    """
+
+    def __init__(self, fields: list[str], categories: list[str], strings: list[str] = (),
+                 sparse: dict[str, str] = None, timestamp_precision: str = "ms",
+                 app_field: str = "app", app_id_field: str = None,
+                 pack: Callable[[dict], dict] = None, unpack: Callable[[dict], dict] = None):
+        self.fields = list(fields)
+        self.categories = list(categories)
+        self.strings = list(strings)
+        self.sparse = dict(sparse or {})
+        self.timestamp_precision = timestamp_precision
+        self.app_field = app_field
+        self.app_id_field = app_id_field
+        self.pack = pack
+        self.unpack = unpack
+
+
+class RecordBatch:
+    """
+    Columnar storage for log/event records.
+
+    Timestamps are held as an int64 array of epoch milliseconds, low-cardinality fields as interned
+    category codes, messages as codes into a shared string table and metric fields as sparse
+    columns. Dict views are only built on demand through `row` / `take`.
+    """
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.timestamps = array("q")
+        self.strings = StringTable()
+        self.columns: dict[str, CategoryColumn] = {name: CategoryColumn() for name in schema.categories}
+        for name in schema.strings:
+            self.columns[name] = CategoryColumn(self.strings)
+        self.sparse: dict[str, SparseColumn] = {name: SparseColumn(kind) for name, kind in schema.sparse.items()}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, ts_ms: int, fields: dict[str, Any]) -> int:
+        """Append one record given its epoch-ms timestamp and flat fields. Returns the row number."""
+        row = len(self.timestamps)
+        self.timestamps.append(ts_ms)
+        for name, column in self.columns.items():
+            column.append(fields.get(name))
+        for name, column in self.sparse.items():
+            value = fields.get(name)
+            if value is not None:
+                column.set(row, value)
+        return row
+
+    def append_entry(self, entry: dict[str, Any]) -> int:
+        """Append a record given in the source's dict shape (ISO timestamp string included)."""
+        fields = self.schema.pack(entry) if self.schema.pack else entry
+        return self.append(parse_timestamp(entry["timestamp"]), fields)
+
+    def extend(self, entries: Iterable[dict[str, Any]]):
+        for entry in entries:
+            self.append_entry(entry)
+
+    def row(self, row: int) -> dict[str, Any]:
+        """Build the dict view of a single row."""
+        record = {}
+        for name in self.schema.fields:
+            if name == "timestamp":
+                record[name] = format_timestamp(self.timestamps[row], self.schema.timestamp_precision)
+            elif name in self.columns:
+                value = self.columns[name].get(row)
+                if value is not None:
+                    record[name] = value
+            elif name in self.sparse:
+                value = self.sparse[name].get(row)
+                if value is not None:
+                    record[name] = value
+        if self.schema.unpack:
+            record = self.schema.unpack(record)
+        return record
+
+    def take(self, rows: Iterable[int]) -> list[dict[str, Any]]:
+        return [self.row(row) for row in rows]
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return self.take(range(len(self)))
+
+    def nbytes(self) -> int:
+        """Approximate size of the array-backed columns in bytes (string tables excluded)."""
+        total = self.timestamps.itemsize * len(self.timestamps)
+        for column in self.columns.values():
+            total += column.codes.itemsize * len(column.codes)
+        for column in self.sparse.values():
+            total += column.rows.itemsize * len(column.rows) + column.values.itemsize * len(column.values)
+        return total
@@ -1,23 +1,145 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import os
 import random
+import threading
+
+from devops_support.data import seed as data_seed
+from devops_support.data.columnar import RecordBatch, Schema, to_epoch_ms
+from devops_support.data.file_source import FileLogSource, get_file_source
+from devops_support.data.log_store import LogStore, LogTail
+
+
+def _pack_datadog_entry(entry: dict) -> dict:
+    """Flatten the `app:` / `app_id:` tags of a Datadog entry into plain fields."""
+    fields = dict(entry)
+    for tag in entry.get("tags", []):
+        if tag.startswith("app:"):
+            fields["app"] = tag[4:]
+        elif tag.startswith("app_id:"):
+            fields["app_id"] = tag[7:]
+    return fields
+
+
+def _unpack_datadog_entry(record: dict) -> dict:
+    """Rebuild the `tags` list of a Datadog entry from its flat app fields."""
+    app = record.pop("app", None)
+    app_id = record.pop("app_id", None)
+    record["tags"] = [f"app:{app}", f"app_id:{app_id}"]
+    return record
+
+
+# Columnar layout of Datadog logs and events (see devops_support.data.columnar).
+DATADOG_SCHEMA = Schema(
+    fields=["type", "timestamp", "level", "title", "text", "host", "message", "app", "app_id",
+            "alert_type", "priority", "cpu", "memory", "pod_status", "ready", "pod_name"],
+    categories=["type", "level", "host", "app", "app_id", "alert_type", "priority"],
+    strings=["title", "text", "message"],
+    sparse={"cpu": "int", "memory": "int", "pod_status": "category", "ready": "bool", "pod_name": "category"},
+    timestamp_precision="ms",
+    app_field="app",
+    app_id_field="app_id",
+    pack=_pack_datadog_entry,
+    unpack=_unpack_datadog_entry,
+)
+
+# Exported Datadog dump (JSON Lines / JSON / Python-literal, optionally gzip) served by get_logs
+# instead of the generated mock data, e.g. for post-mortems on real data.
+DATADOG_LOG_FILE = os.getenv("DATADOG_LOG_FILE")
+
+# Process-wide store shared by every DatadogApi instance, built on first use.
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_store() -> LogStore:
+    """Return the shared Datadog log store, generating the mock dataset only once per process."""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = MockDatadogDataGenerator(seed=data_seed.MOCK_DATA_SEED).store
+    return _shared_store
+
 
 class DatadogApi:
+    def __init__(self, store: LogStore = None, source: FileLogSource = None):
+        """
+        :param store: Log store to read from. Defaults to the process-wide shared store.
+        :param source: Exported dump answering the queries instead of the generated data.
+                       Defaults to DATADOG_LOG_FILE when it is set.
+        """
+        self.store = store
+        self.source = source if source is not None else get_file_source(DATADOG_LOG_FILE)
+
+    def _get_store(self) -> LogStore:
+        if self.store is not None:
+            return self.store
+        # Incremental reads over a dump need its entries in a store, loaded once by the shared source
+        return self.source.store(DATADOG_SCHEMA) if self.source is not None else get_shared_store()
+
     def get_logs(self, app_name: str, days: int) -> list[dict[str, any]]:
         """
         Mock method to simulate fetching logs from Datadog API.
         Returns a list of log entries as dictionaries.
         """
-        mock_logs = MockDatadogDataGenerator()
-        return mock_logs.get_data(app_name, days)
-    
+        if self.source is not None:
+            return self.source.get_logs(app_name, days)
+        return self._get_store().query(app_name, days)
+
+    def logs_version(self, app_name: str, days: int) -> str:
+        """
+        Cheap version of what `get_logs(app_name, days)` returns (response cache key): the data's
+        identity and size plus the window, without fetching or hashing the entries.
+        """
+        if self.source is not None:
+            return f"{self.source.version()}:{app_name}:{days}"
+        return f"{self._get_store().query_version(app_name, days)}:{app_name}"
+
+    def get_logs_many(self, app_names: list[str] = None, days: int = 1) -> dict[str, list[dict[str, any]]]:
+        """
+        Bulk fetch: the Datadog logs/events of several applications (None: all of them) in one
+        pass. Returns {app_name: entries oldest first}.
+        """
+        if self.source is not None:
+            return self.source.get_logs_many(app_names, days)
+        return self._get_store().query_many(app_names, to_epoch_ms(datetime.now(timezone.utc) - timedelta(days=days)))
+
+    def get_logs_by_app_id(self, app_id: str, days: int) -> list[dict[str, any]]:
+        """
+        Same as `get_logs` but looks the application up by its id (e.g. "app-002").
+        """
+        if self.source is not None:
+            return self.source.get_logs_by_app_id(app_id, days)
+        return self._get_store().query_app_id(app_id, days)
+
+    def get_logs_since(self, app_name: str, since=None, cursor: str = None) -> tuple[list[dict[str, any]], str]:
+        """
+        Incremental fetch: only the Datadog entries of `app_name` that are new since the previous call.
+
+        :param since: Watermark (datetime, epoch ms or timestamp string) for the first call.
+        :param cursor: Resume token returned by the previous call.
+        :return: (new entries oldest first, resume token for the next call).
+        """
+        return self._get_store().read_since(app_name, cursor=cursor, since=since)
+
+    def follow(self, app_name: str, since=None, cursor: str = None, **options) -> LogTail:
+        """
+        Follow mode: iterate over the Datadog entries of `app_name` as they arrive (see LogTail for
+        the poll_interval / idle_timeout / stop options). The tail's `cursor` resumes it later.
+        """
+        return self._get_store().follow(app_name, cursor=cursor, since=since, **options)
+
+
 class MockDatadogDataGenerator:
-    def __init__(self, days=30, apps=None):
+    def __init__(self, days=30, apps=None, seed=None):
         """
         Initialize the mock data generator. Generates logs and events for given apps over the past `days` days.
         
         :param days: Number of days in the past to generate data for (default 30 days).
         :param apps: Dict of application names to application IDs (or list of app names). If None, uses default apps.
+        :param seed: Seed of the generator's random source, for reproducible datasets.
         """
+        self.rng = random.Random(seed)
         # Default applications and IDs if none provided
         if apps is None:
             # Use default app names with some mock IDs
@@ -32,7 +154,7 @@ class MockDatadogDataGenerator:
         
         self.apps = apps
         self.days = days
-        self.data = []  # will hold all log and event entries (as dicts)
+        self.batch = RecordBatch(DATADOG_SCHEMA)  # will hold all log and event entries (columnar)
         
         # Predefined hostnames per app for variety (2 hosts per app)
         self.app_hosts = {}
@@ -94,30 +216,29 @@ class MockDatadogDataGenerator:
             hosts = self.app_hosts.get(app, ["localhost"])  # host options for this app
             
             # --- Generate log entries for this app ---
-            num_logs = random.randint(50, 100)  # random number of logs for this app
+            num_logs = self.rng.randint(50, 100)  # random number of logs for this app
             for _ in range(num_logs):
                 # Random timestamp within the last `self.days` days
-                offset_seconds = random.random() * (self.days * 24 * 3600)
+                offset_seconds = self.rng.random() * (self.days * 24 * 3600)
                 ts = now - timedelta(seconds=offset_seconds)
-                # Format timestamp as ISO 8601 with milliseconds and Z (UTC)
-                ts_str = ts.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+                ts_ms = to_epoch_ms(ts)
                 
-                host = random.choice(hosts)
+                host = self.rng.choice(hosts)
                 # Weighted random choice for log level (INFO most frequent)
-                level = random.choice(["INFO"] * 3 + ["WARNING"] + ["ERROR"])
+                level = self.rng.choice(["INFO"] * 3 + ["WARNING"] + ["ERROR"])
                 
                 message = None
                 extra_fields = {}
                 # Decide if this log should include metrics data based on level
                 if level == "INFO":
-                    if random.random() < 0.3:  # 30% of INFO logs include metrics
-                        template, fields = random.choice(self.metrics_info_templates)
+                    if self.rng.random() < 0.3:  # 30% of INFO logs include metrics
+                        template, fields = self.rng.choice(self.metrics_info_templates)
                         # Generate random values for placeholders
-                        cpu_val = random.randint(0, 100)
-                        mem_val = random.randint(100, 16000)       # memory in MB
-                        status_val = random.choice(["Running", "Pending", "Succeeded"])
-                        ready_val = random.choice([True, False])
-                        pod_name_val = f"{app.replace(' ', '_')}-pod-{random.randint(1, 9999):04d}"
+                        cpu_val = self.rng.randint(0, 100)
+                        mem_val = self.rng.randint(100, 16000)       # memory in MB
+                        status_val = self.rng.choice(["Running", "Pending", "Succeeded"])
+                        ready_val = self.rng.choice([True, False])
+                        pod_name_val = f"{app.replace(' ', '_')}-pod-{self.rng.randint(1, 9999):04d}"
                         # Fill in the template
                         message = template.format(cpu=cpu_val, mem=mem_val, 
                                                   status=status_val, ready=str(ready_val), 
@@ -134,14 +255,14 @@ class MockDatadogDataGenerator:
                         if "pod_name" in fields:
                             extra_fields["pod_name"] = pod_name_val
                     else:
-                        message = random.choice(self.normal_info_messages)
+                        message = self.rng.choice(self.normal_info_messages)
                 elif level == "WARNING":
-                    if random.random() < 0.3:  # 30% of WARNING logs include metrics
-                        template, fields = random.choice(self.metrics_warning_templates)
-                        cpu_val = random.randint(50, 100)         # high CPU if warning
-                        mem_val = random.randint(1000, 16000)     # memory in MB
-                        status_val = random.choice(["Pending", "CrashLoopBackOff"])
-                        pod_name_val = f"{app.replace(' ', '_')}-pod-{random.randint(1, 9999):04d}"
+                    if self.rng.random() < 0.3:  # 30% of WARNING logs include metrics
+                        template, fields = self.rng.choice(self.metrics_warning_templates)
+                        cpu_val = self.rng.randint(50, 100)         # high CPU if warning
+                        mem_val = self.rng.randint(1000, 16000)     # memory in MB
+                        status_val = self.rng.choice(["Pending", "CrashLoopBackOff"])
+                        pod_name_val = f"{app.replace(' ', '_')}-pod-{self.rng.randint(1, 9999):04d}"
                         message = template.format(cpu=cpu_val, mem=mem_val, 
                                                   status=status_val, pod=pod_name_val, host=host)
                         if "cpu" in fields:
@@ -153,14 +274,14 @@ class MockDatadogDataGenerator:
                         if "pod_name" in fields:
                             extra_fields["pod_name"] = pod_name_val
                     else:
-                        message = random.choice(self.normal_warning_messages)
+                        message = self.rng.choice(self.normal_warning_messages)
                 else:  # level == "ERROR"
-                    if random.random() < 0.2:  # 20% of ERROR logs include metrics
-                        template, fields = random.choice(self.metrics_error_templates)
-                        cpu_val = random.randint(80, 100)
-                        mem_val = random.randint(2000, 16000)
-                        status_val = random.choice(["CrashLoopBackOff", "Error", "Failed"])
-                        pod_name_val = f"{app.replace(' ', '_')}-pod-{random.randint(1, 9999):04d}"
+                    if self.rng.random() < 0.2:  # 20% of ERROR logs include metrics
+                        template, fields = self.rng.choice(self.metrics_error_templates)
+                        cpu_val = self.rng.randint(80, 100)
+                        mem_val = self.rng.randint(2000, 16000)
+                        status_val = self.rng.choice(["CrashLoopBackOff", "Error", "Failed"])
+                        pod_name_val = f"{app.replace(' ', '_')}-pod-{self.rng.randint(1, 9999):04d}"
                         message = template.format(cpu=cpu_val, mem=mem_val, 
                                                   status=status_val, pod=pod_name_val, host=host)
                         if "cpu" in fields:
@@ -172,21 +293,20 @@ class MockDatadogDataGenerator:
                         if "pod_name" in fields:
                             extra_fields["pod_name"] = pod_name_val
                     else:
-                        message = random.choice(self.normal_error_messages)
+                        message = self.rng.choice(self.normal_error_messages)
                 
-                # Construct the log entry dictionary
-                log_entry = {
+                # Construct the log entry fields
+                log_fields = {
                     "type": "log",
-                    "timestamp": ts_str,
                     "level": level,
                     "host": host,
                     "message": message,
-                    "tags": [f"app:{app}", f"app_id:{self.apps[app]}"]
+                    "app": app,
+                    "app_id": app_id,
                 }
                 # Include any additional metrics fields in the log entry
-                for key, val in extra_fields.items():
-                    log_entry[key] = val
-                self.data.append(log_entry)
+                log_fields.update(extra_fields)
+                self.batch.append(ts_ms, log_fields)
             
             # --- Generate event entries for this app ---
             event_templates = [
@@ -201,36 +321,41 @@ class MockDatadogDataGenerator:
                 ("Database Outage", f"{app} lost connection to database cluster.", "error", "normal"),
                 ("Service Restored", f"{app} service restored after outage.", "success", "normal"),
             ]
-            num_events = random.randint(5, 10)
+            num_events = self.rng.randint(5, 10)
             for _ in range(num_events):
-                offset_seconds = random.random() * (self.days * 24 * 3600)
+                offset_seconds = self.rng.random() * (self.days * 24 * 3600)
                 ts = now - timedelta(seconds=offset_seconds)
-                ts_str = ts.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-                host = random.choice(hosts)
+                ts_ms = to_epoch_ms(ts)
+                host = self.rng.choice(hosts)
                 # Pick a random event template and fill placeholders
-                title, text_template, alert_type, priority = random.choice(event_templates)
+                title, text_template, alert_type, priority = self.rng.choice(event_templates)
                 # Fill in {host} or {instances} placeholders if present
                 if "{host}" in text_template:
                     text_filled = text_template.format(host=host)
                 elif "{instances}" in text_template:
-                    instances_val = random.randint(2, 10)
+                    instances_val = self.rng.randint(2, 10)
                     text_filled = text_template.format(instances=instances_val)
                 else:
                     text_filled = text_template
-                # Construct the event entry
-                event_entry = {
+                # Construct the event entry fields
+                self.batch.append(ts_ms, {
                     "type": "event",
-                    "timestamp": ts_str,
                     "title": title,
                     "text": text_filled,
                     "host": host,
-                    "tags": [f"app:{app}", f"app_id:{self.apps[app]}"],
+                    "app": app,
+                    "app_id": app_id,
                     "alert_type": alert_type,
                     "priority": priority
-                }
-                self.data.append(event_entry)
-        # Sort all entries by timestamp for chronological order
-        self.data.sort(key=lambda x: x["timestamp"])
+                })
+        # Index the entries per app / app_id in chronological order
+        self.store = LogStore.from_batch(self.batch)
+
+    @property
+    def data(self) -> list[dict]:
+        """All log and event entries as dicts, in chronological order (built on demand)."""
+        order = sorted(range(len(self.batch)), key=self.batch.timestamps.__getitem__)
+        return self.batch.take(order)
     
     def get_data(self, app_name, days):
         """
@@ -240,19 +365,4 @@ class MockDatadogDataGenerator:
         :param days: Number of days to look back from today (current UTC time).
         :return: List of log/event entry dictionaries for the app within the time window.
         """
-        app_name_str = str(app_name)
-        now = datetime.utcnow()
-        cutoff_time = now - timedelta(days=days)
-        result = []
-        #print(f"Fetching logs for app: {app_name} with cutoff time: {self.data}")
-        for entry in self.data:
-            # Check if this entry belongs to the given app
-            if any(tag == f"app:{app_name_str}" for tag in entry.get("tags", [])):
-                # Parse the timestamp string to datetime for comparison
-                try:
-                    entry_time = datetime.strptime(entry["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-                except ValueError:
-                    entry_time = datetime.strptime(entry["timestamp"], "%Y-%m-%dT%H:%M:%SZ")
-                if entry_time >= cutoff_time:
-                    result.append(entry)
-        return result
+        return self.store.query(app_name, days)
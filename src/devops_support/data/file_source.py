@@ -0,0 +1,292 @@
+import ast
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+
+from devops_support.data.columnar import Schema, parse_timestamp, to_epoch_ms
+from devops_support.data.log_store import LogStore
+
+# Characters read from a dump per I/O call; memory stays around one chunk plus one record.
+FILE_CHUNK_SIZE = int(os.getenv("FILE_CHUNK_SIZE", str(1 << 20)))
+
+# Tokens of the record scanner: a complete quoted string (JSON or Python literal), a brace, or an
+# opening quote whose string is not complete in the buffer yet.
+_SCAN_TOKEN = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[{}]|['"]""", re.S)
+
+
+def open_dump(path: str) -> TextIO:
+    """Open an exported dump as text, transparently decompressing gzip (detected by its magic bytes)."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_record_texts(stream: TextIO, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the source text of every top-level {...} record of a stream, one at a time.
+
+    JSON Lines (first line is one complete record) are read line by line. Anything else (a JSON
+    array, a Python-literal list, multi-line records) goes through a scanner that skips
+    separators, brackets and newlines between records and ignores braces inside quoted strings.
+    """
+    # Bounded: a single-line dump (e.g. a repr'd list) must not be read whole
+    first = stream.readline(chunk_size)
+    stripped = first.strip()
+    if (first.endswith("\n") or len(first) < chunk_size) and stripped.startswith("{") and stripped.endswith("}"):
+        yield stripped
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+        return
+    yield from _scan_records(first, stream, chunk_size)
+
+
+def _scan_records(buffer: str, stream: TextIO, chunk_size: int) -> Iterator[str]:
+    pos = 0
+    depth = 0
+    start = 0
+    chunk = buffer
+    buffer = ""
+    while True:
+        if not chunk:
+            return
+        if depth:
+            # Keep only the record being read
+            buffer, pos, start = buffer[start:] + chunk, pos - start, 0
+        else:
+            buffer, pos = buffer[pos:] + chunk, 0
+        while True:
+            match = _SCAN_TOKEN.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            token = match.group()
+            if token in ("'", '"'):
+                # String cut by the end of the buffer: read more first
+                pos = match.start()
+                break
+            pos = match.end()
+            if token == "{":
+                if depth == 0:
+                    start = match.start()
+                depth += 1
+            elif token == "}" and depth:
+                depth -= 1
+                if depth == 0:
+                    yield buffer[start:pos]
+        chunk = stream.read(chunk_size)
+
+
+class RecordParser:
+    """
+    Parses record texts as JSON, falling back to Python literals (ast.literal_eval). After the
+    first record that only parses as a literal, literals are tried first.
+    """
+
+    def __init__(self):
+        self.literal = False
+
+    def __call__(self, text: str) -> dict[str, Any]:
+        if not self.literal:
+            try:
+                return json.loads(text)
+            except ValueError:
+                pass
+        try:
+            record = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            if not self.literal:
+                raise
+            return json.loads(text)
+        self.literal = True
+        return record
+
+
+def iter_records(path: str, contains: Optional[str] = None,
+                 chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """
+    Stream the records of an exported dump (JSON Lines, JSON array or Python-literal list, plain
+    or gzip) with bounded memory.
+
+    :param contains: Only parse records whose raw text contains this string (cheap pre-filter).
+    """
+    parse = RecordParser()
+    with open_dump(path) as stream:
+        for text in iter_record_texts(stream, chunk_size):
+            if contains is not None and contains not in text:
+                continue
+            yield parse(text)
+
+
+def entry_app(entry: dict[str, Any]) -> Optional[str]:
+    """Application of a Splunk (`application` field) or Datadog (`app:` tag) entry."""
+    if "application" in entry:
+        return entry["application"]
+    for tag in entry.get("tags", ()):
+        if tag.startswith("app:"):
+            return tag[4:]
+    return entry.get("app")
+
+
+def entry_app_id(entry: dict[str, Any]) -> Optional[str]:
+    """Application id of a Datadog entry (its `app_id:` tag), None for entries without one."""
+    for tag in entry.get("tags", ()):
+        if tag.startswith("app_id:"):
+            return tag[7:]
+    return entry.get("app_id")
+
+
+class FileLogSource:
+    """
+    Data source over an exported Splunk/Datadog dump, behind the same `get_logs(app_name, days)`
+    interface as SplunkApi / DatadogApi.
+
+    Every query streams the file, parsing only the records that mention the application and keeping
+    only those inside the window, so multi-GB dumps are never loaded whole. Without `now` the window
+    ends at the application's newest entry, which takes a first pass over the file to find. For
+    many queries against the same dump, `store` loads it once into a columnar LogStore instead.
+    """
+
+    def __init__(self, path: str, now: Optional[datetime] = None, chunk_size: int = FILE_CHUNK_SIZE):
+        """
+        :param path: Dump file (.json, .jsonl, optionally .gz).
+        :param now: End of the `days` windows. Defaults to the newest entry of the application
+                    in the dump, so post-mortems on old exports look at the incident period.
+        """
+        self.path = path
+        self.now = now
+        self.chunk_size = chunk_size
+        # id(schema) -> (version of the dump it was loaded from, LogStore), see store()
+        self._stores: dict[int, tuple[str, LogStore]] = {}
+        self._stores_lock = threading.Lock()
+
+    def version(self) -> str:
+        """Changes when the dump is rewritten (size / modification time) or `now` is moved."""
+        stat = os.stat(self.path)
+        return f"{self.path}:{stat.st_size}:{stat.st_mtime_ns}:{self.now.isoformat() if self.now else ''}"
+
+    def iter_logs(self, app_name: str) -> Iterator[dict[str, Any]]:
+        """Stream every entry of `app_name`, in file order."""
+        for record in iter_records(self.path, contains=app_name, chunk_size=self.chunk_size):
+            if entry_app(record) == app_name:
+                yield record
+
+    def get_logs(self, app_name: str, days: int) -> list[dict[str, Any]]:
+        """Entries of `app_name` from the last `days` days (relative to `now`), oldest first."""
+        if days < 1:
+            return []
+        return self._windows(lambda: self.iter_logs(app_name), entry_app, days).get(app_name, [])
+
+    def get_logs_by_app_id(self, app_id: str, days: int) -> list[dict[str, Any]]:
+        """Same as `get_logs` but looks the application up by its id (Datadog `app_id:` tag)."""
+        if days < 1:
+            return []
+
+        def records():
+            return iter_records(self.path, contains=app_id, chunk_size=self.chunk_size)
+
+        return self._windows(records, lambda record: app_id if entry_app_id(record) == app_id else None,
+                             days).get(app_id, [])
+
+    def get_logs_many(self, app_names: Optional[list[str]], days: int) -> dict[str, list[dict[str, Any]]]:
+        """
+        Entries of several applications (None: every application in the dump), streaming the file
+        once (twice without `now`); each application's window ends at its own newest entry unless
+        `now` is set.
+        """
+        wanted = set(app_names) if app_names is not None else None
+        by_app: dict[str, list[dict[str, Any]]] = {name: [] for name in app_names or ()}
+        if days < 1:
+            return by_app
+
+        def app_of(record: dict[str, Any]) -> Optional[str]:
+            app = entry_app(record)
+            return app if wanted is None or app in wanted else None
+
+        by_app.update(self._windows(lambda: iter_records(self.path, chunk_size=self.chunk_size), app_of, days))
+        return by_app
+
+    def _windows(self, records: Callable[[], Iterable[dict[str, Any]]],
+                 app_of: Callable[[dict[str, Any]], Optional[str]], days: int) -> dict[str, list[dict[str, Any]]]:
+        """
+        The entries of the last `days` days of each application (`app_of(record)`, None: skipped),
+        oldest first. `records()` streams the dump; only the entries inside a window are kept.
+
+        :param records: Returns a fresh iterator over the records (called twice without `now`).
+        """
+        span_ms = int(timedelta(days=days).total_seconds() * 1000)
+        if self.now is not None:
+            now_ms = to_epoch_ms(self.now)
+            ends = None
+        else:
+            # First pass: the newest entry of each application ends its window
+            ends = {}
+            for record in records():
+                app = app_of(record)
+                if app is not None:
+                    timestamp = parse_timestamp(record["timestamp"])
+                    if app not in ends or timestamp > ends[app]:
+                        ends[app] = timestamp
+        keyed: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+        for record in records():
+            app = app_of(record)
+            if app is None:
+                continue
+            end_ms = now_ms if ends is None else ends.get(app)
+            if end_ms is None:
+                # Appended to the dump after the first pass
+                continue
+            timestamp = parse_timestamp(record["timestamp"])
+            if end_ms - span_ms <= timestamp <= end_ms:
+                keyed.setdefault(app, []).append((timestamp, record))
+        windows = {}
+        for app, items in keyed.items():
+            items.sort(key=lambda item: item[0])
+            windows[app] = [entry for _, entry in items]
+        return windows
+
+    def store(self, schema: Schema) -> LogStore:
+        """
+        The dump loaded into a LogStore with `schema` (see to_store), shared by every caller of this
+        source and loaded once per schema; it is reloaded when the file changes.
+        """
+        with self._stores_lock:
+            version = self.version()
+            cached = self._stores.get(id(schema))
+            if cached is None or cached[0] != version:
+                cached = self._stores[id(schema)] = (version, self.to_store(schema))
+            return cached[1]
+
+    def to_store(self, schema: Schema) -> LogStore:
+        """Load the whole dump into a LogStore with `schema` (SPLUNK_SCHEMA or DATADOG_SCHEMA)."""
+        store = LogStore(schema)
+        batch = []
+        for record in iter_records(self.path, chunk_size=self.chunk_size):
+            batch.append(record)
+            if len(batch) >= 10_000:
+                store.add_many(batch)
+                batch = []
+        store.add_many(batch)
+        return store
+
+
+_file_sources: dict[str, FileLogSource] = {}
+_file_sources_lock = threading.Lock()
+
+
+def get_file_source(path: Optional[str]) -> Optional[FileLogSource]:
+    """Shared FileLogSource of `path` (e.g. from SPLUNK_LOG_FILE / DATADOG_LOG_FILE), None without a path."""
+    if not path:
+        return None
+    with _file_sources_lock:
+        source = _file_sources.get(path)
+        if source is None:
+            source = _file_sources[path] = FileLogSource(path)
+        return source
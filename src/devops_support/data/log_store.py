@@ -0,0 +1,295 @@
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from devops_support.data.columnar import RecordBatch, Schema, parse_timestamp, to_epoch_ms
+
+
+def to_watermark(since: Union[datetime, int, str, None]) -> Optional[int]:
+    """Epoch ms of a `since` watermark given as a datetime, epoch ms or timestamp string."""
+    if since is None or isinstance(since, int):
+        return since
+    if isinstance(since, datetime):
+        return to_epoch_ms(since)
+    return parse_timestamp(since)
+
+
+class _TimeIndex:
+    """Row numbers of one application kept in timestamp order next to a parallel array of epoch ms."""
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.rows = array("q")
+        # Rows in arrival order (= increasing row number), for cursor reads
+        self.appended = array("q")
+        self._sorted = True
+
+    def add(self, ts: int, row: int):
+        if self.timestamps and ts < self.timestamps[-1]:
+            self._sorted = False
+        self.timestamps.append(ts)
+        self.rows.append(row)
+        self.appended.append(row)
+
+    def ensure_sorted(self):
+        if self._sorted:
+            return
+        order = sorted(range(len(self.timestamps)), key=self.timestamps.__getitem__)
+        self.timestamps = array("q", (self.timestamps[i] for i in order))
+        self.rows = array("q", (self.rows[i] for i in order))
+        self._sorted = True
+
+    def span(self, start_ms: int, end_ms: Optional[int] = None) -> tuple[int, int]:
+        """Positions [start, end) in timestamp order of the rows with start_ms <= timestamp (<= end_ms)."""
+        self.ensure_sorted()
+        start = bisect_left(self.timestamps, start_ms)
+        end = len(self.timestamps) if end_ms is None else bisect_right(self.timestamps, end_ms)
+        return start, end
+
+    def between(self, start_ms: int, end_ms: Optional[int] = None) -> array:
+        """Rows with start_ms <= timestamp (<= end_ms when given), oldest first."""
+        start, end = self.span(start_ms, end_ms)
+        return self.rows[start:end]
+
+    def after(self, row: int) -> array:
+        """Rows appended at or after store row `row`, in arrival order."""
+        return self.appended[bisect_left(self.appended, row):]
+
+
+class LogStore:
+    """
+    In-memory log/event store indexed by application name and application id.
+
+    Records live in a columnar RecordBatch. Each application keeps its row numbers sorted by epoch
+    milliseconds, so a `(app_name, days)` lookup is a bisect over a pre-sorted slice instead of a
+    parse-and-scan over every entry. Dict views are only built for the rows a query returns.
+    """
+
+    def __init__(self, schema: Schema, batch: RecordBatch = None):
+        """
+        :param schema: Schema of the records held by the store.
+        :param batch: Existing batch to index (e.g. one produced by a generator).
+        """
+        self.batch = batch if batch is not None else RecordBatch(schema)
+        self.schema = self.batch.schema
+        self._by_app: dict[str, _TimeIndex] = {}
+        self._by_app_id: dict[str, _TimeIndex] = {}
+        self._lock = threading.RLock()
+        # Wakes up followers (see LogTail) when entries are added
+        self._appended = threading.Condition(self._lock)
+        # Identifies this store in cursor tokens: a token from another store (e.g. a dataset
+        # regenerated by a restart) is not applied to this one
+        self.store_id = uuid.uuid4().hex[:12]
+        for row in range(len(self.batch)):
+            self._index_row(row)
+
+    @classmethod
+    def from_batch(cls, batch: RecordBatch) -> "LogStore":
+        return cls(batch.schema, batch)
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def add(self, entry: dict[str, Any]):
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[dict[str, Any]]):
+        with self._lock:
+            for entry in entries:
+                self._index_row(self.batch.append_entry(entry))
+            self._appended.notify_all()
+
+    def _index_row(self, row: int):
+        ts = self.batch.timestamps[row]
+        app_name = self.batch.columns[self.schema.app_field].get(row)
+        if app_name is not None:
+            self._by_app.setdefault(app_name, _TimeIndex()).add(ts, row)
+        if self.schema.app_id_field:
+            app_id = self.batch.columns[self.schema.app_id_field].get(row)
+            if app_id is not None:
+                self._by_app_id.setdefault(app_id, _TimeIndex()).add(ts, row)
+
+    def apps(self) -> list[str]:
+        with self._lock:
+            return list(self._by_app)
+
+    def query(self, app_name: str, days: int, now: Optional[datetime] = None) -> list[dict[str, Any]]:
+        """
+        Return the entries of `app_name` from the last `days` days, oldest first.
+
+        :param app_name: The name of the application to filter by.
+        :param days: Number of days to look back from `now` (current UTC time by default).
+        """
+        return self.query_between(app_name, self._cutoff_ms(days, now))
+
+    def query_app_id(self, app_id: str, days: int, now: Optional[datetime] = None) -> list[dict[str, Any]]:
+        """Same as `query` but looks the application up by its id."""
+        return self._take(self._by_app_id, str(app_id), self._cutoff_ms(days, now), None)
+
+    def query_between(self, app_name: str, start_ms: int, end_ms: Optional[int] = None) -> list[dict[str, Any]]:
+        """Return the entries of `app_name` with start_ms <= timestamp (<= end_ms when given)."""
+        return self._take(self._by_app, str(app_name), start_ms, end_ms)
+
+    def query_many(self, app_names: Optional[Iterable[str]], start_ms: int,
+                   end_ms: Optional[int] = None) -> dict[str, list[dict[str, Any]]]:
+        """
+        Bulk variant of `query_between`: the entries of several applications in one pass under one
+        lock, so a fleet-wide report sees a consistent snapshot of the store.
+
+        :param app_names: Applications to read (None: every application in the store).
+        :return: {app_name: entries oldest first}; unknown applications map to [].
+        """
+        with self._lock:
+            names = list(self._by_app) if app_names is None else [str(name) for name in app_names]
+            return {name: self._take(self._by_app, name, start_ms, end_ms) for name in names}
+
+    def query_version(self, app_name: str, days: int, now: Optional[datetime] = None) -> str:
+        """Version of what `query(app_name, days, now)` returns (see window_version)."""
+        return self.window_version(app_name, self._cutoff_ms(days, now))
+
+    def window_version(self, app_name: str, start_ms: int, end_ms: Optional[int] = None) -> str:
+        """
+        Cheap version of what `query_between(app_name, start_ms, end_ms)` returns, e.g. for a
+        response cache key: the store cursor plus the window's slice of the application's time
+        index. It changes when entries are added or enter/leave the window, without reading them.
+        """
+        with self._lock:
+            index = self._by_app.get(str(app_name))
+            start, end = index.span(start_ms, end_ms) if index is not None else (0, 0)
+            return f"{self.store_id}:{len(self.batch)}:{start}-{end}"
+
+    @staticmethod
+    def _cutoff_ms(days: int, now: Optional[datetime]) -> int:
+        now = now or datetime.now(timezone.utc)
+        return to_epoch_ms(now - timedelta(days=days))
+
+    def cursor(self) -> str:
+        """Resume token pointing after every entry currently in the store."""
+        with self._lock:
+            return f"{self.store_id}:{len(self.batch)}"
+
+    def _cursor_row(self, cursor: Optional[str]) -> Optional[int]:
+        if not cursor:
+            return None
+        store_id, _, row = cursor.rpartition(":")
+        if store_id != self.store_id or not row.isdigit():
+            return None
+        return int(row)
+
+    def read_since(self, app_name: str, cursor: Optional[str] = None,
+                   since: Union[datetime, int, str, None] = None, by_app_id: bool = False
+                   ) -> tuple[list[dict[str, Any]], str]:
+        """
+        Incremental read: the entries of an application that are new since the last read.
+
+        :param app_name: The name (or id, with by_app_id) of the application.
+        :param cursor: Resume token returned by the previous read. Entries added after it are
+                       returned, late ones with older timestamps included. A token issued by
+                       another store is ignored.
+        :param since: Watermark (datetime, epoch ms or timestamp string): only entries with a
+                      later timestamp are returned. Used alone for the first read.
+        :return: (new entries oldest first, resume token for the next read).
+        """
+        with self._lock:
+            rows, token = self._rows_since(app_name, cursor, since, by_app_id)
+            if self._cursor_row(cursor) is not None:
+                # Arrival order is not time order for late entries
+                rows = sorted(rows, key=self.batch.timestamps.__getitem__)
+            return self.batch.take(rows), token
+
+    def tail_since(self, app_name: str, cursor: Optional[str] = None,
+                   since: Union[datetime, int, str, None] = None, by_app_id: bool = False
+                   ) -> tuple[list[tuple[dict[str, Any], str]], str]:
+        """
+        Like read_since, but in arrival order with each entry paired with the resume token pointing
+        just after it, so a reader that stops mid-batch resumes without replaying anything.
+
+        :return: ([(entry, token after it)], resume token after the whole batch).
+        """
+        with self._lock:
+            rows, token = self._rows_since(app_name, cursor, since, by_app_id)
+            rows = sorted(rows)
+            return ([(entry, f"{self.store_id}:{row + 1}") for entry, row in zip(self.batch.take(rows), rows)],
+                    token)
+
+    def _rows_since(self, app_name: str, cursor: Optional[str], since: Union[datetime, int, str, None],
+                    by_app_id: bool) -> tuple[list[int], str]:
+        """Rows new since `cursor` / `since` (called with the lock held) and the token after them all."""
+        since_ms = to_watermark(since)
+        index = (self._by_app_id if by_app_id else self._by_app).get(str(app_name))
+        token = f"{self.store_id}:{len(self.batch)}"
+        if index is None:
+            return [], token
+        row = self._cursor_row(cursor)
+        if row is None:
+            return list(index.between(since_ms + 1 if since_ms is not None else -(1 << 62))), token
+        rows = index.after(row)
+        if since_ms is not None:
+            timestamps = self.batch.timestamps
+            return [r for r in rows if timestamps[r] > since_ms], token
+        return list(rows), token
+
+    def follow(self, app_name: str, cursor: Optional[str] = None, since: Union[datetime, int, str, None] = None,
+               by_app_id: bool = False, poll_interval: float = 1.0, idle_timeout: Optional[float] = None,
+               stop: Optional[threading.Event] = None) -> "LogTail":
+        """Follow mode: a LogTail yielding the application's entries as they arrive."""
+        return LogTail(self, app_name, cursor=cursor, since=since, by_app_id=by_app_id,
+                       poll_interval=poll_interval, idle_timeout=idle_timeout, stop=stop)
+
+    def wait_for_entries(self, cursor: str, timeout: float) -> bool:
+        """Block until entries are added after `cursor` (or `timeout` seconds). True if there are."""
+        with self._appended:
+            row = self._cursor_row(cursor)
+            return self._appended.wait_for(lambda: row is None or len(self.batch) > row, timeout)
+
+    def _take(self, indexes: dict[str, _TimeIndex], key: str, start_ms: int, end_ms: Optional[int]):
+        with self._lock:
+            index = indexes.get(key)
+            if index is None:
+                return []
+            return self.batch.take(index.between(start_ms, end_ms))
+
+
+class LogTail:
+    """
+    Generator-based follow mode over a LogStore (`tail -f`).
+
+    Iterating yields only the entries that are new since `cursor` / `since` (all of them on the
+    first read) in arrival order, then blocks for new ones, waking up as soon as entries are added
+    (or every `poll_interval` seconds to check `stop`). It ends when `stop` is set or after
+    `idle_timeout` seconds without new entries. `cursor` advances with every yielded entry, so a
+    later tail (or read_since) continues exactly where this one stopped, even mid-batch.
+    """
+
+    def __init__(self, store: LogStore, app_name: str, cursor: Optional[str] = None,
+                 since: Union[datetime, int, str, None] = None, by_app_id: bool = False, poll_interval: float = 1.0,
+                 idle_timeout: Optional[float] = None, stop: Optional[threading.Event] = None):
+        self.store = store
+        self.app_name = app_name
+        self.cursor = cursor
+        self.since = since
+        self.by_app_id = by_app_id
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.stop = stop or threading.Event()
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        last_new = time.monotonic()
+        while not self.stop.is_set():
+            entries, cursor = self.store.tail_since(self.app_name, self.cursor, self.since, self.by_app_id)
+            for entry, token in entries:
+                self.cursor = token
+                yield entry
+            self.cursor = cursor
+            if entries:
+                last_new = time.monotonic()
+            elif self.idle_timeout is not None and time.monotonic() - last_new >= self.idle_timeout:
+                return
+            wait = self.poll_interval
+            if self.idle_timeout is not None:
+                wait = min(wait, max(0.0, self.idle_timeout - (time.monotonic() - last_new)))
+            self.store.wait_for_entries(self.cursor, wait)
@@ -0,0 +1,18 @@
+import os
+import random
+
+
+def _env_seed() -> int:
+    value = os.getenv("MOCK_DATA_SEED")
+    if not value:
+        return random.randrange(2 ** 32)
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"MOCK_DATA_SEED must be an integer, got '{value}'") from None
+
+
+# Seed of the generated mock datasets (Splunk and Datadog). Unset: random, but fixed for the
+# process and handed to the crew pool's workers (see crew_pool), so that every process serves the
+# same datasets. Read it as `seed.MOCK_DATA_SEED`, at generation time.
+MOCK_DATA_SEED = _env_seed()
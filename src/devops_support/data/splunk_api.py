@@ -1,14 +1,128 @@
+import os
 import random
+import threading
 from datetime import datetime, date, time, timedelta
 
+from devops_support.data import seed as data_seed
+from devops_support.data.columnar import RecordBatch, Schema, to_epoch_ms
+from devops_support.data.file_source import FileLogSource, get_file_source
+from devops_support.data.log_store import LogStore, LogTail
+
+# Columnar layout of Splunk log entries (see devops_support.data.columnar).
+SPLUNK_SCHEMA = Schema(
+    fields=["timestamp", "level", "application", "host", "message"],
+    categories=["level", "application", "host"],
+    strings=["message"],
+    timestamp_precision="s",
+    app_field="application",
+)
+
+# Exported Splunk dump (JSON Lines / JSON / Python-literal, optionally gzip) served by get_logs
+# instead of the generated mock data, e.g. for post-mortems on real data.
+SPLUNK_LOG_FILE = os.getenv("SPLUNK_LOG_FILE")
+
+# Process-wide store shared by every SplunkApi instance, built on first use.
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_store() -> LogStore:
+    """Return the shared Splunk log store, generating the mock dataset only once per process."""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = MockSplunkLogGenerator(seed=data_seed.MOCK_DATA_SEED).store
+    return _shared_store
+
+
 class SplunkApi:
+    def __init__(self, store: LogStore = None, source: FileLogSource = None):
+        """
+        :param store: Log store to read from. Defaults to the process-wide shared store.
+        :param source: Exported dump answering the queries instead of the generated data.
+                       Defaults to SPLUNK_LOG_FILE when it is set.
+        """
+        self.store = store
+        self.source = source if source is not None else get_file_source(SPLUNK_LOG_FILE)
+
+    def _get_store(self) -> LogStore:
+        if self.store is not None:
+            return self.store
+        # Incremental reads over a dump need its entries in a store, loaded once by the shared source
+        return self.source.store(SPLUNK_SCHEMA) if self.source is not None else get_shared_store()
+
     def get_logs(self, app_name: str, days: int) -> list[dict[str, any]]:
         """
-        Mock method to simulate fetching logs from Datadog API.
+        Mock method to simulate fetching logs from Splunk API.
         Returns a list of log entries as dictionaries.
         """
-        mock_logs = MockSplunkLogGenerator()
-        return mock_logs.get_logs_for_app(app_name, days)
+        if self.source is not None:
+            return self.source.get_logs(app_name, days)
+        return get_logs_for_days(self._get_store(), app_name, days)
+
+    def logs_version(self, app_name: str, days: int) -> str:
+        """
+        Cheap version of what `get_logs(app_name, days)` returns (response cache key): the data's
+        identity and size plus the window, without fetching or hashing the entries.
+        """
+        if self.source is not None:
+            return f"{self.source.version()}:{app_name}:{days}"
+        if days < 1:
+            return "empty"
+        return f"{self._get_store().window_version(app_name, *days_window(days))}:{app_name}"
+
+    def get_logs_many(self, app_names: list[str] = None, days: int = 1) -> dict[str, list[dict[str, any]]]:
+        """
+        Bulk fetch: the Splunk logs of several applications (None: all of them) in one pass.
+        Returns {app_name: log entries oldest first}.
+        """
+        if self.source is not None:
+            return self.source.get_logs_many(app_names, days)
+        if days < 1:
+            return {name: [] for name in app_names or ()}
+        return self._get_store().query_many(app_names, *days_window(days))
+
+    def get_logs_since(self, app_name: str, since=None, cursor: str = None) -> tuple[list[dict[str, any]], str]:
+        """
+        Incremental fetch: only the Splunk entries of `app_name` that are new since the previous call.
+
+        :param since: Watermark (datetime, epoch ms or timestamp string) for the first call.
+        :param cursor: Resume token returned by the previous call.
+        :return: (new entries oldest first, resume token for the next call).
+        """
+        return self._get_store().read_since(app_name, cursor=cursor, since=since)
+
+    def follow(self, app_name: str, since=None, cursor: str = None, **options) -> LogTail:
+        """
+        Follow mode: iterate over the Splunk entries of `app_name` as they arrive (see LogTail for
+        the poll_interval / idle_timeout / stop options). The tail's `cursor` resumes it later.
+        """
+        return self._get_store().follow(app_name, cursor=cursor, since=since, **options)
+
+
+def get_logs_for_days(store: LogStore, app_name: str, days: int) -> list[dict[str, any]]:
+    """
+    Retrieve the entries of `app_name` whose date falls within the last `days` calendar days
+    (today included), capped to the 30 days the mock generator covers.
+    """
+    # Ensure the 'days' parameter is within valid range (1 to 30 days)
+    if days < 1:
+        return []
+    return store.query_between(app_name, *days_window(days))
+
+
+def days_window(days: int) -> tuple[int, int]:
+    """(start, end) epoch ms of the last `days` calendar days, today included, capped to 30 days."""
+    if days > 30:
+        days = 30
+
+    # Calculate date range for filtering: from (today - days + 1) to the end of today
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days-1)
+    start_ms = to_epoch_ms(datetime.combine(start_date, time()))
+    end_ms = to_epoch_ms(datetime.combine(end_date + timedelta(days=1), time())) - 1
+    return start_ms, end_ms
 
 class MockSplunkLogGenerator:
     """
@@ -16,7 +130,11 @@ class MockSplunkLogGenerator:
     Logs are stored in a list of dictionaries, each containing a timestamp, log level, application name, host name, and message.
     The class can return logs for a specified application and a given number of recent days.
     """
-    def __init__(self):
+    def __init__(self, seed: int = None):
+        """
+        :param seed: Seed of the generator's random source, for reproducible datasets.
+        """
+        self.rng = random.Random(seed)
         # Define the applications and hosts for which to generate logs
         self.applications = ['AuthService', 'PaymentService', 'InventoryService', 'UserService']
         self.hosts = ['host1', 'host2']
@@ -94,15 +212,21 @@ class MockSplunkLogGenerator:
         }
         
         # Generate the logs dataset for the last 30 days (with logs present on 20 random days)
-        self.logs = self._generate_logs()
+        self.batch = self._generate_logs()
+        self.store = LogStore.from_batch(self.batch)
+
+    @property
+    def logs(self) -> list[dict]:
+        """All log entries as dicts (built on demand from the columnar batch)."""
+        return self.batch.to_dicts()
     
     def _generate_logs(self):
         """
         Internal method to generate mock log entries for all applications and hosts over a 30-day period.
         Returns:
-            List[dict]: A list of log entries (each entry is a dictionary).
+            RecordBatch: The log entries in columnar form.
         """
-        logs_list = []  # List to accumulate log entries
+        logs_batch = RecordBatch(SPLUNK_SCHEMA)  # Batch to accumulate log entries
         
         # Determine the date range: from 29 days ago up to today (30 days total)
         end_date = date.today()
@@ -111,7 +235,7 @@ class MockSplunkLogGenerator:
         # Create a list of all dates in the range
         all_dates = [(start_date + timedelta(days=i)) for i in range(30)]
         # Randomly select 20 dates out of the 30 to have logs (10 days will have no logs)
-        log_dates = sorted(random.sample(all_dates, 20))
+        log_dates = sorted(self.rng.sample(all_dates, 20))
         
         # Use random generation for times and log levels, so each run yields different log entries
         for log_date in log_dates:
@@ -120,31 +244,31 @@ class MockSplunkLogGenerator:
                 # Generate 10 random timestamps for this date (ensuring chronological order within the day)
                 times = []
                 for _ in range(10):
-                    hour = random.randint(0, 23)
-                    minute = random.randint(0, 59)
-                    second = random.randint(0, 59)
+                    hour = self.rng.randint(0, 23)
+                    minute = self.rng.randint(0, 59)
+                    second = self.rng.randint(0, 59)
                     dt = datetime.combine(log_date, time(hour, minute, second))  # combine date with time
                     times.append(dt)
                 times.sort()  # sort timestamps so logs are in time order
                 
                 # Determine log levels for the 10 entries (mix of error, warning, info; more infos for realism)
                 levels = ['info'] * 5 + ['warning'] * 3 + ['error'] * 2
-                random.shuffle(levels)  # shuffle the list to mix log levels in chronological sequence
+                self.rng.shuffle(levels)  # shuffle the list to mix log levels in chronological sequence
                 
                 # Create 10 log entries for this application on this date
                 for idx in range(10):
                     level = levels[idx]
-                    timestamp = times[idx].strftime("%Y-%m-%dT%H:%M:%SZ")  # Format timestamp in ISO 8601 (UTC 'Z' notation)
-                    host = random.choice(self.hosts)
+                    timestamp = to_epoch_ms(times[idx])  # Epoch milliseconds (UTC)
+                    host = self.rng.choice(self.hosts)
                     # Pick a random message template for the given application and level
-                    message_template = random.choice(self.log_messages[app][level])
+                    message_template = self.rng.choice(self.log_messages[app][level])
                     random_qty = None
                     random_id=None
                     # Populate dynamic fields in the message template if present (e.g., {id}, {qty})
                     if '{id}' in message_template:
-                        random_id = random.randint(100, 999)  # random ID (user ID, order ID, item ID, etc.)
+                        random_id = self.rng.randint(100, 999)  # random ID (user ID, order ID, item ID, etc.)
                     if '{qty}' in message_template:
-                        random_qty = random.randint(1, 100)   # random quantity for inventory messages
+                        random_qty = self.rng.randint(1, 100)   # random quantity for inventory messages
                     try:
                         # Attempt to format the message with both 'id' and 'qty' (extra keys are ignored if not needed)
                         message = message_template.format(id=random_id, qty=random_qty)
@@ -157,15 +281,14 @@ class MockSplunkLogGenerator:
                         else:
                             message = message_template
                     
-                    # Append the log entry (as a dictionary) to the list
-                    logs_list.append({
-                        "timestamp": timestamp,
+                    # Append the log entry to the batch
+                    logs_batch.append(timestamp, {
                         "level": level,
                         "application": app,
                         "host": host,
                         "message": message
                     })
-        return logs_list
+        return logs_batch
     
     def get_logs_for_app(self, app_name, days):
         """
@@ -176,30 +299,7 @@ class MockSplunkLogGenerator:
         Returns:
             List[dict]: A list of log entries for the specified application and time range.
         """
-        # Ensure the 'days' parameter is within valid range (1 to 30 days)
-        if days < 1:
-            return []
-        if days > 30:
-            days = 30
-        
-        # Calculate date range for filtering: from (today - days + 1) to today
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days-1)
-        
-        # Filter logs by application name and timestamp within the date range
-        filtered_logs = []
-        for entry in self.logs:
-            if entry['application'] == app_name:
-                #print(f"Entry application: {entry['application']}, Entry date: {entry['timestamp'][:10]}")
-                entry_date_str = entry['timestamp'][:10]
-                try:
-                    entry_date = datetime.strptime(entry_date_str, "%Y-%m-%d").date()
-                except ValueError:
-                    continue  # skip entry if timestamp format is unexpected
-                # Include log entry if its date falls within the specified range
-                if start_date <= entry_date <= end_date:
-                    filtered_logs.append(entry)
-        return filtered_logs
+        return get_logs_for_days(self.store, app_name, days)
 
 # Example usage:
 # generator = MockSplunkLogGenerator()
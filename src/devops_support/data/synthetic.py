@@ -0,0 +1,446 @@
+import argparse
+import gzip
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from devops_support.data.columnar import RecordBatch, to_epoch_ms
+from devops_support.data.datadog_api import DATADOG_SCHEMA
+from devops_support.data.log_store import LogStore
+from devops_support.data.splunk_api import SPLUNK_SCHEMA
+
+LEVELS = np.array(["INFO", "WARNING", "ERROR"])
+INFO, WARNING, ERROR = 0, 1, 2
+
+POD_STATUSES = np.array(["Running", "Pending", "Succeeded", "CrashLoopBackOff", "Error", "Failed"])
+POD_STATUSES_LIST = POD_STATUSES.tolist()
+CRASH_LOOP = 3
+
+# Log message templates: (level, template). Placeholders are filled from the row's metric columns.
+LOG_TEMPLATES = [
+    (INFO, "Successfully connected to database"),
+    (INFO, "User login successful"),
+    (INFO, "Background job executed"),
+    (INFO, "Cache cleared"),
+    (INFO, "Configuration reloaded"),
+    (INFO, "Processed request to /api/endpoint"),
+    (WARNING, "High memory usage detected"),
+    (WARNING, "Disk space running low"),
+    (WARNING, "Response latency above threshold"),
+    (WARNING, "Failed login attempt detected"),
+    (ERROR, "Database connection lost"),
+    (ERROR, "Unhandled exception occurred"),
+    (ERROR, "Failed to process user request"),
+    (ERROR, "Timeout while calling external API"),
+    # Metric-carrying templates, filled from the cpu / memory / pod / status columns
+    (INFO, "Node metrics - CPU usage: {cpu}%, Memory usage: {mem}MB"),
+    (WARNING, "High CPU usage: {cpu}% on host {host}"),
+    (WARNING, "Pod {pod} is in {status} state (not Running)"),
+    (ERROR, "Pod {pod} status is {status} (crashed)"),
+]
+_PLAIN_BY_LEVEL = [np.array([i for i, (lvl, t) in enumerate(LOG_TEMPLATES) if lvl == level and "{" not in t])
+                   for level in (INFO, WARNING, ERROR)]
+NODE_METRICS, HIGH_CPU, POD_NOT_RUNNING, POD_CRASHED = 14, 15, 16, 17
+DB_CONNECTION_LOST = 10
+
+# Event templates: (title, text, alert_type, priority)
+EVENT_TEMPLATES = [
+    ("Deployment started", "Deploying new version of {app} to production.", "info", "normal"),
+    ("Deployment succeeded", "{app} deployed successfully to production.", "success", "normal"),
+    ("Deployment failed", "{app} deployment failed during rollout.", "error", "normal"),
+    ("High CPU Usage Alert", "CPU usage for {app} exceeded 90% on {host}.", "warning", "normal"),
+    ("Error Rate Spike", "Error rate for {app} above 5% in the last 5 minutes.", "error", "normal"),
+    ("Auto-scaling", "{app} scaled up due to load.", "info", "normal"),
+    ("Database Outage", "{app} lost connection to database cluster.", "error", "normal"),
+    ("Service Restored", "{app} service restored after outage.", "success", "normal"),
+]
+_EVENT_INDEX = {title: i for i, (title, _, _, _) in enumerate(EVENT_TEMPLATES)}
+# Events drawn outside incidents (no failures)
+_BACKGROUND_EVENTS = np.array([_EVENT_INDEX[t] for t in ("Deployment started", "Deployment succeeded",
+                                                          "Auto-scaling", "Service Restored")])
+
+MINUTE_MS = 60 * 1000
+DAY_MS = 24 * 60 * MINUTE_MS
+
+
+class Incident(ABC):
+    """
+    Base class of the incident shapes injected into the synthetic data.
+
+    An incident adds its own records for one application on top of the background traffic:
+    `per_minute` records on average over its time window, shaped by `_shape`.
+
+    :param app: Index of the affected application.
+    :param hours_ago: Start of the incident, in hours before the generator's `now`.
+    :param minutes: Duration of the incident.
+    :param per_minute: Average number of records the incident adds per minute.
+    """
+
+    def __init__(self, app: int, hours_ago: float, minutes: float = 30, per_minute: float = 20):
+        self.app = app
+        self.hours_ago = hours_ago
+        self.minutes = minutes
+        self.per_minute = per_minute
+
+    def window(self, now_ms: int) -> tuple[int, int]:
+        start = now_ms - int(self.hours_ago * 60 * MINUTE_MS)
+        return start, start + int(self.minutes * MINUTE_MS)
+
+    def records(self, generator: "SyntheticDataGenerator", rng: np.random.Generator,
+                lo: int, hi: int) -> Optional["SyntheticChunk"]:
+        """Records of the incident falling into [lo, hi), or None."""
+        start, end = self.window(generator.now_ms)
+        first, last = max(start, lo), min(end, hi)
+        if first >= last:
+            return None
+        n = rng.poisson(self.per_minute * (last - first) / MINUTE_MS)
+        if n == 0:
+            return None
+        ts = rng.integers(first, last, n, dtype=np.int64)
+        chunk = SyntheticChunk(generator, ts, np.full(n, self.app, dtype=np.int32),
+                               rng.integers(0, generator.hosts_per_app, n, dtype=np.int32))
+        # Position of each record within the incident window (0..1), used by ramp shapes
+        self._shape(chunk, (ts - start) / max(end - start, 1), rng)
+        return chunk
+
+    @abstractmethod
+    def _shape(self, chunk: "SyntheticChunk", progress: np.ndarray, rng: np.random.Generator):
+        """Set the levels, messages and metrics of the incident's records in `chunk`."""
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(app={self.app}, hours_ago={self.hours_ago:.2f}, "
+                f"minutes={self.minutes:.1f}, per_minute={self.per_minute})")
+
+
+class ErrorBurst(Incident):
+    """Burst of database errors, with a few "Database Outage" events."""
+
+    def _shape(self, chunk, progress, rng):
+        chunk.level[:] = ERROR
+        chunk.template[:] = DB_CONNECTION_LOST
+        events = rng.random(len(chunk)) < 0.05
+        chunk.kind[events] = 1
+        chunk.template[events] = _EVENT_INDEX["Database Outage"]
+
+
+class CpuRamp(Incident):
+    """Node metrics with CPU climbing linearly to `peak` percent over the window, memory following."""
+
+    def __init__(self, app: int, hours_ago: float, minutes: float = 60, per_minute: float = 5, peak: int = 99):
+        super().__init__(app, hours_ago, minutes, per_minute)
+        self.peak = peak
+
+    def _shape(self, chunk, progress, rng):
+        n = len(chunk)
+        chunk.cpu[:] = np.clip(30 + (self.peak - 30) * progress + rng.normal(0, 3, n), 0, 100)
+        chunk.memory[:] = 4000 + 10000 * progress + rng.normal(0, 300, n)
+        hot = chunk.cpu >= 90
+        chunk.level[:] = np.where(hot, WARNING, INFO)
+        chunk.template[:] = np.where(hot, HIGH_CPU, NODE_METRICS)
+        events = hot & (rng.random(n) < 0.05)
+        chunk.kind[events] = 1
+        chunk.template[events] = _EVENT_INDEX["High CPU Usage Alert"]
+
+
+class CrashLoopStorm(Incident):
+    """Pods of the app restarting in CrashLoopBackOff, with "Deployment failed" events."""
+
+    def __init__(self, app: int, hours_ago: float, minutes: float = 20, per_minute: float = 30, pods: int = 20):
+        super().__init__(app, hours_ago, minutes, per_minute)
+        self.pods = pods
+
+    def _shape(self, chunk, progress, rng):
+        n = len(chunk)
+        crashed = rng.random(n) < 0.5
+        chunk.level[:] = np.where(crashed, ERROR, WARNING)
+        chunk.template[:] = np.where(crashed, POD_CRASHED, POD_NOT_RUNNING)
+        chunk.pod[:] = rng.integers(0, self.pods, n)
+        chunk.status[:] = CRASH_LOOP
+        events = rng.random(n) < 0.05
+        chunk.kind[events] = 1
+        chunk.template[events] = _EVENT_INDEX["Deployment failed"]
+
+
+INCIDENT_SHAPES = {"error_burst": ErrorBurst, "cpu_ramp": CpuRamp, "crashloop": CrashLoopStorm}
+
+
+class SyntheticChunk:
+    """
+    One time slice of synthetic records, as parallel numpy columns.
+
+    kind: 0 log / 1 event; level: index into LEVELS; template: index into LOG_TEMPLATES (logs) or
+    EVENT_TEMPLATES (events); cpu / memory / pod / status: -1 when the row carries no such value.
+    Rows start as plain INFO logs without metrics.
+    """
+
+    COLUMNS = ("ts", "app", "host", "level", "template", "kind", "cpu", "memory", "pod", "status")
+
+    def __init__(self, generator: "SyntheticDataGenerator", ts: np.ndarray, app: np.ndarray, host: np.ndarray):
+        self.generator = generator
+        self.ts = ts
+        self.app = app
+        self.host = host
+        n = len(ts)
+        self.level = np.zeros(n, dtype=np.int8)
+        self.template = np.zeros(n, dtype=np.int16)
+        self.kind = np.zeros(n, dtype=np.int8)
+        self.cpu = np.full(n, -1, dtype=np.int16)
+        self.memory = np.full(n, -1, dtype=np.int32)
+        self.pod = np.full(n, -1, dtype=np.int32)
+        self.status = np.full(n, -1, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def concat(cls, parts: list["SyntheticChunk"]) -> "SyntheticChunk":
+        """Concatenate chunks into one, in timestamp order."""
+        if len(parts) == 1:
+            merged = parts[0]
+        else:
+            merged = cls.__new__(cls)
+            merged.generator = parts[0].generator
+            for name in cls.COLUMNS:
+                setattr(merged, name, np.concatenate([getattr(part, name) for part in parts]))
+        order = np.argsort(merged.ts, kind="stable")
+        for name in cls.COLUMNS:
+            setattr(merged, name, getattr(merged, name)[order])
+        return merged
+
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    def entries(self, flavor: str = "datadog") -> Iterator[dict[str, Any]]:
+        """
+        Dict views of the rows in the shape of the mock APIs.
+
+        :param flavor: "datadog" (logs and events, app tags, metric fields) or "splunk" (logs only).
+        """
+        gen = self.generator
+        datadog = flavor == "datadog"
+        stamps = np.char.add(np.datetime_as_string(self.ts.astype("datetime64[ms]"),
+                                                   unit="ms" if datadog else "s"), "Z").tolist()
+        levels = LEVELS[self.level].tolist()
+        apps, hosts, kinds, templates = (self.app.tolist(), self.host.tolist(), self.kind.tolist(),
+                                         self.template.tolist())
+        cpus, memories, pods, statuses = (self.cpu.tolist(), self.memory.tolist(), self.pod.tolist(),
+                                          self.status.tolist())
+        for i, timestamp in enumerate(stamps):
+            app = gen.app_names[apps[i]]
+            host = gen.host_names[apps[i]][hosts[i]]
+            if kinds[i]:
+                if not datadog:
+                    continue
+                title, text, alert_type, priority = EVENT_TEMPLATES[templates[i]]
+                yield {"type": "event", "timestamp": timestamp, "title": title,
+                       "text": text.format(app=app, host=host), "host": host, "alert_type": alert_type,
+                       "priority": priority, "tags": gen.app_tags(apps[i])}
+                continue
+            template = LOG_TEMPLATES[templates[i]][1]
+            pod = f"{app}-pod-{pods[i]:04d}" if pods[i] >= 0 else None
+            status = POD_STATUSES_LIST[statuses[i]] if statuses[i] >= 0 else None
+            if "{" in template:
+                template = template.format(cpu=cpus[i], mem=memories[i], host=host, pod=pod, status=status)
+            if not datadog:
+                yield {"timestamp": timestamp, "level": levels[i], "application": app, "host": host,
+                       "message": template}
+                continue
+            entry = {"type": "log", "timestamp": timestamp, "level": levels[i], "host": host,
+                     "message": template, "tags": gen.app_tags(apps[i])}
+            if cpus[i] >= 0:
+                entry["cpu"] = cpus[i]
+            if memories[i] >= 0:
+                entry["memory"] = memories[i]
+            if status is not None:
+                entry["pod_status"] = status
+                entry["ready"] = status in ("Running", "Succeeded")
+            if pod is not None:
+                entry["pod_name"] = pod
+            yield entry
+
+
+class SyntheticDataGenerator:
+    """
+    Seeded, vectorized generator of Datadog/Splunk-shaped records at load-testing volumes.
+
+    The time window is cut into `chunk_size`-record slices generated one at a time with numpy, so
+    memory stays bounded whatever the total volume. Each chunk has its own random stream derived
+    from (seed, chunk index): the same seed and `now` always produce the same records.
+
+    Example:
+        gen = SyntheticDataGenerator(seed=7, records=5_000_000, apps=2000, random_incidents=50)
+        gen.write_jsonl("datadog.jsonl.gz")
+    """
+
+    def __init__(self, seed: int = 0, records: int = 1_000_000, apps: int = 1000, hosts_per_app: int = 4,
+                 days: int = 30, chunk_size: int = 250_000, event_ratio: float = 0.01,
+                 incidents: list[Incident] = None, random_incidents: int = 0,
+                 now: Optional[datetime] = None):
+        """
+        :param seed: Seed of every random stream.
+        :param records: Number of background records (logs and events); incidents add their own on top.
+        :param apps: Number of applications. Traffic across them follows a heavy-tailed distribution.
+        :param hosts_per_app: Number of hosts per application.
+        :param days: Length of the time window, ending at `now`.
+        :param chunk_size: Number of records generated (and held in memory) at once.
+        :param event_ratio: Fraction of background records that are Datadog events.
+        :param incidents: Incident shapes to inject (ErrorBurst, CpuRamp, CrashLoopStorm).
+        :param random_incidents: Number of additional incidents drawn from the seed.
+        :param now: End of the time window (defaults to the current time; pin it for identical output).
+        """
+        self.seed = seed
+        self.records = records
+        self.n_apps = apps
+        self.hosts_per_app = hosts_per_app
+        self.days = days
+        self.chunk_size = chunk_size
+        self.event_ratio = event_ratio
+        self.now_ms = to_epoch_ms(now or datetime.now(timezone.utc))
+        self.start_ms = self.now_ms - days * DAY_MS
+
+        width = len(str(apps - 1))
+        self.app_names = [f"service_{i:0{width}d}" for i in range(apps)]
+        self.app_ids = [f"app-{i + 1:0{max(width, 3)}d}" for i in range(apps)]
+        self.host_names = [[f"{name}-host-{h + 1}" for h in range(hosts_per_app)] for name in self.app_names]
+
+        rng = np.random.default_rng([seed, 0xA995])
+        weights = 1.0 / np.arange(1, apps + 1) ** 0.8
+        self.app_weights = rng.permutation(weights / weights.sum())
+
+        self.incidents = list(incidents or [])
+        shapes = list(INCIDENT_SHAPES.values())
+        for _ in range(random_incidents):
+            shape = shapes[rng.integers(len(shapes))]
+            self.incidents.append(shape(app=int(rng.choice(apps, p=self.app_weights)),
+                                        hours_ago=float(rng.uniform(1, days * 24)),
+                                        minutes=float(rng.uniform(10, 90))))
+
+    def app_tags(self, app: int) -> list[str]:
+        return [f"app:{self.app_names[app]}", f"app_id:{self.app_ids[app]}"]
+
+    def iter_chunks(self) -> Iterator[SyntheticChunk]:
+        """Yield the dataset as consecutive, chronologically ordered chunks."""
+        n_chunks = max(1, -(-self.records // self.chunk_size))
+        span = self.now_ms - self.start_ms
+        for index in range(n_chunks):
+            size = min(self.chunk_size, self.records - index * self.chunk_size)
+            lo = self.start_ms + span * index // n_chunks
+            hi = self.start_ms + span * (index + 1) // n_chunks
+            yield self._chunk(index, size, lo, hi)
+
+    def _chunk(self, index: int, size: int, lo: int, hi: int) -> SyntheticChunk:
+        rng = np.random.default_rng([self.seed, index])
+        chunk = SyntheticChunk(self, np.sort(rng.integers(lo, hi, size, dtype=np.int64)),
+                               rng.choice(self.n_apps, size, p=self.app_weights).astype(np.int32),
+                               rng.integers(0, self.hosts_per_app, size, dtype=np.int32))
+        chunk.level[:] = rng.choice(3, size, p=[0.6, 0.2, 0.2])
+        for level, choices in enumerate(_PLAIN_BY_LEVEL):
+            mask = chunk.level == level
+            chunk.template[mask] = choices[rng.integers(0, len(choices), mask.sum())]
+        events = rng.random(size) < self.event_ratio
+        chunk.kind[events] = 1
+        chunk.template[events] = _BACKGROUND_EVENTS[rng.integers(0, len(_BACKGROUND_EVENTS), events.sum())]
+
+        # Healthy node metrics on a share of the INFO logs
+        metrics = np.flatnonzero(~events & (chunk.level == INFO) & (rng.random(size) < 0.2))
+        chunk.template[metrics] = NODE_METRICS
+        chunk.cpu[metrics] = rng.integers(5, 70, len(metrics))
+        chunk.memory[metrics] = rng.integers(500, 8000, len(metrics))
+
+        parts = [chunk]
+        for incident in self.incidents:
+            records = incident.records(self, rng, lo, hi)
+            if records is not None:
+                parts.append(records)
+        return SyntheticChunk.concat(parts) if len(parts) > 1 else chunk
+
+    def iter_entries(self, flavor: str = "datadog") -> Iterator[dict[str, Any]]:
+        for chunk in self.iter_chunks():
+            yield from chunk.entries(flavor)
+
+    def write_jsonl(self, path: str, flavor: str = "datadog") -> int:
+        """
+        Stream the dataset to a JSON Lines file (gzip-compressed when the path ends in ".gz").
+
+        :return: Number of entries written.
+        """
+        if path.endswith(".gz"):
+            f = gzip.open(path, "wt", encoding="utf-8", compresslevel=3)
+        else:
+            f = open(path, "w", encoding="utf-8")
+        count = 0
+        with f:
+            for chunk in self.iter_chunks():
+                lines = [json.dumps(entry) for entry in chunk.entries(flavor)]
+                if lines:
+                    f.write("\n".join(lines))
+                    f.write("\n")
+                count += len(lines)
+        return count
+
+    def write_chunks(self, directory: str) -> int:
+        """
+        Stream the dataset to `directory` as one compressed .npz file of numpy columns per chunk,
+        plus a manifest.json with the generator settings and lookup tables.
+
+        :return: Number of records written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        count = 0
+        files = []
+        for index, chunk in enumerate(self.iter_chunks()):
+            name = f"chunk-{index:05d}.npz"
+            np.savez_compressed(os.path.join(directory, name), **chunk.columns())
+            files.append(name)
+            count += len(chunk)
+        manifest = {
+            "seed": self.seed, "records": count, "apps": self.app_names, "app_ids": self.app_ids,
+            "hosts_per_app": self.hosts_per_app, "start_ms": self.start_ms, "now_ms": self.now_ms,
+            "levels": LEVELS.tolist(), "pod_statuses": POD_STATUSES.tolist(),
+            "log_templates": [t for _, t in LOG_TEMPLATES], "event_templates": EVENT_TEMPLATES,
+            "incidents": [repr(incident) for incident in self.incidents], "chunks": files,
+        }
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return count
+
+    def build_store(self, flavor: str = "datadog") -> LogStore:
+        """Load the whole dataset into a LogStore (e.g. for `DatadogApi(store=...)`)."""
+        batch = RecordBatch(DATADOG_SCHEMA if flavor == "datadog" else SPLUNK_SCHEMA)
+        for entry in self.iter_entries(flavor):
+            batch.append_entry(entry)
+        return LogStore.from_batch(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Datadog/Splunk data for load testing.")
+    parser.add_argument("output", help="Output .jsonl / .jsonl.gz file, or a directory with --npz")
+    parser.add_argument("--flavor", choices=["datadog", "splunk"], default="datadog")
+    parser.add_argument("--npz", action="store_true", help="Write numpy column chunks instead of JSON Lines")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--hosts-per-app", type=int, default=4)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--chunk-size", type=int, default=250_000)
+    parser.add_argument("--incidents", type=int, default=10, help="Number of random incidents to inject")
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(seed=args.seed, records=args.records, apps=args.apps,
+                                       hosts_per_app=args.hosts_per_app, days=args.days,
+                                       chunk_size=args.chunk_size, random_incidents=args.incidents)
+    if args.npz:
+        count = generator.write_chunks(args.output)
+    else:
+        count = generator.write_jsonl(args.output, flavor=args.flavor)
+    print(f"Wrote {count} records to {args.output}")
+    for incident in generator.incidents:
+        print(f"  {incident}")
+
+
+if __name__ == "__main__":
+    main()
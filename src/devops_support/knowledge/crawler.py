@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import urllib.robotparser
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+
+# Crawler configuration.
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "2"))
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "200"))
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "8"))
+# Minimum delay (seconds) between two requests to the same host
+CRAWL_DELAY = float(os.getenv("CRAWL_DELAY", "0.1"))
+CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", "15"))
+CRAWL_CACHE_DIR = os.getenv("CRAWL_CACHE_DIR", ".cache/pages")
+CRAWL_USER_AGENT = os.getenv("CRAWL_USER_AGENT", "devops-support-crawler/0.1")
+
+# Extensions never worth fetching as documentation pages
+_SKIPPED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".css", ".js", ".zip", ".gz", ".tar",
+                       ".pdf", ".woff", ".woff2", ".ttf", ".mp4", ".json", ".xml")
+
+
+class _PageParser(HTMLParser):
+    """Collects the visible text and the link targets of an HTML page."""
+
+    _SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg"}
+    _BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "pre", "section", "article",
+                   "header", "footer", "table", "ul", "ol", "dt", "dd", "blockquote"}
+    _CELL_TAGS = {"a", "td", "th", "button", "label"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: list[str] = []
+        self.title = ""
+        self._parts: list[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+        if tag in self._BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in self._BLOCK_TAGS:
+            self._parts.append("\n")
+        elif tag in self._CELL_TAGS:
+            # Adjacent links and cells are separate words ("<a>home</a><a>next</a>")
+            self._parts.append(" ")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._parts.append(data)
+
+    @property
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self._parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def parse_html(html: str) -> tuple[str, str, list[str]]:
+    """Return (title, visible text, raw link targets) of an HTML page."""
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    return parser.title.strip(), parser.text, parser.links
+
+
+def normalize_url(url: str) -> str:
+    """Drop the fragment and the default trailing index so the same page is fetched once."""
+    url, _ = urldefrag(url)
+    if url.endswith("/index.html"):
+        url = url[:-len("index.html")]
+    return url
+
+
+def _site_prefix(path: str) -> str:
+    """Path prefix bounding a crawl: the start page's directory ("/cd" and "/cd/" both give "/cd/")."""
+    if path.endswith("/"):
+        return path
+    head, _, last = path.rpartition("/")
+    return f"{head}/" if "." in last else f"{path}/"
+
+
+class Page:
+    def __init__(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 depth: int = 0, from_cache: bool = False):
+        self.url = url
+        self.html = html
+        self.etag = etag
+        self.last_modified = last_modified
+        self.depth = depth
+        self.from_cache = from_cache
+        self.title, self.text, self.links = parse_html(html)
+
+
+class PageCache:
+    """
+    Local cache of fetched pages (one JSON file per URL) with their ETag and Last-Modified
+    validators, so unchanged pages are revalidated with a conditional request instead of re-downloaded.
+    """
+
+    def __init__(self, cache_dir: str = CRAWL_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, html: str, etag: Optional[str], last_modified: Optional[str]):
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "html": html, "etag": etag, "last_modified": last_modified,
+                       "fetched": time.time()}, f)
+        os.replace(tmp, path)
+
+
+class Crawler:
+    """
+    Concurrent, polite crawler of a documentation site.
+
+    Starting from `start_urls`, pages are fetched breadth-first by a bounded pool of
+    `concurrency` threads, following links that stay on the same site (same host, under the start
+    URL's path) up to `max_depth` hops and `max_pages` pages. Requests to one host are spaced by at
+    least `delay` seconds and robots.txt is honoured. With a PageCache, pages are revalidated with
+    If-None-Match / If-Modified-Since: a 304 reuses the cached copy.
+    """
+
+    def __init__(self, start_urls, max_depth: int = CRAWL_MAX_DEPTH, max_pages: int = CRAWL_MAX_PAGES,
+                 concurrency: int = CRAWL_CONCURRENCY, delay: float = CRAWL_DELAY, timeout: float = CRAWL_TIMEOUT,
+                 cache: Optional[PageCache] = None, user_agent: str = CRAWL_USER_AGENT, respect_robots: bool = True):
+        """
+        :param start_urls: URL or list of URLs to start from; each one also bounds the crawled site.
+        :param max_depth: Maximum number of links followed from a start URL (0: start pages only).
+        :param max_pages: Maximum number of pages returned.
+        :param concurrency: Maximum number of simultaneous requests.
+        :param delay: Minimum delay (seconds) between two requests to the same host.
+        :param timeout: Timeout (seconds) of a single request.
+        :param cache: PageCache for conditional requests (None: always download).
+        """
+        self.start_urls = [normalize_url(url) for url in ([start_urls] if isinstance(start_urls, str) else start_urls)]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.delay = delay
+        self.timeout = timeout
+        self.cache = cache
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.stats = {"fetched": 0, "not_modified": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self._host_locks: dict[str, threading.Lock] = {}
+        self._host_next: dict[str, float] = {}
+        self._robots: dict[str, Optional[urllib.robotparser.RobotFileParser]] = {}
+        self._locks_lock = threading.Lock()
+
+    def _in_scope(self, url: str) -> bool:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or parsed.path.lower().endswith(_SKIPPED_EXTENSIONS):
+            return False
+        for start in self.start_urls:
+            root = urlparse(start)
+            prefix = _site_prefix(root.path)
+            if parsed.netloc == root.netloc and (parsed.path + "/").startswith(prefix):
+                return True
+        return False
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _wait_turn(self, host: str):
+        """Space the requests to a host by at least `delay` seconds."""
+        with self._host_lock(host):
+            now = time.monotonic()
+            wait = self._host_next.get(host, now) - now
+            self._host_next[host] = max(now, self._host_next.get(host, now)) + self.delay
+        if wait > 0:
+            time.sleep(wait)
+
+    def _allowed(self, url: str) -> bool:
+        if not self.respect_robots:
+            return True
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._host_lock(parsed.netloc):
+            if origin not in self._robots:
+                robots = urllib.robotparser.RobotFileParser()
+                try:
+                    request = urllib.request.Request(origin + "/robots.txt", headers={"User-Agent": self.user_agent})
+                    with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                        robots.parse(response.read().decode("utf-8", "replace").splitlines())
+                except Exception:
+                    # No (readable) robots.txt: everything is allowed
+                    robots = None
+                self._robots[origin] = robots
+            robots = self._robots[origin]
+        return robots is None or robots.can_fetch(self.user_agent, url)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url: str, depth: int = 0) -> Optional[Page]:
+        """Fetch one page (conditionally when cached). Returns None on errors and non-HTML content."""
+        if not self._allowed(url):
+            return None
+        cached = self.cache.get(url) if self.cache is not None else None
+        headers = {"User-Agent": self.user_agent, "Accept": "text/html,application/xhtml+xml"}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        self._wait_turn(urlparse(url).netloc)
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout) as response:
+                if "html" not in response.headers.get("Content-Type", "text/html"):
+                    return None
+                charset = response.headers.get_content_charset() or "utf-8"
+                html = response.read().decode(charset, "replace")
+                etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+                # Redirects may land on another URL of the site
+                final_url = normalize_url(response.geturl())
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached:
+                self._count("not_modified")
+                return Page(url, cached["html"], cached.get("etag"), cached.get("last_modified"), depth,
+                            from_cache=True)
+            print(f"Crawler: {url} returned HTTP {e.code}")
+            self._count("failed")
+            return None
+        except Exception as e:
+            print(f"Crawler: failed to fetch {url}: {e}")
+            self._count("failed")
+            return None
+        self._count("fetched")
+        if self.cache is not None:
+            self.cache.put(url, html, etag, last_modified)
+        return Page(final_url, html, etag, last_modified, depth)
+
+    def crawl(self) -> list[Page]:
+        """Crawl the site(s) breadth-first and return the fetched pages in discovery order."""
+        pages: list[Page] = []
+        returned = set()
+        seen = set(self.start_urls)
+        frontier = [url for url in self.start_urls if self._in_scope(url)]
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawler") as pool:
+            for depth in range(self.max_depth + 1):
+                if not frontier or len(pages) >= self.max_pages:
+                    break
+                frontier = frontier[:self.max_pages - len(pages)]
+                next_frontier = []
+                for page in pool.map(lambda url: self.fetch(url, depth), frontier):
+                    if page is None or page.url in returned:
+                        # Failed, or redirected to a page already crawled
+                        continue
+                    pages.append(page)
+                    returned.add(page.url)
+                    seen.add(page.url)
+                    if depth == self.max_depth:
+                        continue
+                    for link in self._links(page):
+                        if link not in seen:
+                            seen.add(link)
+                            next_frontier.append(link)
+                frontier = next_frontier
+        print(f"Crawled {len(pages)} pages from {self.start_urls}: {self.stats}")
+        return pages
+
+    def _links(self, page: Page) -> Iterable[str]:
+        for href in page.links:
+            url = normalize_url(urljoin(page.url, href.strip()))
+            if self._in_scope(url):
+                yield url
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, one writer process at a time
+    fcntl = None
+
+# Embedding cache configuration. An empty EMBED_CACHE_DIR disables the cache.
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", ".cache/embeddings")
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def text_key(text: str) -> bytes:
+    """Content address of a text: its SHA-256 digest."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingStore:
+    """
+    Append-only, content-addressed store of embedding vectors on disk.
+
+    `vectors.f32` holds the float32 vectors row after row and is memory-mapped for reads;
+    `keys.bin` holds the 32-byte content key of each row in the same order. Rows are only ever
+    appended (under a file lock, so several processes can share a store), and an interrupted
+    append is truncated away on the next write.
+    """
+
+    KEY_SIZE = 32
+
+    def __init__(self, path: str):
+        """
+        :param path: Directory of the store. Use one store per embedding model.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._keys_path = os.path.join(path, "keys.bin")
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._lock_path = os.path.join(path, ".lock")
+        self._lock = threading.Lock()
+        self._index: dict[bytes, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self.dim: Optional[int] = None
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        """Pick up the rows appended since the last refresh (possibly by another process)."""
+        if self.dim is None:
+            try:
+                with open(self._meta_path, encoding="utf-8") as f:
+                    self.dim = int(json.load(f)["dim"])
+            except (OSError, ValueError, KeyError):
+                return
+        try:
+            with open(self._keys_path, "rb") as f:
+                f.seek(len(self._index) * self.KEY_SIZE)
+                new_keys = f.read()
+        except OSError:
+            new_keys = b""
+        row_bytes = self.dim * 4
+        vector_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        rows = min(len(self._index) + len(new_keys) // self.KEY_SIZE, vector_rows)
+        for offset in range(0, (rows - len(self._index)) * self.KEY_SIZE, self.KEY_SIZE):
+            self._index.setdefault(new_keys[offset:offset + self.KEY_SIZE], len(self._index))
+        if self._vectors is None or len(self._vectors) != rows:
+            self._vectors = (np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+                             if rows else None)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._index
+
+    def get_many(self, keys: Sequence[bytes]) -> list[Optional[np.ndarray]]:
+        """Vectors of the keys, None for the keys not stored."""
+        with self._lock:
+            if any(key not in self._index for key in keys):
+                self._refresh()
+            rows = [self._index.get(key) for key in keys]
+            vectors = self._vectors
+        return [np.array(vectors[row]) if row is not None else None for row in rows]
+
+    def put_many(self, keys: Sequence[bytes], vectors: Sequence[Sequence[float]]):
+        if not keys:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self.dim is None:
+                    self._refresh()
+                if self.dim is None:
+                    self.dim = matrix.shape[1]
+                    with open(self._meta_path, "w", encoding="utf-8") as f:
+                        json.dump({"dim": self.dim}, f)
+                elif matrix.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match the store's {self.dim}")
+                self._refresh()
+                fresh, rows = set(), []
+                for i, key in enumerate(keys):
+                    if key not in self._index and key not in fresh:
+                        fresh.add(key)
+                        rows.append(i)
+                if not rows:
+                    return
+                count = len(self._index)
+                # Vectors first: a key never points at a missing row, and a partial append is cut off here
+                with open(self._vectors_path, "ab") as f:
+                    f.truncate(count * self.dim * 4)
+                    f.write(matrix[rows].tobytes())
+                with open(self._keys_path, "ab") as f:
+                    f.truncate(count * self.KEY_SIZE)
+                    f.write(b"".join(keys[i] for i in rows))
+                self._refresh()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that embeds each distinct text only once, ever.
+
+    Text embeddings are looked up by the SHA-256 of the text in an EmbeddingStore; the misses are
+    deduplicated, split into batches of `embed_batch_size` and sent to the wrapped model by up to
+    `concurrency` threads, then stored. Query embeddings are passed through uncached.
+    """
+
+    model: BaseEmbedding
+    concurrency: int = EMBED_CONCURRENCY
+    _store: EmbeddingStore = PrivateAttr()
+
+    def __init__(self, model: BaseEmbedding, cache_dir: str = EMBED_CACHE_DIR, batch_size: int = EMBED_BATCH_SIZE,
+                 concurrency: int = EMBED_CONCURRENCY, **kwargs: Any):
+        """
+        :param model: Embedding model computing the vectors of unseen texts.
+        :param cache_dir: Root directory of the caches; each model gets its own store below it.
+        :param batch_size: Number of texts per request to the model.
+        :param concurrency: Maximum number of requests to the model in flight.
+        """
+        super().__init__(model=model, model_name=f"cached:{model.model_name}", embed_batch_size=batch_size,
+                         concurrency=max(1, concurrency), **kwargs)
+        namespace = _UNSAFE.sub("_", f"{model.class_name()}-{model.model_name}")
+        self._store = EmbeddingStore(os.path.join(cache_dir, namespace))
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def store(self) -> EmbeddingStore:
+        return self._store
+
+    def get_text_embedding_batch(self, texts: List[str], show_progress: bool = False,
+                                 **kwargs: Any) -> List[List[float]]:
+        keys = [text_key(text) for text in texts]
+        vectors = self._store.get_many(keys)
+        missing: dict[bytes, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        if missing:
+            missing_keys = list(missing)
+            batches = [missing_keys[i:i + self.embed_batch_size]
+                       for i in range(0, len(missing_keys), self.embed_batch_size)]
+
+            def embed(batch: list[bytes]) -> list[bytes]:
+                self._store.put_many(batch, self.model.get_text_embedding_batch([missing[key] for key in batch]))
+                return batch
+
+            if len(batches) > 1 and self.concurrency > 1:
+                with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches)),
+                                        thread_name_prefix="embed") as pool:
+                    list(pool.map(embed, batches))
+            else:
+                for batch in batches:
+                    embed(batch)
+            print(f"Embedded {len(missing)} new texts ({len(texts) - len(missing)} from the embedding cache)")
+            vectors = self._store.get_many(keys)
+        return [vector.tolist() for vector in vectors]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self.get_text_embedding_batch(texts)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self.get_text_embedding_batch([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embedding(text)
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self.model.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return await self.model.aget_query_embedding(query)
@@ -1,16 +1,35 @@
-from llama_index.readers.web import BeautifulSoupWebReader
+import hashlib
+
+from llama_index.core import Document, VectorStoreIndex
+from llama_index.core.node_parser import SentenceSplitter
+
+from devops_support.knowledge.crawler import CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES, Crawler, PageCache
+
 
 class WebReader:
-    def __init__(self, urls: str):
+    def __init__(self, urls, max_depth: int = CRAWL_MAX_DEPTH, max_pages: int = CRAWL_MAX_PAGES,
+                 cache: bool = True, **crawler_options):
+        """
+        :param urls: URL or list of URLs of the documentation site(s) to read.
+        :param max_depth: Maximum number of same-site links followed from the start URLs (0: start pages only).
+        :param max_pages: Maximum number of pages read.
+        :param cache: Keep a local page cache and only re-download pages that changed.
+        :param crawler_options: Further devops_support.knowledge.crawler.Crawler options (concurrency, delay...).
+        """
         self.urls = urls
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.cache = cache
+        self.crawler_options = crawler_options
         self.documents = None
 
     def _load_data(self):
-        # Load data from the provided URLs using the BeautifulSoupWebReader
-        loader = BeautifulSoupWebReader()
+        # Crawl the site(s) concurrently; unchanged pages are revalidated against the local page cache
         print(f"Loading documents from URLs: {self.urls}")
-        documents = loader.load_data(urls=[self.urls])
-        return documents
+        crawler = Crawler(self.urls, max_depth=self.max_depth, max_pages=self.max_pages,
+                          cache=PageCache() if self.cache else None, **self.crawler_options)
+        return [Document(text=page.text, metadata={"URL": page.url, "title": page.title})
+                for page in crawler.crawl() if page.text]
 
     def get_documents(self):
         if self.documents is None:
@@ -19,5 +38,84 @@ class WebReader:
 
 
 class ArgoWebReader(WebReader):
-    def __init__(self, urls="https://argoproj.github.io/cd"):
-        super().__init__(urls)
+    def __init__(self, urls="https://argoproj.github.io/cd", **kwargs):
+        super().__init__(urls, **kwargs)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def document_source(document) -> str:
+    """Source identifier of a document (its URL for web documents)."""
+    metadata = document.metadata or {}
+    return str(metadata.get("URL") or metadata.get("url") or metadata.get("file_path") or document.doc_id)
+
+
+class IncrementalIngestor:
+    """
+    Content-hash based incremental ingestion into a VectorStore.
+
+    Documents are split into chunks and every chunk is stored under the SHA-256 of its text. On
+    each run only chunks whose hash is not in the collection yet are embedded; chunks that
+    disappeared from a re-ingested source are deleted. Re-ingesting unchanged documents therefore
+    costs no embedding calls at all.
+    """
+
+    def __init__(self, vector_store, chunk_size: int = 1024, chunk_overlap: int = 20):
+        """
+        :param vector_store: devops_support.knowledge.vector_store.VectorStore to ingest into.
+        :param chunk_size: Chunk size (in tokens) used to split documents.
+        :param chunk_overlap: Overlap (in tokens) between consecutive chunks.
+        """
+        self.vector_store = vector_store
+        self.splitter = SentenceSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    def split(self, documents) -> list:
+        """Split documents into nodes whose ids are the content hash of their text."""
+        nodes = []
+        seen = set()
+        for document in documents:
+            source = document_source(document)
+            for node in self.splitter.get_nodes_from_documents([document]):
+                node_hash = content_hash(node.get_content())
+                if node_hash in seen:
+                    # Identical boilerplate chunk (e.g. page footer), embed it only once
+                    continue
+                seen.add(node_hash)
+                node.id_ = node_hash
+                node.metadata["source"] = source
+                node.metadata["content_hash"] = node_hash
+                nodes.append(node)
+        return nodes
+
+    def ingest(self, documents) -> dict[str, int]:
+        """
+        Bring the collection in line with `documents`, embedding only new or changed chunks.
+
+        :return: Counts of added, unchanged and removed chunks.
+        """
+        nodes = self.split(documents)
+        collection = self.vector_store.get_collection()
+        existing = collection.get(include=["metadatas"])
+        existing_sources = {
+            node_id: (metadata or {}).get("source")
+            for node_id, metadata in zip(existing["ids"], existing["metadatas"])
+        }
+
+        new_ids = {node.id_ for node in nodes}
+        sources = {node.metadata["source"] for node in nodes}
+        to_add = [node for node in nodes if node.id_ not in existing_sources]
+        # Chunks of the re-ingested sources that are no longer present are stale
+        to_remove = [node_id for node_id, source in existing_sources.items()
+                     if source in sources and node_id not in new_ids]
+
+        if to_remove:
+            collection.delete(ids=to_remove)
+        if to_add:
+            # Embeds the new chunks and writes them to the Chroma collection
+            VectorStoreIndex(to_add, storage_context=self.vector_store.get_storage_context())
+
+        stats = {"added": len(to_add), "unchanged": len(nodes) - len(to_add), "removed": len(to_remove)}
+        print(f"Ingestion into '{self.vector_store.collection_name}': {stats}")
+        return stats
@@ -1,22 +1,63 @@
 from llama_index.core import VectorStoreIndex
+from llama_index.core.query_engine import RetrieverQueryEngine
+
+from devops_support.knowledge.ingest import IncrementalIngestor
+from devops_support.knowledge.retrieval import (
+    RETRIEVAL_BM25_TOP_K,
+    RETRIEVAL_CHUNK_OVERLAP,
+    RETRIEVAL_CHUNK_SIZE,
+    RETRIEVAL_TOP_N,
+    RETRIEVAL_VECTOR_TOP_K,
+    BM25Index,
+    HybridRetriever,
+    KeywordReranker,
+)
+
 
 class QueryEngine:
-    def __init__(self, vector_store, documents):
+    def __init__(self, vector_store, documents=None, chunk_size: int = RETRIEVAL_CHUNK_SIZE,
+                 chunk_overlap: int = RETRIEVAL_CHUNK_OVERLAP, vector_top_k: int = RETRIEVAL_VECTOR_TOP_K,
+                 bm25_top_k: int = RETRIEVAL_BM25_TOP_K, top_n: int = RETRIEVAL_TOP_N, hybrid: bool = True):
+        """
+        :param vector_store: devops_support.knowledge.vector_store.VectorStore holding the index.
+        :param documents: Documents to (incrementally) ingest before querying. If None, the
+                          content already stored in the vector store is queried as is.
+        :param chunk_size: Chunk size (in tokens) used when splitting documents.
+        :param chunk_overlap: Overlap (in tokens) between consecutive chunks.
+        :param vector_top_k: Number of vector search hits entering the fusion.
+        :param bm25_top_k: Number of BM25 keyword hits entering the fusion.
+        :param top_n: Number of chunks kept after reranking, i.e. passed to the LLM.
+        :param hybrid: Fuse BM25 with the vectors and rerank. If False, plain vector top-`top_n`.
+        """
         self.documents = documents
         self.vector_store = vector_store
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.vector_top_k = vector_top_k
+        self.bm25_top_k = bm25_top_k
+        self.top_n = top_n
+        self.hybrid = hybrid
         self.query_engine = None
 
     def initialize_query_engine(self):
-        # Create a storage context from the vector store
-        storage_context = self.vector_store.get_storage_context()
+        # Embed only the chunks that are not in the (persistent) vector store yet
+        if self.documents:
+            IncrementalIngestor(self.vector_store, chunk_size=self.chunk_size,
+                                chunk_overlap=self.chunk_overlap).ingest(self.documents)
+
+        # Create an index on top of the vector store's existing content
+        index = VectorStoreIndex.from_vector_store(self.vector_store.get_vector_store())
 
-        # Create an index from the documents using the new import path
-        index = VectorStoreIndex.from_documents(
-            self.documents, 
-            storage_context=storage_context)
+        if not self.hybrid:
+            self.query_engine = index.as_query_engine(similarity_top_k=self.top_n)
+            return
 
-        # Create a query engine from the index
-        self.query_engine = index.as_query_engine()
+        # Vector + BM25 candidates fused by rank, reranked down to the few chunks sent to the LLM
+        bm25 = BM25Index.from_collection(self.vector_store.get_collection())
+        retriever = HybridRetriever(index.as_retriever(similarity_top_k=self.vector_top_k), bm25,
+                                    bm25_top_k=self.bm25_top_k)
+        self.query_engine = RetrieverQueryEngine.from_args(
+            retriever, node_postprocessors=[KeywordReranker(top_n=self.top_n)])
 
     def get_query_engine(self):
         if self.query_engine is None:
@@ -0,0 +1,163 @@
+import math
+import os
+import re
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+
+# Retrieval tuning. Fewer, better chunks reaching the LLM keep local generation fast.
+RETRIEVAL_CHUNK_SIZE = int(os.getenv("RETRIEVAL_CHUNK_SIZE", "512"))
+RETRIEVAL_CHUNK_OVERLAP = int(os.getenv("RETRIEVAL_CHUNK_OVERLAP", "64"))
+RETRIEVAL_VECTOR_TOP_K = int(os.getenv("RETRIEVAL_VECTOR_TOP_K", "8"))
+RETRIEVAL_BM25_TOP_K = int(os.getenv("RETRIEVAL_BM25_TOP_K", "8"))
+RETRIEVAL_TOP_N = int(os.getenv("RETRIEVAL_TOP_N", "3"))
+# Constant of reciprocal-rank fusion: score = sum over rankings of 1 / (RRF_K + rank)
+RRF_K = 60
+
+_TOKEN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it of on or the this to what when where which "
+    "who why with you your".split())
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory Okapi BM25 keyword index over text nodes.
+
+    Postings are numpy arrays per term, so a query only touches the documents containing its terms.
+    """
+
+    def __init__(self, nodes: list, k1: float = 1.5, b: float = 0.75):
+        self.nodes = nodes
+        self.k1 = k1
+        self.b = b
+        lengths = []
+        postings: dict[str, tuple[list, list]] = {}
+        for doc, node in enumerate(nodes):
+            terms = Counter(tokenize(node.get_content()))
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                docs, tfs = postings.setdefault(term, ([], []))
+                docs.append(doc)
+                tfs.append(tf)
+        self.lengths = np.asarray(lengths, dtype=np.float32)
+        self.avg_length = float(self.lengths.mean()) if len(nodes) else 0.0
+        n = len(nodes)
+        self.postings = {}
+        for term, (docs, tfs) in postings.items():
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = (np.asarray(docs, dtype=np.int32), np.asarray(tfs, dtype=np.float32), idf)
+
+    @classmethod
+    def from_collection(cls, collection, **kwargs) -> "BM25Index":
+        """Build the index from every chunk stored in a Chroma collection."""
+        result = collection.get(include=["documents", "metadatas"])
+        nodes = []
+        for node_id, text, metadata in zip(result["ids"], result["documents"], result["metadatas"]):
+            try:
+                node = metadata_dict_to_node(metadata or {}, text=text)
+            except Exception:
+                node = TextNode(id_=node_id, text=text or "", metadata=metadata or {})
+            nodes.append(node)
+        return cls(nodes, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def search(self, query: str, top_k: int) -> list[NodeWithScore]:
+        if not self.nodes:
+            return []
+        scores = np.zeros(len(self.nodes), dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self.lengths / max(self.avg_length, 1e-9))
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            docs, tfs, idf = posting
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+        candidates = np.flatnonzero(scores)
+        if not len(candidates):
+            return []
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:top_k]]
+        return [NodeWithScore(node=self.nodes[i], score=float(scores[i])) for i in top]
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Vector search and BM25 keyword search fused with reciprocal-rank fusion.
+
+    Exact identifiers (CLI flags, resource kinds, annotation names) are found by BM25 even when
+    the embedding misses them; paraphrased questions are found by the vectors.
+    """
+
+    def __init__(self, vector_retriever: BaseRetriever, bm25: BM25Index, bm25_top_k: int = RETRIEVAL_BM25_TOP_K,
+                 top_k: Optional[int] = None, rrf_k: int = RRF_K):
+        """
+        :param vector_retriever: Retriever over the vector index (its own similarity_top_k applies).
+        :param bm25: Keyword index over the same chunks.
+        :param bm25_top_k: Number of BM25 hits entering the fusion.
+        :param top_k: Number of fused results returned (all by default).
+        """
+        super().__init__()
+        self.vector_retriever = vector_retriever
+        self.bm25 = bm25
+        self.bm25_top_k = bm25_top_k
+        self.top_k = top_k
+        self.rrf_k = rrf_k
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        rankings = [self.vector_retriever.retrieve(query_bundle),
+                    self.bm25.search(query_bundle.query_str, self.bm25_top_k)]
+        fused: dict[str, NodeWithScore] = {}
+        scores: dict[str, float] = {}
+        for ranking in rankings:
+            for rank, hit in enumerate(ranking):
+                node_id = hit.node.node_id
+                fused.setdefault(node_id, hit)
+                scores[node_id] = scores.get(node_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        ordered = sorted(scores, key=scores.get, reverse=True)[:self.top_k]
+        return [NodeWithScore(node=fused[node_id].node, score=scores[node_id]) for node_id in ordered]
+
+
+class KeywordReranker(BaseNodePostprocessor):
+    """
+    Lightweight rerank: blends the retrieval score (normalized to the best hit) with how many of
+    the query's terms and adjacent term pairs the chunk contains, then keeps the `top_n` best.
+    No model call, so it costs microseconds per chunk.
+    """
+
+    top_n: int = RETRIEVAL_TOP_N
+    weight: float = 0.5
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "KeywordReranker"
+
+    def _postprocess_nodes(self, nodes: List[NodeWithScore],
+                           query_bundle: Optional[QueryBundle] = None) -> List[NodeWithScore]:
+        if query_bundle is None or not nodes:
+            return nodes[:self.top_n]
+        terms = tokenize(query_bundle.query_str)
+        unique_terms = set(terms)
+        pairs = set(zip(terms, terms[1:]))
+        best = max((hit.score or 0.0) for hit in nodes) or 1.0
+        reranked = []
+        for hit in nodes:
+            tokens = tokenize(hit.node.get_content())
+            present = set(tokens)
+            coverage = len(unique_terms & present) / len(unique_terms) if unique_terms else 0.0
+            if pairs:
+                coverage = 0.7 * coverage + 0.3 * len(pairs & set(zip(tokens, tokens[1:]))) / len(pairs)
+            score = (1 - self.weight) * (hit.score or 0.0) / best + self.weight * coverage
+            reranked.append(NodeWithScore(node=hit.node, score=score))
+        reranked.sort(key=lambda hit: hit.score, reverse=True)
+        return reranked[:self.top_n]
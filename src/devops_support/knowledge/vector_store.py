@@ -1,27 +1,51 @@
+import os
+
 import chromadb
 from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_index.core import StorageContext
 
+# Directory of the on-disk Chroma database used when persistence is requested without a path.
+DEFAULT_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", ".chroma")
+
+
 class VectorStore:
-    def __init__(self, collection_name):
+    def __init__(self, collection_name, persist_dir=None):
+        """
+        :param collection_name: Name of the Chroma collection.
+        :param persist_dir: Directory of a persistent on-disk Chroma database. If None, an
+                            in-memory client is used and the collection is lost on exit.
+        """
         self.collection_name = collection_name
+        self.persist_dir = persist_dir
         self.vector_store = None
+        self.chroma_collection = None
 
     def initialize_vector_store(self):
-        # Initialize Chroma client
-        chroma_client = chromadb.Client()
+        # Initialize Chroma client (on disk when a persist directory is configured)
+        if self.persist_dir:
+            chroma_client = chromadb.PersistentClient(path=self.persist_dir)
+        else:
+            chroma_client = chromadb.Client()
 
-        # Create a Chroma collection
-        chroma_collection = chroma_client.create_collection(name=self.collection_name)
+        # Reuse the Chroma collection if it already exists
+        self.chroma_collection = chroma_client.get_or_create_collection(name=self.collection_name)
 
         # Set up the vector store
-        self.vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+        self.vector_store = ChromaVectorStore(chroma_collection=self.chroma_collection)
 
     def get_vector_store(self):
         if self.vector_store is None:
             self.initialize_vector_store()
         return self.vector_store
 
+    def get_collection(self):
+        self.get_vector_store()
+        return self.chroma_collection
+
+    def count(self) -> int:
+        """Number of chunks currently stored in the collection."""
+        return self.get_collection().count()
+
     def get_storage_context(self):
         vector_store = self.get_vector_store()
         return StorageContext.from_defaults(vector_store=vector_store)
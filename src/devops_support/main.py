@@ -4,11 +4,9 @@ import sys
 import warnings
 
 from datetime import datetime
-import weave
-from devops_support.agents.datadog_agent import DatadogCrew
-from devops_support.agents.splunk_agent import SplunkCrew
-from devops_support.crews.crew import DevopsResearch
-from devops_support.orchestrator.orchestrator import Orchestator
+
+# Every entry point imports only the crew it runs (inside the function): importing the whole
+# stack (crewAI, llama_index, chromadb, weave) up front costs seconds per short-lived CLI/job run.
 
 #warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -22,11 +20,19 @@ def run():
     """
     Run the crew.
     """
+    from devops_support.agents.splunk_agent import SplunkCrew, fetch_splunk_data, splunk_kickoff_inputs, splunk_precheck
+
     query = "can you check the status for application AuthService?"
     
     try:
+        inputs = {"query": query}
+        data = fetch_splunk_data(inputs)
+        answer = splunk_precheck(inputs, data)
+        if answer is not None:
+            print(answer)
+            return
         crew_instance = SplunkCrew().crew()
-        crew_instance.kickoff(inputs={"query": query})
+        crew_instance.kickoff(inputs=splunk_kickoff_inputs(inputs, data))
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
@@ -34,27 +40,106 @@ def run_datadog():
     """
     Run the crew.
     """
+    from devops_support.agents.datadog_agent import DatadogCrew, datadog_kickoff_inputs, datadog_precheck, fetch_datadog_data
+
     query = "can you check the status for appID app-002 with app name backend_service?"
     
     try:
+        inputs = {"query": query}
+        data = fetch_datadog_data(inputs)
+        answer = datadog_precheck(inputs, data)
+        if answer is not None:
+            print(answer)
+            return
         # Initialize Weave with your project name
+        #import weave
         #weave.init(project_name="crewai")
         crew_instance = DatadogCrew().crew()
-        crew_instance.kickoff(inputs={"query": query})
+        crew_instance.kickoff(inputs=datadog_kickoff_inputs(inputs, data))
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
     
+def run_datadog_stream():
+    """
+    Run the Datadog crew and print its output as it is produced.
+    """
+    from devops_support.agents.datadog_agent import DatadogCrew
+    from devops_support.streaming import stream_crew
+
+    query = "can you check the status for appID app-002 with app name backend_service?"
+
+    for event in stream_crew(DatadogCrew().crew(), inputs={"query": query}):
+        if event["event"] == "token":
+            print(event["chunk"], end="", flush=True)
+        elif event["event"] == "task_started":
+            print(f"\n=== {event['agent']}: {event['task']} ===")
+        elif event["event"] == "error":
+            raise Exception(event["detail"])
+
 def run2():
+    from devops_support.orchestrator.orchestrator import Orchestator
+
     try:
         #"What are the best practices for setting up ArgoCD?"
         Orchestator().run(query="I want to list steps to set up ArgoCD in EKS cluster.")
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
     
+def run_incident():
+    """
+    Investigate one incident across Splunk, Datadog and ArgoCD in a single reasoning pass.
+    """
+    from devops_support.orchestrator.orchestrator import Orchestator
+
+    try:
+        result = Orchestator().run_incident(
+            query="AuthService users are being logged out and backend_service deployments are failing. What happened?",
+            app_name="AuthService", datadog_app="backend_service", days=2)
+        print(result.raw)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the crew: {e}")
+
+def run_parallel():
+    """
+    Run independent Splunk, Datadog and ArgoCD analyses at once, each in its own worker process.
+    """
+    from devops_support.orchestrator.crew_pool import CrewProcessPool
+
+    jobs = [
+        ("splunk", {"query": "can you check the status for application AuthService?"}),
+        ("datadog", {"query": "can you check the status for appID app-002 with app name backend_service?"}),
+        ("argocd", {"query": "I want to list steps to set up ArgoCD in EKS cluster."}),
+    ]
+    with CrewProcessPool(workers=len(jobs)) as pool:
+        submitted = pool.map(jobs)
+        for job in pool.as_completed(submitted):
+            try:
+                print(f"=== {job.kind} ===\n{job.result()}")
+            except Exception as e:
+                print(f"=== {job.kind} failed: {e}")
+
+def run_health_report():
+    """
+    Batch health report across many apps: `health_report [datadog|splunk] [days] [app ...]`
+    (all apps of the source by default). Only the degraded apps are sent to the LLM.
+    """
+    from devops_support.orchestrator.fleet_report import FleetHealthReport, format_fleet_report
+
+    source = sys.argv[1] if len(sys.argv) > 1 else "datadog"
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    apps = sys.argv[3:] or None
+    try:
+        report = FleetHealthReport(source=source, days=days).run(apps)
+        print(format_fleet_report(report))
+    except Exception as e:
+        raise Exception(f"An error occurred while running the health report: {e}")
+
 def run1():
     """
     Run the crew.
     """
+    from devops_support.crews.crew import DevopsResearch
+
     inputs = {
         'topic': 'AI LLMs',
         'current_year': str(datetime.now().year)
@@ -70,6 +155,8 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
+    from devops_support.crews.crew import DevopsResearch
+
     inputs = {
         "topic": "AI LLMs"
     }
@@ -83,6 +170,8 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    from devops_support.crews.crew import DevopsResearch
+
     try:
         DevopsResearch().crew().replay(task_id=sys.argv[1])
 
@@ -93,6 +182,8 @@ def test():
     """
     Test the crew execution and returns the results.
     """
+    from devops_support.crews.crew import DevopsResearch
+
     inputs = {
         "topic": "AI LLMs",
         "current_year": str(datetime.now().year)
@@ -0,0 +1,137 @@
+import hashlib
+import math
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from crewai.llms.base_llm import BaseLLM
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.base.llms.types import (
+    CompletionResponse,
+    CompletionResponseGen,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.llms.custom import CustomLLM
+
+from devops_support.backends import CANNED_LLM_LATENCY, EMBED_DIM
+
+_TOKEN = re.compile(r"\w+")
+# Context block of llama_index's question-answering prompts
+_QA_CONTEXT = re.compile(r"-{5,}\n(.*?)\n-{5,}", re.S)
+
+
+def canned_answer(prompt: str) -> str:
+    """Deterministic answer to a prompt: same prompt, same answer."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    return f"Canned analysis {digest} of a {len(prompt)}-character prompt."
+
+
+class CannedLLM(BaseLLM):
+    """
+    crewAI LLM answering every call immediately with a deterministic "Final Answer", so crews run
+    end to end without a model server and only the framework and data path are measured.
+    """
+
+    def __init__(self, latency: float = CANNED_LLM_LATENCY):
+        """
+        :param latency: Simulated model latency in seconds per call.
+        """
+        super().__init__(model="canned")
+        self.latency = latency
+        self.calls = 0
+
+    def call(self, messages: Union[str, List[Dict[str, str]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None) -> str:
+        if not isinstance(messages, str):
+            messages = "\n".join(message.get("content") or "" for message in messages)
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return f"Thought: I now can give a great answer\nFinal Answer: {canned_answer(messages)}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128_000
+
+
+class CannedIndexLLM(CustomLLM):
+    """
+    llama_index LLM for the query engine: answers with the beginning of the retrieved context
+    (extractive), or a canned answer when the prompt carries no context block.
+    """
+
+    latency: float = CANNED_LLM_LATENCY
+    answer_chars: int = 400
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CannedIndexLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(context_window=128_000, num_output=self.answer_chars // 4, model_name="canned")
+
+    def _answer(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        match = _QA_CONTEXT.search(prompt)
+        if match:
+            return match.group(1).strip()[:self.answer_chars]
+        return canned_answer(prompt)
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        return CompletionResponse(text=self._answer(prompt))
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponseGen:
+        text = self._answer(prompt)
+
+        def gen() -> CompletionResponseGen:
+            for start in range(0, len(text), 16):
+                yield CompletionResponse(text=text[:start + 16], delta=text[start:start + 16])
+
+        return gen()
+
+
+class HashingEmbedding(BaseEmbedding):
+    """
+    Fast local embedding: sublinear term frequencies (1 + log tf) of the text's tokens, hashed into
+    a fixed number of signed buckets and L2-normalized.
+
+    It needs no fitting, so vectors stay comparable across incremental ingests (a fitted TF-IDF
+    vocabulary would change with every ingest and invalidate the stored vectors).
+    """
+
+    dim: int = EMBED_DIM
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "HashingEmbedding"
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, count in Counter(_TOKEN.findall(text.lower())).items():
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _get_text_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
@@ -0,0 +1,440 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, as_completed
+from multiprocessing.connection import wait as wait_connections
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from devops_support.session_memory import DEFAULT_SESSION
+
+# Worker processes of the crew pool, jobs allowed to wait for one, and the crews every worker
+# builds when it starts (comma-separated job kinds, empty: build on first use).
+CREW_POOL_WORKERS = int(os.getenv("CREW_POOL_WORKERS", str(os.cpu_count() or 1)))
+CREW_POOL_MAX_QUEUE = int(os.getenv("CREW_POOL_MAX_QUEUE", "64"))
+CREW_POOL_WARM = [kind.strip() for kind in os.getenv("CREW_POOL_WARM", "splunk,datadog").split(",") if kind.strip()]
+
+JOB_KINDS = ("splunk", "datadog", "argocd")
+
+
+class JobQueueFull(Exception):
+    """Raised when `max_queue` jobs are already waiting for a worker."""
+
+
+class JobTimeout(Exception):
+    """Raised by a job's result when it ran longer than its timeout (its worker was restarted)."""
+
+
+###################
+# Worker side
+###################
+# Warm state of the current worker process: one crew / orchestrator per job kind, reused by every
+# job the worker runs. Workers run one job at a time, so nothing here is shared between jobs.
+_worker_state: dict[str, Any] = {}
+
+
+def _worker_component(kind: str):
+    component = _worker_state.get(kind)
+    if component is None:
+        if kind == "splunk":
+            from devops_support.agents.splunk_agent import SplunkCrew
+            component = SplunkCrew()
+        elif kind == "datadog":
+            from devops_support.agents.datadog_agent import DatadogCrew
+            component = DatadogCrew()
+        elif kind == "argocd":
+            # Configures llama_index's Settings and holds the query engine of this process only. The
+            # index is built by the pool's process; workers only read it (no concurrent ingests)
+            from devops_support.orchestrator.orchestrator import Orchestator
+            component = Orchestator(read_only=True)
+            component.warm_up()
+        else:
+            raise ValueError(f"Unknown job kind {kind!r}, expected one of {', '.join(JOB_KINDS)}")
+        _worker_state[kind] = component
+    return component
+
+
+def run_job(kind: str, inputs: dict) -> str:
+    """
+    Run one crew job in the current process, on its warm state. This is what a pool worker
+    executes; Splunk/Datadog jobs go through the anomaly pre-pass first (healthy apps skip the crew).
+    """
+    if kind == "argocd":
+        return _worker_component("argocd").run_argocd(inputs["query"], inputs.get("session_id") or DEFAULT_SESSION).raw
+    if kind == "splunk":
+        from devops_support.agents.splunk_agent import fetch_splunk_data as fetch
+        from devops_support.agents.splunk_agent import splunk_kickoff_inputs as kickoff_inputs
+        from devops_support.agents.splunk_agent import splunk_precheck as precheck
+    elif kind == "datadog":
+        from devops_support.agents.datadog_agent import datadog_kickoff_inputs as kickoff_inputs
+        from devops_support.agents.datadog_agent import datadog_precheck as precheck
+        from devops_support.agents.datadog_agent import fetch_datadog_data as fetch
+    else:
+        raise ValueError(f"Unknown job kind {kind!r}, expected one of {', '.join(JOB_KINDS)}")
+    # One fetch for the pre-pass and the kickoff context
+    data = fetch(inputs)
+    answer = precheck(inputs, data)
+    if answer is not None:
+        return answer
+    return _worker_component(kind).crew().kickoff(inputs=kickoff_inputs(inputs, data)).raw
+
+
+def _mock_data_seed() -> int:
+    """Seed of this process's mock datasets, so that workers generate the same data."""
+    from devops_support.data import seed
+    return seed.MOCK_DATA_SEED
+
+
+def _seed_mock_data(mock_seed: int):
+    from devops_support.data import seed
+    seed.MOCK_DATA_SEED = mock_seed
+
+
+def _worker_main(worker_id: int, conn, warm: list[str], mock_seed: int):
+    """Worker process: build the warm state, then run the jobs received on `conn` one by one."""
+    _seed_mock_data(mock_seed)
+    for kind in warm:
+        try:
+            _worker_component(kind)
+        except Exception as e:
+            print(f"Crew worker {worker_id}: warming up {kind} failed: {e}")
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+        job_id, job, inputs = message
+        try:
+            result = job(inputs) if callable(job) else run_job(job, inputs)
+            conn.send((job_id, True, result))
+        except Exception as e:
+            conn.send((job_id, False, f"{type(e).__name__}: {e}"))
+
+
+###################
+# Pool side
+###################
+class CrewJob:
+    """A job submitted to a CrewProcessPool. `future` resolves to the crew's raw output."""
+
+    def __init__(self, job_id: int, kind: Union[str, Callable[[dict], Any]], inputs: dict, timeout: Optional[float]):
+        self.job_id = job_id
+        self.kind = kind
+        self.inputs = inputs
+        self.timeout = timeout
+        self.future: Future = Future()
+        # queued -> running -> done / failed / cancelled / timeout
+        self.status = "queued"
+        self.worker_id = None
+        self.submitted = time.monotonic()
+        self.started = None
+
+    def result(self, timeout: float = None) -> Any:
+        return self.future.result(timeout)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def __repr__(self) -> str:
+        kind = self.kind if isinstance(self.kind, str) else getattr(self.kind, "__name__", "job")
+        return f"CrewJob({self.job_id}, {kind}, {self.status})"
+
+
+class _Worker:
+    __slots__ = ("worker_id", "process", "conn", "job")
+
+    def __init__(self, worker_id: int, process, conn):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = conn
+        self.job: Optional[CrewJob] = None
+
+
+class CrewProcessPool:
+    """
+    Runs independent SplunkCrew / DatadogCrew / ArgoCDCrew jobs in separate worker processes.
+
+    Each worker is a long-lived (spawned) process that builds its crews, and for ArgoCD its own
+    Orchestator with llama_index Settings and query engine, once and reuses them for every job it
+    runs, one job at a time. Parsing and prompt building then use every core instead of contending
+    for one GIL, and the module-level state the crews mutate is private to each process.
+
+    Jobs wait in a bounded queue (JobQueueFull beyond `max_queue`) and are handed to the first idle
+    worker. A dispatcher thread collects the results into each job's future. Cancelling a queued
+    job drops it; cancelling a running one (or exceeding its timeout) terminates its worker, which
+    is replaced by a fresh one, since a kickoff cannot be interrupted from outside.
+
+    Workers generate the same mock datasets as the pool's process (same seed). The ArgoCD index is
+    crawled and ingested once, in the pool's process (when "argocd" is warmed, or on the first ArgoCD
+    job); workers open the persistent vector store read-only.
+    """
+
+    def __init__(self, workers: int = CREW_POOL_WORKERS, max_queue: int = CREW_POOL_MAX_QUEUE,
+                 warm: Iterable[str] = None, poll_interval: float = 0.2):
+        """
+        :param workers: Worker processes.
+        :param max_queue: Jobs allowed to wait for a worker.
+        :param warm: Job kinds each worker prepares when it starts (default CREW_POOL_WARM).
+        :param poll_interval: How often (seconds) the dispatcher checks timeouts and dead workers.
+        """
+        self.max_queue = max_queue
+        self.warm = list(warm) if warm is not None else CREW_POOL_WARM
+        self.poll_interval = poll_interval
+        # spawn, not fork: the parent may hold threads and locks (API server, shared stores)
+        self._context = multiprocessing.get_context("spawn")
+        self._mock_seed = _mock_data_seed()
+        self._index_lock = threading.Lock()
+        self._index_ready = False
+        if "argocd" in self.warm:
+            self._prepare_argocd_index()
+        self._lock = threading.RLock()
+        self._job_ids = itertools.count(1)
+        self._worker_ids = itertools.count(1)
+        self._pending: deque[CrewJob] = deque()
+        self._retired: list[_Worker] = []
+        self._closed = False
+        self._workers = [self._spawn() for _ in range(max(1, workers))]
+        self._dispatcher = threading.Thread(target=self._dispatch, name="crew-pool-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def __enter__(self) -> "CrewProcessPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            running = sum(1 for worker in self._workers if worker.job is not None)
+            return {"workers": len(self._workers), "running": running, "queued": len(self._pending),
+                    "max_queue": self.max_queue}
+
+    def submit(self, kind: Union[str, Callable[[dict], Any]], inputs: dict = None,
+               timeout: float = None) -> CrewJob:
+        """
+        Queue a job.
+
+        :param kind: "splunk", "datadog" or "argocd", or a picklable top-level function called
+                     with `inputs` in the worker.
+        :param inputs: Kickoff inputs, e.g. {"query": ..., "days": ...}.
+        :param timeout: Seconds the job may run once started; its worker is restarted beyond that.
+        """
+        if isinstance(kind, str) and kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}, expected one of {', '.join(JOB_KINDS)}")
+        if kind == "argocd":
+            self._prepare_argocd_index()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The crew pool is shut down")
+            if len(self._pending) >= self.max_queue:
+                raise JobQueueFull(f"{len(self._pending)} jobs are already waiting for a worker")
+            job = CrewJob(next(self._job_ids), kind, dict(inputs or {}), timeout)
+            self._pending.append(job)
+            self._assign()
+        return job
+
+    def map(self, jobs: Iterable[tuple[str, dict]], timeout: float = None) -> list[CrewJob]:
+        """
+        Submit (kind, inputs) pairs; returns their jobs in the same order. On JobQueueFull the
+        jobs submitted before it stay queued.
+        """
+        return [self.submit(kind, inputs, timeout) for kind, inputs in jobs]
+
+    def as_completed(self, jobs: Iterable[CrewJob], timeout: float = None) -> Iterator[CrewJob]:
+        """Yield `jobs` as they finish (whatever their outcome)."""
+        by_future = {job.future: job for job in jobs}
+        for future in as_completed(by_future, timeout):
+            yield by_future[future]
+
+    def results(self, jobs: Iterable[CrewJob], timeout: float = None) -> dict[int, Any]:
+        """Wait for `jobs` and return {job_id: result, or the exception the job ended with}."""
+        results = {}
+        for job in self.as_completed(jobs, timeout):
+            try:
+                results[job.job_id] = job.result()
+            except BaseException as e:
+                results[job.job_id] = e
+        return results
+
+    def cancel(self, job: Union[CrewJob, int]) -> bool:
+        """Cancel a queued or running job. False when it had already finished."""
+        job_id = job.job_id if isinstance(job, CrewJob) else job
+        with self._lock:
+            for pending in self._pending:
+                if pending.job_id == job_id:
+                    self._pending.remove(pending)
+                    pending.status = "cancelled"
+                    pending.future.cancel()
+                    return True
+            for worker in self._workers:
+                if worker.job is not None and worker.job.job_id == job_id:
+                    running = worker.job
+                    self._replace(worker)
+                    running.status = "cancelled"
+                    running.future.set_exception(CancelledError(f"Job {job_id} was cancelled while running"))
+                    self._assign()
+                    return True
+        return False
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True):
+        """
+        Stop the pool.
+
+        :param wait: Let the running jobs finish (False: terminate them, they end cancelled).
+        :param cancel_pending: Cancel the queued jobs (False: run them first; requires `wait`).
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if cancel_pending or not wait:
+                while self._pending:
+                    job = self._pending.popleft()
+                    job.status = "cancelled"
+                    job.future.cancel()
+            remaining = [job.future for job in self._pending]
+            remaining += [worker.job.future for worker in self._workers if worker.job is not None]
+        if wait:
+            for future in remaining:
+                try:
+                    future.exception()
+                except CancelledError:
+                    pass
+        with self._lock:
+            for worker in self._workers:
+                if worker.job is not None:
+                    worker.job.status = "cancelled"
+                    worker.job.future.set_exception(CancelledError("The crew pool was shut down"))
+                    worker.job = None
+                    worker.process.terminate()
+                else:
+                    try:
+                        worker.conn.send(None)
+                    except (OSError, ValueError):
+                        pass
+            workers, self._workers = self._workers, []
+        self._dispatcher.join()
+        for worker in workers + self._retired:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.conn.close()
+        self._retired = []
+
+    def _prepare_argocd_index(self):
+        """Crawl and ingest the ArgoCD documentation once, here, before workers open the index."""
+        with self._index_lock:
+            if self._index_ready:
+                return
+            from devops_support.orchestrator.orchestrator import Orchestator
+            Orchestator().build_index()
+            self._index_ready = True
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        worker_id = next(self._worker_ids)
+        process = self._context.Process(target=_worker_main, args=(worker_id, child_conn, self.warm, self._mock_seed),
+                                        name=f"crew-worker-{worker_id}", daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(worker_id, process, parent_conn)
+
+    def _replace(self, worker: _Worker):
+        """Terminate `worker` (lock held) and start a fresh one in its place."""
+        worker.process.terminate()
+        worker.job = None
+        # Its connection is closed by the dispatcher, which may be waiting on it
+        self._retired.append(worker)
+        self._workers[self._workers.index(worker)] = self._spawn()
+
+    def _assign(self):
+        """Hand queued jobs to idle workers (lock held)."""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.job is not None:
+                continue
+            while self._pending:
+                job = self._pending.popleft()
+                # Skipped when the caller cancelled the future itself
+                if job.future.set_running_or_notify_cancel():
+                    break
+                job.status = "cancelled"
+            else:
+                return
+            job.status = "running"
+            job.worker_id = worker.worker_id
+            job.started = time.monotonic()
+            worker.job = job
+            try:
+                worker.conn.send((job.job_id, job.kind, job.inputs))
+            except Exception as e:
+                # Unpicklable inputs / function: fail the job, keep the worker
+                worker.job = None
+                job.status = "failed"
+                job.future.set_exception(e)
+
+    def _finish(self, worker: _Worker, job_id: int, ok: bool, payload: Any):
+        job = worker.job
+        if job is None or job.job_id != job_id:
+            return
+        worker.job = None
+        if ok:
+            job.status = "done"
+            job.future.set_result(payload)
+        else:
+            job.status = "failed"
+            job.future.set_exception(Exception(f"Job {job_id} failed: {payload}"))
+
+    def _check_workers(self):
+        """Fail the jobs of dead workers and of jobs past their timeout, replacing the worker (lock held)."""
+        now = time.monotonic()
+        for worker in list(self._workers):
+            job = worker.job
+            if not worker.process.is_alive():
+                self._replace(worker)
+                if job is not None:
+                    job.status = "failed"
+                    job.future.set_exception(Exception(
+                        f"Job {job.job_id} failed: worker exited with code {worker.process.exitcode}"))
+            elif job is not None and job.timeout is not None and now - job.started > job.timeout:
+                self._replace(worker)
+                job.status = "timeout"
+                job.future.set_exception(JobTimeout(f"Job {job.job_id} did not complete within {job.timeout} seconds"))
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                if self._closed and not self._workers:
+                    return
+                by_conn = {worker.conn: worker for worker in self._workers}
+            ready = wait_connections(list(by_conn), timeout=self.poll_interval) if by_conn else []
+            if not by_conn:
+                time.sleep(self.poll_interval)
+            with self._lock:
+                for conn in ready:
+                    worker = by_conn[conn]
+                    if worker not in self._workers:
+                        continue
+                    try:
+                        job_id, ok, payload = conn.recv()
+                    except (EOFError, OSError):
+                        # Died: handled by _check_workers once the process is gone
+                        continue
+                    self._finish(worker, job_id, ok, payload)
+                for worker in self._retired:
+                    if not worker.process.is_alive():
+                        worker.process.join()
+                        worker.conn.close()
+                self._retired = [worker for worker in self._retired if worker.process.is_alive()]
+                self._check_workers()
+                self._assign()
@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Optional
+
+from devops_support.analysis.anomaly import ANOMALY_BUCKET_MINUTES, AnomalyDetector, format_anomalies
+from devops_support.analysis.context import ContextBudget, DEFAULT_TOKEN_BUDGET
+from devops_support.analysis.health import HealthAggregator, format_health
+
+# Processes computing the per-app health summaries / anomaly pre-passes (1: in this process).
+FLEET_REPORT_WORKERS = int(os.getenv("FLEET_REPORT_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Narrative kickoffs (LLM calls) for degraded apps running at the same time.
+FLEET_NARRATIVE_CONCURRENCY = int(os.getenv("FLEET_NARRATIVE_CONCURRENCY", "2"))
+
+_SOURCES = ("datadog", "splunk")
+# Anomaly buckets per source: the Splunk logs come in a few entries per app and day (as in SplunkCrew)
+_BUCKET_MINUTES = {"datadog": ANOMALY_BUCKET_MINUTES, "splunk": 24 * 60}
+
+
+# Directory the narrative of each degraded app is written to (one file per app).
+FLEET_REPORT_DIR = os.getenv("FLEET_REPORT_DIR", "fleet_reports")
+
+# What the {context} input of a narrative holds
+_NARRATIVE_CONTEXT = ("Health summary, statistical anomalies and deduplicated log templates of this application "
+                      "from {source}")
+
+
+def assess_app(source: str, app: str, entries: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Health summary and anomaly pre-pass of one app. Top-level so that it can run in a worker
+    process: both are CPU-bound pure-Python / NumPy loops over the entries.
+    """
+    detector = AnomalyDetector(bucket_minutes=_BUCKET_MINUTES[source])
+    detector.update(entries)
+    anomalies = detector.report([app])
+    health = HealthAggregator(bucket_minutes=24 * 60).summarize(entries)
+    return {
+        "app": app,
+        "entries": len(entries),
+        "status": anomalies["apps"][app]["status"],
+        "healthy": anomalies["apps"][app]["healthy"],
+        "health": health,
+        "anomalies": anomalies,
+    }
+
+
+def _get_api(source: str):
+    if source == "datadog":
+        from devops_support.data.datadog_api import DatadogApi
+        return DatadogApi()
+    from devops_support.data.splunk_api import SplunkApi
+    return SplunkApi()
+
+
+class FleetHealthReport:
+    """
+    Batch health report over many applications (e.g. a morning report across the estate).
+
+    The data of every application is fetched in one bulk pass over the log store
+    (`get_logs_many`), then the health summary and the statistical anomaly pre-pass of each
+    application are computed in parallel in worker processes (the assessment is CPU-bound Python,
+    threads would only take turns on the GIL). Only the degraded applications (anomalies found) are
+    handed to the LLM (one DiagnosticCrew kickoff each) for a narrative, so the cost of a report
+    grows with the number of unhealthy applications, not with the size of the fleet.
+    """
+
+    def __init__(self, source: str = "datadog", days: int = 1, api=None, max_workers: int = FLEET_REPORT_WORKERS,
+                 narrative_concurrency: int = FLEET_NARRATIVE_CONCURRENCY, max_tokens: int = DEFAULT_TOKEN_BUDGET):
+        """
+        :param source: "datadog" or "splunk".
+        :param days: Number of days of data to assess.
+        :param api: DatadogApi / SplunkApi to read from (default: a new one for `source`).
+        :param max_workers: Processes computing the per-app summaries (1: in this process).
+        :param narrative_concurrency: Narrative kickoffs running at the same time.
+        :param max_tokens: Prompt budget of each degraded app's narrative context.
+        """
+        if source not in _SOURCES:
+            raise ValueError(f"Unknown source {source!r}, expected one of {', '.join(_SOURCES)}")
+        self.source = source
+        self.days = days
+        self.api = api if api is not None else _get_api(source)
+        self.max_workers = max(1, max_workers)
+        self.narrative_concurrency = max(1, narrative_concurrency)
+        self.max_tokens = max_tokens
+
+    def fetch(self, apps: Optional[list[str]] = None) -> dict[str, list[dict[str, Any]]]:
+        """Entries of every app (None: all apps known to the source), in one bulk pass."""
+        return self.api.get_logs_many(apps, self.days)
+
+    def assess(self, app: str, entries: list[dict[str, Any]]) -> dict[str, Any]:
+        """Health summary and anomaly pre-pass of one app (see assess_app)."""
+        return assess_app(self.source, app, entries)
+
+    def assess_all(self, data: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+        """Assess every app of `data`; returns {app: assessment, or the exception it failed with}."""
+        apps = [app for app, entries in data.items() if entries]
+        results: dict[str, Any] = {}
+        workers = min(self.max_workers, len(apps))
+        if workers <= 1:
+            for app in apps:
+                try:
+                    results[app] = self.assess(app, data[app])
+                except Exception as e:
+                    results[app] = e
+        else:
+            # spawn, not fork: the parent may hold threads and locks (shared stores, API server)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = {app: pool.submit(assess_app, self.source, app, data[app]) for app in apps}
+                for app, future in futures.items():
+                    try:
+                        results[app] = future.result()
+                    except Exception as e:
+                        results[app] = e
+        # Nothing to assess: no data, which is not the same as healthy
+        for app, entries in data.items():
+            if not entries:
+                results[app] = self.assess(app, entries)
+        return results
+
+    def narrate(self, assessment: dict[str, Any], entries: list[dict[str, Any]]) -> str:
+        """LLM narrative of a degraded app, from its health summary, anomalies and budgeted logs."""
+        from devops_support.agents.diagnostic_agent import DiagnosticCrew
+
+        app = assessment["app"]
+        preamble = f"{format_health(assessment['health'])}\n{format_anomalies(assessment['anomalies'])}"
+        context = ContextBudget(self.max_tokens).build(entries, preamble=preamble)
+        query = (f"{app} was flagged as degraded by the {self.source} health checks of the last {self.days} days. "
+                 f"Explain the anomalies, their likely cause and the next steps.")
+        # One file per app: narratives run concurrently
+        os.makedirs(FLEET_REPORT_DIR, exist_ok=True)
+        file_name = re.sub(r"[^\w.-]", "_", f"{self.source}_{app}")
+        output_file = os.path.join(FLEET_REPORT_DIR, f"{file_name}.md")
+        crew = DiagnosticCrew(context_description=_NARRATIVE_CONTEXT.format(source=self.source.capitalize()),
+                              output_file=output_file)
+        return crew.crew().kickoff(inputs={"query": query, "context": context}).raw
+
+    def run(self, apps: Optional[list[str]] = None, narrate: bool = True) -> dict[str, Any]:
+        """
+        Assess `apps` (None: every app) and narrate the degraded ones.
+
+        :param narrate: Ask the LLM for a narrative of each degraded app (False: statistics only).
+        :return: {"source", "days", "apps": {app: assessment (+ "narrative")}, "healthy": [...],
+                  "degraded": [...], "no_data": [...], "errors": {app: message}}
+        """
+        data = self.fetch(apps)
+        report = {"source": self.source, "days": self.days, "apps": {}, "healthy": [], "degraded": [],
+                  "no_data": [], "errors": {}}
+        for app, assessment in self.assess_all(data).items():
+            if isinstance(assessment, Exception):
+                print(f"Assessing {app} failed: {assessment}")
+                report["errors"][app] = str(assessment)
+                continue
+            report["apps"][app] = assessment
+            report[assessment["status"]].append(app)
+
+        if narrate and report["degraded"]:
+            with ThreadPoolExecutor(max_workers=self.narrative_concurrency, thread_name_prefix="fleet-narrate") as pool:
+                futures = {app: pool.submit(self.narrate, report["apps"][app], data[app]) for app in report["degraded"]}
+                for app, future in futures.items():
+                    try:
+                        report["apps"][app]["narrative"] = future.result()
+                    except Exception as e:
+                        print(f"Narrative for {app} failed: {e}")
+                        report["errors"][app] = str(e)
+        return report
+
+
+def format_fleet_report(report: dict[str, Any]) -> str:
+    """Render a `FleetHealthReport.run` result as text: degraded apps first, then the healthy ones."""
+    lines = [f"Fleet health report ({report['source']}, last {report['days']} days): "
+             f"{len(report['degraded'])} degraded, {len(report['healthy'])} healthy, "
+             f"{len(report['no_data'])} without data, {len(report['errors'])} errors"]
+    for app in report["degraded"]:
+        assessment = report["apps"][app]
+        lines.append("")
+        lines.append(format_anomalies(assessment["anomalies"]))
+        if assessment.get("narrative"):
+            lines.append(assessment["narrative"])
+    if report["healthy"]:
+        lines.append("")
+        lines.append("Healthy: " + ", ".join(f"{app} ({report['apps'][app]['entries']} entries)"
+                                              for app in report["healthy"]))
+    if report["no_data"]:
+        lines.append("No data (not checked): " + ", ".join(report["no_data"]))
+    for app, error in report["errors"].items():
+        lines.append(f"Error for {app}: {error}")
+    return "\n".join(lines)
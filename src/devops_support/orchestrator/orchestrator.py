@@ -1,46 +1,258 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from devops_support.agents.argocd_agent import ArgoCDCrew
+from devops_support.agents.argocd_agent import ArgoCDCrew, build_query_tool
+from devops_support.agents.diagnostic_agent import DiagnosticCrew
+from devops_support.backends import configure_llama_index
+from devops_support.analysis.context import ContextBudget, DEFAULT_TOKEN_BUDGET
+from devops_support.analysis.health import format_health, summarize_health
+from devops_support.analysis.timeline import merge_timeline
+from devops_support.data.datadog_api import DatadogApi
+from devops_support.data.splunk_api import SplunkApi
 from devops_support.knowledge.ingest import ArgoWebReader, WebReader
 from devops_support.knowledge.query import QueryEngine
-from devops_support.knowledge.vector_store import VectorStore
-from llama_index.core import Settings
-from llama_index.llms.ollama import Ollama
-from llama_index.embeddings.ollama import OllamaEmbedding
+from devops_support.knowledge.vector_store import DEFAULT_PERSIST_DIR, VectorStore
+from devops_support.response_cache import data_fingerprint
+from devops_support.session_memory import DEFAULT_SESSION
+from devops_support.streaming import CrewStream
+
+
+class CrewsBusy(Exception):
+    """Raised when no ArgoCD crew became free within the checkout timeout."""
 
 
 class Orchestator:
-    def __init__(self):
-        Settings.llm = Ollama(model="phi:latest")
-        Settings.embed_model = OllamaEmbedding(model_name="phi:latest")
+    """
+    Long-lived service object answering queries from one warm state.
+
+    The vector store, QueryEngine and the LlamaIndexTool wrapping it are built once (lazily, on the
+    first query or through `warm_up`) and shared by every query. Crews are kept in a small pool of
+    warm ArgoCDCrew instances, one per concurrent query, each receiving the query tool through its
+    constructor instead of a class attribute.
+    """
+
+    def __init__(self, persist_dir: str = DEFAULT_PERSIST_DIR, refresh_docs: bool = False,
+                 max_concurrency: int = 1, read_only: bool = False):
+        """
+        :param persist_dir: Directory of the persistent Chroma database holding the ArgoCD index.
+        :param refresh_docs: Re-crawl the documentation even if the index already has content.
+                             Only new or changed chunks are embedded either way.
+        :param max_concurrency: Number of ArgoCD crews that may run at the same time.
+        :param read_only: Only query the existing index, never crawl or ingest (e.g. in crew pool
+                          workers, next to other processes using the same persist_dir).
+        """
+        if read_only and refresh_docs:
+            raise ValueError("A read-only orchestrator cannot refresh the documentation")
+        self.persist_dir = persist_dir
+        self.refresh_docs = refresh_docs
+        self.read_only = read_only
+        # LLM and embedding backends come from the LLM_BACKEND / EMBED_BACKEND configuration
+        configure_llama_index()
+
+        self._state_lock = threading.RLock()
+        self._vector_store = None
+        self._query_engine = None
+        self._query_tool = None
+        self._docs_fingerprint = None
+        # Idle warm crews; the semaphore bounds how many are in use at once
+        self._idle_crews: list = []
+        self.max_concurrency = max_concurrency
+        self._crew_slots = threading.BoundedSemaphore(max_concurrency)
+
+    def warm_up(self):
+        """Build the query engine, its tool and one crew ahead of the first query."""
+        self._release_crew(self._checkout_crew())
 
     def run(self, query: str):
         """
         Run the orchestrator.
         """
         return self.run_argocd(query)
-    
-    def run_argocd(self, query: str):
+
+    def get_vector_store(self) -> VectorStore:
+        with self._state_lock:
+            if self._vector_store is None:
+                self._vector_store = VectorStore("argocd_vector_store", persist_dir=self.persist_dir)
+            return self._vector_store
+
+    def get_query_engine(self):
+        """Return the shared query engine, building it on first use."""
+        with self._state_lock:
+            if self._query_engine is None:
+                self._query_engine, self._query_tool = self._build_query_engine()
+            return self._query_engine
+
+    def get_query_tool(self):
+        self.get_query_engine()
+        return self._query_tool
+
+    def docs_fingerprint(self) -> str:
         """
-        Run the argocd crew.
-        """      
-        try:
-            
-            # Instantiate your WebReader and vector store object.
+        Fingerprint of the indexed documentation (response cache key). Chunk ids are the SHA-256
+        of their content, so the sorted ids change exactly when the indexed content does.
+        """
+        with self._state_lock:
+            if self._docs_fingerprint is None:
+                self.get_query_engine()
+                ids = self.get_vector_store().get_collection().get(include=[])["ids"]
+                self._docs_fingerprint = data_fingerprint(sorted(ids))
+            return self._docs_fingerprint
+
+    def _build_query_engine(self):
+        # Open the persistent vector store; only crawl when it is empty or a refresh is requested.
+        vector_store = self._vector_store or VectorStore("argocd_vector_store", persist_dir=self.persist_dir)
+        self._vector_store = vector_store
+        self._docs_fingerprint = None
+        docs_reader = None
+        if self.read_only:
+            if vector_store.count() == 0:
+                raise RuntimeError(f"The ArgoCD index in {self.persist_dir} is empty: build it first "
+                                   f"(e.g. Orchestator().build_index()) before opening it read-only")
+        elif self.refresh_docs or vector_store.count() == 0:
             reader_obj = ArgoWebReader()
             print(f"Reader object created. {reader_obj}")
             docs_reader = reader_obj.get_documents()
-            vector_store = VectorStore("argocd_vector_store")
-            # Create and initialize the QueryEngine.
-            query_engine_instance = QueryEngine(vector_store, docs_reader)
-            ArgoCDCrew.query_engine = query_engine_instance.get_query_engine()
+        # Create and initialize the QueryEngine.
+        query_engine = QueryEngine(vector_store, docs_reader).get_query_engine()
+        return query_engine, build_query_tool(query_engine)
+
+    def build_index(self):
+        """Crawl and ingest the documentation unless the index already has content (no crew is built)."""
+        self.get_query_engine()
+
+    def refresh(self):
+        """Re-crawl the documentation, ingest what changed and swap in a fresh query engine."""
+        if self.read_only:
+            raise RuntimeError("A read-only orchestrator cannot refresh the documentation")
+        with self._state_lock:
+            refresh_docs = self.refresh_docs
+            self.refresh_docs = True
+            try:
+                self._query_engine, self._query_tool = self._build_query_engine()
+            finally:
+                self.refresh_docs = refresh_docs
+            # Crews hold the previous tool; let them be rebuilt on next checkout
+            self._idle_crews = []
+
+    def _checkout_crew(self, timeout: float = None, session_id: str = DEFAULT_SESSION) -> ArgoCDCrew:
+        """
+        Take a warm crew from the pool, switched to `session_id`.
+
+        :param timeout: Seconds to wait for a free crew (None: wait as long as it takes, 0: don't wait).
+        :raises CrewsBusy: If every crew is still in use after `timeout`.
+        """
+        if not self._crew_slots.acquire(timeout=timeout):
+            raise CrewsBusy(f"All {self.max_concurrency} ArgoCD crews are busy")
+        try:
+            query_tool = self.get_query_tool()
+            with self._state_lock:
+                crew_instance = self._idle_crews.pop() if self._idle_crews else None
+            if crew_instance is not None:
+                crew_instance.use_session(session_id)
+                return crew_instance
+            return ArgoCDCrew(query_tool=query_tool, session_id=session_id)
+        except Exception:
+            self._crew_slots.release()
+            raise
 
-            # Instantiate your crew
-            argocd_crew_instance = ArgoCDCrew()
-            crew = argocd_crew_instance.crew()
+    def _release_crew(self, crew_instance: ArgoCDCrew):
+        with self._state_lock:
+            if crew_instance.query_tool is self._query_tool:
+                self._idle_crews.append(crew_instance)
+        self._crew_slots.release()
 
-            # Pass the query input when starting the crew
-            return crew.kickoff(inputs={"query": query})
+    def run_argocd(self, query: str, session_id: str = DEFAULT_SESSION):
+        """
+        Run the argocd crew.
+
+        :param session_id: Session the agent records the query and its answer under.
+        """
+        try:
+            argocd_crew_instance = self._checkout_crew(session_id=session_id)
+            try:
+                crew = argocd_crew_instance.crew()
+
+                # Pass the query input when starting the crew
+                return crew.kickoff(inputs={"query": query})
+            finally:
+                self._release_crew(argocd_crew_instance)
         except Exception as e:
             raise Exception(f"An error occurred while running the crew: {e}")
 
+    def stream_argocd(self, query: str, tokens: bool = True, timeout: float = None, submit=None,
+                      checkout_timeout: float = None, session_id: str = DEFAULT_SESSION) -> CrewStream:
+        """
+        Start the argocd crew and return a CrewStream yielding task-level and token-level events.
+
+        The warm crew goes back to the pool when the kickoff finishes, even if the consumer stops
+        iterating early.
+
+        :param checkout_timeout: Seconds to wait for a free crew (None: no limit); CrewsBusy after that.
+        :param session_id: Session the agent records the query and its answer under.
+        """
+        argocd_crew_instance = self._checkout_crew(checkout_timeout, session_id)
+        try:
+            stream = CrewStream(argocd_crew_instance.crew(), {"query": query}, tokens=tokens, timeout=timeout,
+                                submit=submit, on_done=lambda: self._release_crew(argocd_crew_instance))
+        except Exception:
+            self._release_crew(argocd_crew_instance)
+            raise
+        return stream.start()
+
+    def gather_incident(self, query: str, app_name: str, days: int = 1, splunk_app: str = None,
+                        datadog_app: str = None) -> dict:
+        """
+        Fetch Splunk logs, Datadog logs/events and the ArgoCD documentation answer concurrently.
+
+        A failing source does not fail the others: its error is reported under "errors" and the
+        remaining sources are still merged.
+
+        :param query: Incident description, also used as the ArgoCD documentation query.
+        :param app_name: Application name, used for both Splunk and Datadog unless overridden.
+        :param days: Number of days of logs to fetch.
+        :return: {"sources": {"splunk": [...], "datadog": [...]}, "timeline": [...], "argocd": str,
+                  "errors": {source: message}}
+        """
+        fetchers = {
+            "splunk": lambda: SplunkApi().get_logs(splunk_app or app_name, days),
+            "datadog": lambda: DatadogApi().get_logs(datadog_app or app_name, days),
+            "argocd": lambda: str(self.get_query_engine().query(query)),
+        }
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="incident-fetch") as pool:
+            futures = {source: pool.submit(fetch) for source, fetch in fetchers.items()}
+            for source, future in futures.items():
+                try:
+                    results[source] = future.result()
+                except Exception as e:
+                    print(f"Fetching {source} data failed: {e}")
+                    errors[source] = str(e)
+        sources = {source: results.get(source) or [] for source in ("splunk", "datadog")}
+        return {"sources": sources, "timeline": merge_timeline(sources), "argocd": results.get("argocd", ""),
+                "errors": errors}
+
+    def build_incident_context(self, incident: dict, max_tokens: int = DEFAULT_TOKEN_BUDGET) -> str:
+        """Render a gathered incident (see gather_incident) as one budgeted prompt context."""
+        preamble = []
+        if incident["argocd"]:
+            preamble.append(f"ArgoCD documentation:\n{incident['argocd']}")
+        if incident["timeline"]:
+            # Health is computed on the raw entries, which still carry the Datadog metrics
+            raw = incident["sources"]["splunk"] + incident["sources"]["datadog"]
+            preamble.append(format_health(summarize_health(raw, bucket_minutes=24 * 60)))
+        for source, error in incident["errors"].items():
+            preamble.append(f"Note: {source} data unavailable ({error})")
+        return ContextBudget(max_tokens).build(incident["timeline"], preamble="\n\n".join(preamble) or None)
 
+    def run_incident(self, query: str, app_name: str, days: int = 1, splunk_app: str = None,
+                     datadog_app: str = None, max_tokens: int = DEFAULT_TOKEN_BUDGET):
+        """
+        Fan out to Splunk, Datadog and ArgoCD at once, merge the results into a single timeline
+        and run one reasoning pass (DiagnosticCrew) over it.
+        """
+        try:
+            incident = self.gather_incident(query, app_name, days, splunk_app=splunk_app, datadog_app=datadog_app)
+            context = self.build_incident_context(incident, max_tokens=max_tokens)
+            return DiagnosticCrew().crew().kickoff(inputs={"query": query, "context": context})
+        except Exception as e:
+            raise Exception(f"An error occurred while running the crew: {e}")
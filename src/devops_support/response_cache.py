@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+# Response cache configuration. RESPONSE_CACHE_BACKEND: "memory", "disk" or "off".
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", ".cache/responses.sqlite")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "900"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+# Cosine similarity above which a differently worded query reuses a cached answer. 0 (default):
+# exact matches only. Near-duplicate matching can return the answer of a query differing in one
+# decisive word ("EKS" / "AKS", a negation), so it needs a semantic embedding model
+# (EMBED_BACKEND=ollama) and a high threshold; it stays off with the bag-of-words hashing embedding.
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0"))
+
+_PUNCTUATION = re.compile(r"[^\w\s-]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a query."""
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+def data_fingerprint(data: Any, *params: Any) -> str:
+    """
+    Fingerprint of the data a crew would analyze (plus any parameters shaping its prompt).
+    An answer is only reused while the fingerprint is unchanged.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([data, params], sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CacheEntry:
+    def __init__(self, namespace: str, query: str, fingerprint: str, value: str, created: float,
+                 embedding: Optional[np.ndarray] = None):
+        self.namespace = namespace
+        self.query = query
+        self.fingerprint = fingerprint
+        self.value = value
+        self.created = created
+        self.embedding = embedding
+
+
+class MemoryBackend:
+    """In-process LRU map of cache entries."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def candidates(self, namespace: str, fingerprint: str) -> list[tuple[str, CacheEntry]]:
+        return [(key, entry) for key, entry in self._entries.items()
+                if entry.namespace == namespace and entry.fingerprint == fingerprint and entry.embedding is not None]
+
+    def expire(self, before: float):
+        for key in [key for key, entry in self._entries.items() if entry.created < before]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend:
+    """
+    SQLite-backed cache entries, surviving restarts and shared between processes on one host.
+    Recency is tracked in a last_access column for LRU eviction.
+    """
+
+    def __init__(self, path: str = RESPONSE_CACHE_PATH, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, namespace TEXT, query TEXT, "
+            "fingerprint TEXT, value TEXT, created REAL, last_access REAL, embedding BLOB)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (namespace, fingerprint)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_access ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def _entry(row) -> CacheEntry:
+        namespace, query, fingerprint, value, created, embedding = row
+        vector = np.frombuffer(embedding, dtype=np.float32) if embedding is not None else None
+        return CacheEntry(namespace, query, fingerprint, value, created, vector)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute("SELECT namespace, query, fingerprint, value, created, embedding FROM responses "
+                                 "WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return self._entry(row)
+
+    def put(self, key: str, entry: CacheEntry):
+        embedding = entry.embedding.astype(np.float32).tobytes() if entry.embedding is not None else None
+        self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (key, entry.namespace, entry.query, entry.fingerprint, entry.value, entry.created,
+                            time.time(), embedding))
+        self._conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                           "ORDER BY last_access DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+        self._conn.commit()
+
+    def delete(self, key: str):
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def candidates(self, namespace: str, fingerprint: str) -> list[tuple[str, CacheEntry]]:
+        rows = self._conn.execute("SELECT key, namespace, query, fingerprint, value, created, embedding "
+                                  "FROM responses WHERE namespace = ? AND fingerprint = ? AND embedding IS NOT NULL",
+                                  (namespace, fingerprint)).fetchall()
+        return [(row[0], self._entry(row[1:])) for row in rows]
+
+    def expire(self, before: float):
+        self._conn.execute("DELETE FROM responses WHERE created < ?", (before,))
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Cache of crew answers keyed on (namespace, normalized query, data fingerprint).
+
+    Entries expire `ttl` seconds after they were computed and the least recently used ones are
+    evicted past `max_entries`. With a semantic embedding model and `similarity` > 0, a query
+    missing the exact key may reuse the answer of a near-duplicate query (cosine similarity >=
+    `similarity`) asked against the same data fingerprint. Similar is not the same: a query
+    differing in one decisive word can get the other query's answer, hence off by default.
+    """
+
+    def __init__(self, backend=None, ttl: float = RESPONSE_CACHE_TTL, embed_model=None,
+                 similarity: float = RESPONSE_CACHE_SIMILARITY):
+        """
+        :param backend: MemoryBackend (default) or DiskBackend.
+        :param ttl: Seconds an answer stays valid.
+        :param embed_model: llama_index embedding model used for near-duplicate matching (optional).
+        :param similarity: Minimum cosine similarity of a near-duplicate query.
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.embed_model = embed_model
+        self.similarity = similarity
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, query: str, fingerprint: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{normalize_query(query)}\0{fingerprint}".encode("utf-8")).hexdigest()
+
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        if self.embed_model is None or self.similarity <= 0:
+            return None
+        vector = np.asarray(self.embed_model.get_query_embedding(normalize_query(query)), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, namespace: str, query: str, fingerprint: str) -> Optional[str]:
+        """Return the cached answer for the query, or None."""
+        now = time.time()
+        key = self.key(namespace, query, fingerprint)
+        with self._lock:
+            entry = self.backend.get(key)
+            if entry is not None and now - entry.created > self.ttl:
+                self.backend.delete(key)
+                entry = None
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+        # The embedding model call (possibly a remote one) runs without the lock
+        vector = self._embed(query)
+        with self._lock:
+            entry = self._similar(namespace, fingerprint, vector, now) if vector is not None else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.value
+
+    def _similar(self, namespace: str, fingerprint: str, vector: np.ndarray, now: float) -> Optional[CacheEntry]:
+        best, best_score = None, self.similarity
+        for key, entry in self.backend.candidates(namespace, fingerprint):
+            if now - entry.created > self.ttl:
+                continue
+            score = float(np.dot(vector, entry.embedding))
+            if score >= best_score:
+                best, best_score = (key, entry), score
+        if best is None:
+            return None
+        # Refresh its recency
+        self.backend.get(best[0])
+        return best[1]
+
+    def put(self, namespace: str, query: str, fingerprint: str, value: str):
+        entry = CacheEntry(namespace, query, fingerprint, value, time.time(), self._embed(query))
+        with self._lock:
+            self.backend.put(self.key(namespace, query, fingerprint), entry)
+
+    def get_or_compute(self, namespace: str, query: str, fingerprint: str,
+                       compute: Callable[[], str]) -> tuple[str, bool]:
+        """
+        Return (answer, cached): the cached answer if there is one, else `compute()` (then cached).
+        """
+        value = self.get(namespace, query, fingerprint)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(namespace, query, fingerprint, value)
+        return value, False
+
+    def expire(self):
+        """Drop every expired entry (lookups already ignore them)."""
+        with self._lock:
+            self.backend.expire(time.time() - self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self.backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self.backend), "hits": self.hits, "misses": self.misses}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def _similarity_model():
+    """Embedding model of the near-duplicate matching, None when it is off (imported only then)."""
+    if RESPONSE_CACHE_SIMILARITY <= 0:
+        return None
+    from devops_support.backends import EMBED_BACKEND, get_embed_model
+    if EMBED_BACKEND == "hashing":
+        # Bag-of-words vectors can't tell "... on EKS" from "... on AKS"
+        print("RESPONSE_CACHE_SIMILARITY ignored: near-duplicate matching needs a semantic embedding model, "
+              "not EMBED_BACKEND=hashing. Only exact matches are cached.")
+        return None
+    return get_embed_model()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide response cache built from the RESPONSE_CACHE_* configuration, or None when
+    RESPONSE_CACHE_BACKEND=off.
+    """
+    global _shared_cache
+    if RESPONSE_CACHE_BACKEND == "off":
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                if RESPONSE_CACHE_BACKEND == "disk":
+                    backend = DiskBackend()
+                elif RESPONSE_CACHE_BACKEND == "memory":
+                    backend = MemoryBackend()
+                else:
+                    raise ValueError(f"Unknown response cache backend '{RESPONSE_CACHE_BACKEND}'. "
+                                     "Expected one of: memory, disk, off")
+                _shared_cache = ResponseCache(backend, embed_model=_similarity_model())
+    return _shared_cache
@@ -0,0 +1,272 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional
+
+# Session memory configuration. SESSION_MEMORY_BACKEND: "memory" or "sqlite".
+SESSION_MEMORY_BACKEND = os.getenv("SESSION_MEMORY_BACKEND", "memory")
+SESSION_MEMORY_PATH = os.getenv("SESSION_MEMORY_PATH", ".cache/sessions.sqlite")
+SESSION_MAX_TURNS = int(os.getenv("SESSION_MAX_TURNS", "50"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "3600"))
+
+DEFAULT_SESSION = "default"
+
+
+class BatchWriter:
+    """
+    Background writer: items submitted from any thread are handed to `sink` in batches by one
+    daemon thread, at most every `interval` seconds or once `max_batch` items are pending.
+    Callers never wait on I/O; `flush` blocks until everything submitted so far is written.
+    """
+
+    def __init__(self, sink: Callable[[list], None], interval: float = 0.5, max_batch: int = 256,
+                 name: str = "batch-writer"):
+        self.sink = sink
+        self.interval = interval
+        self.max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, item: Any):
+        self._queue.put(item)
+
+    def flush(self, timeout: Optional[float] = 10.0):
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch, waiters = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if waiters or len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.sink(batch)
+                except Exception as e:
+                    print(f"Batch write error: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+
+class LogFileSink:
+    """Appends a batch of text records to a file with a single open/write."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, batch: list[str]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(batch))
+
+
+_log_writers: dict[str, BatchWriter] = {}
+_log_writers_lock = threading.Lock()
+
+
+def get_log_writer(path: str) -> BatchWriter:
+    """Shared asynchronous writer appending to `path` (one per file per process)."""
+    path = os.path.abspath(path)
+    with _log_writers_lock:
+        writer = _log_writers.get(path)
+        if writer is None:
+            writer = _log_writers[path] = BatchWriter(LogFileSink(path), name=f"log-writer:{os.path.basename(path)}")
+        return writer
+
+
+class SqliteSessionStore:
+    """
+    SQLite persistence of sessions: their (capped) turns and key/value state.
+    Writes go through a BatchWriter, so callers don't block on disk.
+    """
+
+    def __init__(self, path: str = SESSION_MEMORY_PATH, max_turns: int = SESSION_MAX_TURNS):
+        self.path = path
+        self.max_turns = max_turns
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS turns (session_id TEXT, seq INTEGER, payload TEXT, "
+                               "PRIMARY KEY (session_id, seq))")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS state (session_id TEXT, key TEXT, value TEXT, "
+                               "PRIMARY KEY (session_id, key))")
+            self._conn.commit()
+        self.writer = BatchWriter(self._write, name="session-store")
+
+    def _write(self, batch: list[tuple]):
+        with self._lock:
+            for op, session_id, *args in batch:
+                if op == "turn":
+                    seq, payload = args
+                    self._conn.execute("INSERT OR REPLACE INTO turns VALUES (?, ?, ?)", (session_id, seq, payload))
+                    self._conn.execute("DELETE FROM turns WHERE session_id = ? AND seq <= ?",
+                                       (session_id, seq - self.max_turns))
+                elif op == "state":
+                    key, value = args
+                    self._conn.execute("INSERT OR REPLACE INTO state VALUES (?, ?, ?)", (session_id, key, value))
+                elif op == "clear":
+                    self._conn.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+                    self._conn.execute("DELETE FROM state WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def save_turn(self, session_id: str, seq: int, turn: dict):
+        self.writer.submit(("turn", session_id, seq, json.dumps(turn, default=str)))
+
+    def save_state(self, session_id: str, key: str, value: Any):
+        self.writer.submit(("state", session_id, key, json.dumps(value, default=str)))
+
+    def clear(self, session_id: str):
+        self.writer.submit(("clear", session_id))
+
+    def load(self, session_id: str) -> tuple[list[tuple[int, dict]], dict[str, Any]]:
+        """Turns (seq, turn) in order and state of a session, including writes still pending."""
+        self.writer.flush()
+        with self._lock:
+            turns = self._conn.execute("SELECT seq, payload FROM turns WHERE session_id = ? ORDER BY seq DESC "
+                                       "LIMIT ?", (session_id, self.max_turns)).fetchall()
+            state = self._conn.execute("SELECT key, value FROM state WHERE session_id = ?", (session_id,)).fetchall()
+        return ([(seq, json.loads(payload)) for seq, payload in reversed(turns)],
+                {key: json.loads(value) for key, value in state})
+
+
+class Session:
+    def __init__(self, max_turns: int):
+        self.turns: deque = deque(maxlen=max_turns)
+        self.state: dict[str, Any] = {}
+        self.next_seq = 0
+        self.last_access = time.monotonic()
+
+
+class SessionMemory:
+    """
+    Bounded conversation memory shared by the agents.
+
+    Each session keeps at most `max_turns` turns (oldest dropped first) plus a small key/value
+    state. At most `max_sessions` sessions stay in memory; the least recently used, and those idle
+    for more than `idle_ttl` seconds, are evicted. With a SqliteSessionStore evicted sessions are
+    not lost: they are reloaded from disk on their next access.
+    """
+
+    def __init__(self, max_turns: int = SESSION_MAX_TURNS, max_sessions: int = SESSION_MAX_SESSIONS,
+                 idle_ttl: Optional[float] = SESSION_IDLE_TTL, store: Optional[SqliteSessionStore] = None):
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.store = store
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _session(self, session_id: str) -> Session:
+        """
+        The in-memory session, loaded from the store on first access. The load (which waits for the
+        pending writes) runs without the lock, so a new session's disk I/O never blocks the others.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_access = time.monotonic()
+                return session
+        loaded = Session(self.max_turns)
+        if self.store is not None:
+            turns, loaded.state = self.store.load(session_id)
+            loaded.turns.extend(turn for _, turn in turns)
+            loaded.next_seq = turns[-1][0] + 1 if turns else 0
+        with self._lock:
+            # Another thread may have loaded it meanwhile: keep the first one
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = loaded
+                self._evict()
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_access = time.monotonic()
+            return session
+
+    def _evict(self):
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        if self.idle_ttl:
+            cutoff = time.monotonic() - self.idle_ttl
+            # Sessions are kept in access order: the idle ones are at the front
+            while self._sessions and next(iter(self._sessions.values())).last_access < cutoff:
+                self._sessions.popitem(last=False)
+
+    def append(self, session_id: str, turn: dict):
+        """Record one turn (e.g. {"query": ..., "answer": ...}) of a session."""
+        session = self._session(session_id)
+        with self._lock:
+            session.turns.append(turn)
+            if self.store is not None:
+                self.store.save_turn(session_id, session.next_seq, turn)
+            session.next_seq += 1
+
+    def history(self, session_id: str) -> list[dict]:
+        session = self._session(session_id)
+        with self._lock:
+            return list(session.turns)
+
+    def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        session = self._session(session_id)
+        with self._lock:
+            return session.state.get(key, default)
+
+    def set(self, session_id: str, key: str, value: Any):
+        session = self._session(session_id)
+        with self._lock:
+            session.state[key] = value
+            if self.store is not None:
+                self.store.save_state(session_id, key, value)
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self.store is not None:
+                self.store.clear(session_id)
+
+    def __len__(self) -> int:
+        """Number of sessions currently held in memory."""
+        return len(self._sessions)
+
+
+_shared_memory = None
+_shared_memory_lock = threading.Lock()
+
+
+def get_session_memory() -> SessionMemory:
+    """Process-wide session memory built from the SESSION_* configuration."""
+    global _shared_memory
+    if _shared_memory is None:
+        with _shared_memory_lock:
+            if _shared_memory is None:
+                if SESSION_MEMORY_BACKEND == "sqlite":
+                    store = SqliteSessionStore()
+                elif SESSION_MEMORY_BACKEND == "memory":
+                    store = None
+                else:
+                    raise ValueError(f"Unknown session memory backend '{SESSION_MEMORY_BACKEND}'. "
+                                     "Expected one of: memory, sqlite")
+                _shared_memory = SessionMemory(store=store)
+    return _shared_memory
@@ -0,0 +1,183 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from crewai.utilities.events import (
+    LLMStreamChunkEvent,
+    TaskCompletedEvent,
+    TaskStartedEvent,
+    crewai_event_bus,
+)
+
+# Marks the end of a stream in the event queue.
+_DONE = object()
+
+
+class _StreamRouter:
+    """
+    Routes crewAI bus events to the CrewStream they belong to.
+
+    The bus is process-global, so one set of handlers is registered once and each event is
+    dispatched by the identity of its source: the task for task events, the agent's LLM for
+    token chunks. Concurrent streams therefore never see each other's output.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._streams: dict[int, "CrewStream"] = {}
+        self._registered = False
+
+    def _register_handlers(self):
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            self._dispatch(source, {
+                "event": "task_started",
+                "task": getattr(source, "name", None) or getattr(source, "description", "")[:80],
+                "agent": getattr(getattr(source, "agent", None), "role", None),
+            })
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            self._dispatch(source, {
+                "event": "task_completed",
+                "task": getattr(source, "name", None) or getattr(source, "description", "")[:80],
+                "agent": getattr(event.output, "agent", None),
+                "output": getattr(event.output, "raw", str(event.output)),
+            })
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_chunk(source, event):
+            self._dispatch(source, {"event": "token", "chunk": event.chunk})
+
+    def attach(self, stream: "CrewStream", sources: list[Any]):
+        with self._lock:
+            if not self._registered:
+                self._register_handlers()
+                self._registered = True
+            for source in sources:
+                self._streams[id(source)] = stream
+
+    def detach(self, stream: "CrewStream", sources: list[Any]):
+        with self._lock:
+            for source in sources:
+                # A pooled crew may already be attached to the next stream
+                if self._streams.get(id(source)) is stream:
+                    del self._streams[id(source)]
+
+    def _dispatch(self, source, event: dict):
+        stream = self._streams.get(id(source))
+        if stream is not None:
+            stream.put(event)
+
+
+_router = _StreamRouter()
+
+
+class CrewStream:
+    """
+    Runs a crew kickoff in the background and yields its progress incrementally.
+
+    Iterating the stream yields dict events as they happen:
+        {"event": "task_started", "task": ..., "agent": ...}
+        {"event": "token", "chunk": ...}                  (when token streaming is enabled)
+        {"event": "task_completed", "task": ..., "agent": ..., "output": ...}
+        {"event": "completed", "result": ...}  or  {"event": "error", "detail": ...}
+    """
+
+    def __init__(self, crew, inputs: dict, tokens: bool = True, timeout: Optional[float] = None,
+                 submit: Optional[Callable] = None, on_done: Optional[Callable[[], None]] = None):
+        """
+        :param crew: crewai.Crew to kick off.
+        :param inputs: Kickoff inputs.
+        :param tokens: Stream token-level output by switching the agents' LLMs to streaming mode.
+        :param timeout: Give up (with an "error" event) if nothing finished within this many seconds.
+        :param submit: Callable used to run the kickoff (e.g. a bounded executor's submit).
+                       Defaults to a dedicated daemon thread.
+        :param on_done: Called once the kickoff has finished (even if the consumer stopped early).
+        """
+        self.crew = crew
+        self.inputs = inputs
+        self.timeout = timeout
+        self.submit = submit
+        self.on_done = on_done
+        self._events: queue.Queue = queue.Queue()
+        self._started = False
+        self._sources = list(crew.tasks)
+        # (llm, stream flag before this stream switched it on): pooled crews get their LLMs back as they were
+        self._streamed_llms = []
+        for crew_agent in crew.agents:
+            llm = getattr(crew_agent, "llm", None)
+            if llm is None:
+                continue
+            if tokens and hasattr(llm, "stream"):
+                self._streamed_llms.append((llm, llm.stream))
+                llm.stream = True
+            self._sources.append(llm)
+
+    def put(self, event: dict):
+        self._events.put(event)
+
+    def _kickoff(self):
+        try:
+            result = self.crew.kickoff(inputs=self.inputs)
+            self.put({"event": "completed", "result": getattr(result, "raw", str(result))})
+        except Exception as e:
+            self.put({"event": "error", "detail": f"An error occurred while running the crew: {e}"})
+        finally:
+            # Here rather than in __iter__: runs exactly once, even if the consumer never iterates
+            _router.detach(self, self._sources)
+            self._restore_llms()
+            self._events.put(_DONE)
+            if self.on_done is not None:
+                self.on_done()
+
+    def _restore_llms(self):
+        for llm, stream in self._streamed_llms:
+            llm.stream = stream
+        self._streamed_llms = []
+
+    def start(self) -> "CrewStream":
+        """Start the kickoff. Raises whatever `submit` raises (e.g. when a pool is saturated)."""
+        if self._started:
+            return self
+        _router.attach(self, self._sources)
+        try:
+            if self.submit is not None:
+                self.submit(self._kickoff)
+            else:
+                threading.Thread(target=self._kickoff, name="crew-stream", daemon=True).start()
+        except Exception:
+            _router.detach(self, self._sources)
+            self._restore_llms()
+            if self.on_done is not None:
+                self.on_done()
+            raise
+        self._started = True
+        return self
+
+    def __iter__(self) -> Iterator[dict]:
+        self.start()
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                event = self._events.get(timeout=remaining)
+            except queue.Empty:
+                yield {"event": "error", "detail": f"Crew did not complete within {self.timeout} seconds"}
+                return
+            if event is _DONE:
+                return
+            yield event
+
+
+def stream_crew(crew, inputs: dict, tokens: bool = True, timeout: Optional[float] = None) -> Iterator[dict]:
+    """Generator over the progress events of `crew.kickoff(inputs=inputs)` (see CrewStream)."""
+    return iter(CrewStream(crew, inputs, tokens=tokens, timeout=timeout))
+
+
+def to_sse(events: Iterator[dict]) -> Iterator[str]:
+    """Encode stream events as Server-Sent Events."""
+    for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
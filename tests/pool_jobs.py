@@ -0,0 +1,25 @@
+"""Jobs for the CrewProcessPool tests: spawned workers import them by module name."""
+import os
+import time
+
+
+def echo(inputs: dict) -> dict:
+    return {"pid": os.getpid(), **inputs}
+
+
+def sleep(inputs: dict) -> str:
+    time.sleep(inputs.get("seconds", 60))
+    return "slept"
+
+
+def crash(inputs: dict):
+    os._exit(inputs.get("code", 3))
+
+
+def fail(inputs: dict):
+    raise ValueError(inputs.get("message", "bad input"))
+
+
+def mock_seed(inputs: dict) -> int:
+    from devops_support.data import seed
+    return seed.MOCK_DATA_SEED
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+from devops_support.analysis import anomaly
+from devops_support.analysis.anomaly import AnomalyDetector, detect_anomalies, format_anomalies, healthy_answer
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _log(hour: int, level: str = "INFO", app: str = "web", host: str = "host1", minute: int = 0, **fields) -> dict:
+    timestamp = (START + timedelta(hours=hour, minutes=minute)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return {"type": "log", "timestamp": timestamp, "level": level, "host": host, "message": "msg",
+            "tags": [f"app:{app}"], **fields}
+
+
+def _steady(hours: int, app: str = "web") -> list[dict]:
+    """Ten logs an hour, one of them an error: a 10% baseline error rate."""
+    return [_log(hour, "ERROR" if i == 0 else "INFO", app=app, minute=i)
+            for hour in range(hours) for i in range(10)]
+
+
+def test_steady_app_is_healthy():
+    report = detect_anomalies(_steady(12), ["web"])
+    assert report["apps"]["web"]["status"] == "healthy"
+    assert report["apps"]["web"]["healthy"] is True
+    assert report["apps"]["web"]["entries"] == 120
+    assert "healthy (120 entries, no anomaly)" in format_anomalies(report)
+
+
+def test_error_burst_is_flagged_against_the_baseline():
+    entries = _steady(12) + [_log(12, "ERROR", minute=i) for i in range(8)] + [_log(12, minute=9)]
+    report = detect_anomalies(entries, ["web"])
+    app = report["apps"]["web"]
+    assert app["status"] == "degraded" and not app["healthy"]
+    [burst] = app["anomalies"]
+    assert burst["metric"] == "error_rate" and burst["severity"] == "critical"
+    assert burst["detail"] == "8/9 errors"
+    assert app["hosts"] == ["host1"]
+    assert healthy_answer(report, "Datadog") is None
+
+
+def test_cpu_ceiling_and_event_burst():
+    entries = [_log(0, cpu=40), _log(1, cpu=99)]
+    entries += [{"type": "event", "timestamp": _log(2, minute=m)["timestamp"], "title": "Deployment failed",
+                 "host": "host1", "tags": ["app:web"]} for m in (0, 10)]
+    metrics = {a["metric"] for a in detect_anomalies(entries, ["web"])["apps"]["web"]["anomalies"]}
+    assert metrics == {"cpu", "event:Deployment failed"}
+
+
+def test_incremental_updates_match_one_pass():
+    entries = _steady(12) + [_log(12, "ERROR", minute=i) for i in range(8)] + [_log(13)]
+    detector = AnomalyDetector()
+    for start in range(0, len(entries), 7):
+        detector.update(entries[start:start + 7])
+    assert detector.report(["web"]) == detect_anomalies(entries, ["web"])
+
+
+def test_zero_entries_is_no_data_not_healthy():
+    report = detect_anomalies([], ["UnknownApp"])
+    app = report["apps"]["UnknownApp"]
+    assert app == {"status": "no_data", "healthy": False, "entries": 0, "anomalies": [], "hosts": [], "late": 0}
+    assert healthy_answer(report, "Splunk") is None
+    assert "no data" in format_anomalies(report)
+    assert detect_anomalies([]) == {"bucket_minutes": anomaly.ANOMALY_BUCKET_MINUTES, "apps": {}}
+    assert healthy_answer(detect_anomalies([]), "Splunk") is None
+
+
+def test_healthy_answer(monkeypatch):
+    report = detect_anomalies(_steady(12), ["web"])
+    answer = healthy_answer(report, "Datadog")
+    assert answer.startswith("web is healthy: no anomaly in 120 Datadog entries")
+    # One app without data is enough to run the crew
+    mixed = detect_anomalies(_steady(12), ["web", "UnknownApp"])
+    assert healthy_answer(mixed, "Datadog") is None
+    monkeypatch.setattr(anomaly, "SKIP_HEALTHY_APPS", False)
+    assert healthy_answer(report, "Datadog") is None
+
+
+def test_splunk_entries_and_late_entries():
+    entries = [{"timestamp": "2024-01-02T00:00:00Z", "level": "INFO", "application": "AuthService", "host": "h",
+                "message": "ok"},
+               {"timestamp": "2024-01-01T00:00:00Z", "level": "INFO", "application": "AuthService", "host": "h",
+                "message": "late"}]
+    app = detect_anomalies(entries, ["AuthService"], bucket_minutes=24 * 60)["apps"]["AuthService"]
+    assert app["status"] == "healthy"
+    assert (app["entries"], app["late"]) == (2, 1)
@@ -0,0 +1,97 @@
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from devops_support.knowledge.crawler import Crawler, PageCache
+
+LAST_MODIFIED = formatdate(0, usegmt=True)
+
+SITE = {
+    "/robots.txt": "User-agent: *\nDisallow: /docs/private/\n",
+    "/docs/": '<html><head><title>Home</title></head><body><p>Welcome</p>'
+              '<a href="a.html">A</a><a href="private/secret.html">Secret</a>'
+              '<a href="/blog/post.html">Blog</a><a href="logo.png">Logo</a></body></html>',
+    "/docs/a.html": '<html><body><p>Page A</p><a href="b.html">B</a></body></html>',
+    "/docs/b.html": '<html><body><p>Page B</p><a href="c.html">C</a></body></html>',
+    "/docs/c.html": "<html><body><p>Page C</p></body></html>",
+    "/docs/private/secret.html": "<html><body><p>Secret</p></body></html>",
+    "/blog/post.html": "<html><body><p>Blog post</p></body></html>",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        body = SITE.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        if self.headers.get("If-None-Match") == etag or self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain" if self.path.endswith(".txt") else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _paths(pages, base):
+    return [page.url[len(base):] for page in pages]
+
+
+def test_crawl_stays_in_scope_and_honours_robots(site):
+    server, base = site
+    pages = Crawler(f"{base}/docs/", max_depth=5, delay=0).crawl()
+    assert _paths(pages, base) == ["/docs/", "/docs/a.html", "/docs/b.html", "/docs/c.html"]
+    requested = [path for path, _ in server.requests]
+    assert "/docs/private/secret.html" not in requested
+    assert "/blog/post.html" not in requested
+    assert "/docs/logo.png" not in requested
+    assert pages[0].title == "Home"
+
+
+def test_crawl_depth_and_page_limits(site):
+    _, base = site
+    assert _paths(Crawler(f"{base}/docs/", max_depth=0, delay=0).crawl(), base) == ["/docs/"]
+    assert _paths(Crawler(f"{base}/docs/", max_depth=1, delay=0).crawl(), base) == ["/docs/", "/docs/a.html"]
+    assert len(Crawler(f"{base}/docs/", max_depth=5, max_pages=2, delay=0).crawl()) == 2
+
+
+def test_recrawl_revalidates_and_reuses_cache(site, tmp_path):
+    server, base = site
+    cache = PageCache(str(tmp_path))
+    first = Crawler(f"{base}/docs/", max_depth=5, delay=0, cache=cache)
+    first.crawl()
+    assert first.stats == {"fetched": 4, "not_modified": 0, "failed": 0}
+
+    server.requests.clear()
+    second = Crawler(f"{base}/docs/", max_depth=5, delay=0, cache=cache)
+    pages = second.crawl()
+    assert second.stats == {"fetched": 0, "not_modified": 4, "failed": 0}
+    assert all(page.from_cache for page in pages)
+    assert [page.text for page in pages][1] == "Page A\nB"
+    for path, headers in server.requests:
+        if path != "/robots.txt":
+            assert "If-None-Match" in headers and headers["If-Modified-Since"] == LAST_MODIFIED
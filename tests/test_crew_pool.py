@@ -0,0 +1,70 @@
+import pytest
+
+import pool_jobs
+from devops_support.data import seed
+from devops_support.orchestrator.crew_pool import CrewProcessPool, JobQueueFull, JobTimeout
+
+
+@pytest.fixture
+def pool():
+    pool = CrewProcessPool(workers=1, max_queue=2, warm=[], poll_interval=0.05)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_runs_jobs_in_a_warm_worker(pool):
+    first, second = pool.map([(pool_jobs.echo, {"n": 1}), (pool_jobs.echo, {"n": 2})])
+    assert first.result(60)["n"] == 1 and second.result(60)["n"] == 2
+    # One long-lived worker runs both
+    assert first.result()["pid"] == second.result()["pid"]
+    assert first.status == second.status == "done"
+
+
+def test_job_exception_fails_only_that_job(pool):
+    failed = pool.submit(pool_jobs.fail, {"message": "no app id"})
+    with pytest.raises(Exception, match="ValueError: no app id"):
+        failed.result(60)
+    assert failed.status == "failed"
+    assert pool.submit(pool_jobs.echo, {"n": 3}).result(60)["n"] == 3
+
+
+def test_timeout_replaces_the_worker(pool):
+    before = pool.submit(pool_jobs.echo).result(60)["pid"]
+    slow = pool.submit(pool_jobs.sleep, {"seconds": 60}, timeout=0.5)
+    with pytest.raises(JobTimeout):
+        slow.result(60)
+    assert slow.status == "timeout"
+    after = pool.submit(pool_jobs.echo).result(60)["pid"]
+    assert after != before
+    assert pool.workers == 1
+
+
+def test_worker_death_fails_the_job_and_the_pool_recovers(pool):
+    crashed = pool.submit(pool_jobs.crash, {"code": 3})
+    with pytest.raises(Exception, match="worker exited with code 3"):
+        crashed.result(60)
+    assert crashed.status == "failed"
+    assert pool.submit(pool_jobs.echo, {"n": 4}).result(60)["n"] == 4
+
+
+def test_queue_bound_and_cancel(pool):
+    running = pool.submit(pool_jobs.sleep, {"seconds": 60})
+    queued = [pool.submit(pool_jobs.echo, {"n": n}) for n in range(2)]
+    with pytest.raises(JobQueueFull):
+        pool.submit(pool_jobs.echo)
+    assert pool.cancel(queued[0]) and queued[0].future.cancelled()
+    assert pool.cancel(running)
+    assert queued[1].result(60)["n"] == 1
+    assert not pool.cancel(queued[1])
+
+
+def test_workers_share_the_mock_data_seed(pool):
+    assert pool.submit(pool_jobs.mock_seed, {}).result(60) == seed.MOCK_DATA_SEED
+
+
+def test_mock_data_seed_from_env(monkeypatch):
+    monkeypatch.setenv("MOCK_DATA_SEED", "42")
+    assert seed._env_seed() == 42
+    monkeypatch.setenv("MOCK_DATA_SEED", "forty-two")
+    with pytest.raises(ValueError, match="MOCK_DATA_SEED must be an integer, got 'forty-two'"):
+        seed._env_seed()
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import routes
+from api.executor import CrewExecutor, PoolSaturated, RequestTimeout
+from devops_support import response_cache
+
+
+def _wait_until(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def executor():
+    executor = CrewExecutor(workers=1, max_queue=1, timeout=5)
+    yield executor
+    executor.shutdown()
+
+
+def test_rejects_beyond_workers_and_queue(executor):
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: "queued")
+    assert executor.in_flight == 2
+    with pytest.raises(PoolSaturated):
+        executor.submit(lambda: "rejected")
+    release.set()
+    assert running.result(5) is True and queued.result(5) == "queued"
+    _wait_until(lambda: executor.in_flight == 0)
+    assert executor.submit(lambda: "admitted again").result(5) == "admitted again"
+
+
+def test_timeout_keeps_the_slot_until_the_job_finishes(executor):
+    release = threading.Event()
+    with pytest.raises(RequestTimeout):
+        asyncio.run(executor.run(release.wait, timeout=0.05))
+    # The kickoff cannot be interrupted: it still holds its worker
+    assert executor.in_flight == 1
+    release.set()
+    _wait_until(lambda: executor.in_flight == 0)
+    assert asyncio.run(executor.run(lambda x: x * 2, 21)) == 42
+
+
+@pytest.fixture
+def client(monkeypatch, executor):
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: None)
+    monkeypatch.setattr(routes, "fetch_splunk", lambda query, days: {"query": query, "days": days})
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.state.executor = executor
+    with TestClient(app) as client:
+        yield client
+
+
+def test_route_answers_from_the_pool(client, monkeypatch):
+    monkeypatch.setattr(routes, "run_splunk", lambda state: f"answer to {state['query']}")
+    response = client.post("/splunk", json={"query": "status of AuthService"})
+    assert response.status_code == 200
+    assert response.json() == {"source": "splunk", "query": "status of AuthService",
+                               "result": "answer to status of AuthService", "cached": False}
+
+
+def test_cache_hit_skips_the_fetch(client, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda cache=response_cache.ResponseCache(): cache)
+    monkeypatch.setattr(routes, "splunk_fingerprint", lambda query, days: "v1")
+    monkeypatch.setattr(routes, "fetch_splunk", lambda query, days: fetched.append(query) or {"query": query})
+    monkeypatch.setattr(routes, "run_splunk", lambda state: f"answer to {state['query']}")
+    first = client.post("/splunk", json={"query": "status of AuthService"}).json()
+    second = client.post("/splunk", json={"query": "Status of AuthService?"}).json()
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["result"] == "answer to status of AuthService"
+    assert fetched == ["status of AuthService"]
+
+
+def test_route_maps_saturation_to_429_without_fetching(client, executor, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(routes, "fetch_splunk", lambda query, days: fetched.append(query))
+    release = threading.Event()
+    executor.submit(release.wait)
+    executor.submit(release.wait)
+    try:
+        response = client.post("/splunk", json={"query": "status of AuthService"})
+    finally:
+        release.set()
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert fetched == []
+
+
+def test_slow_fetch_is_covered_by_the_timeout(client, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(routes, "fetch_splunk", lambda query, days: release.wait())
+    try:
+        response = client.post("/splunk", json={"query": "status of AuthService", "timeout": 0.05})
+    finally:
+        release.set()
+    assert response.status_code == 504
+
+
+def test_route_maps_timeout_to_504(client, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(routes, "run_splunk", lambda state: release.wait())
+    try:
+        response = client.post("/splunk", json={"query": "status of AuthService", "timeout": 0.05})
+    finally:
+        release.set()
+    assert response.status_code == 504
+
+
+def test_route_maps_crew_errors_to_500(client, monkeypatch):
+    def fail(state):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(routes, "run_splunk", fail)
+    response = client.post("/splunk", json={"query": "status of AuthService"})
+    assert response.status_code == 500
+    assert "LLM unavailable" in response.json()["detail"]
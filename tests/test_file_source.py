@@ -0,0 +1,81 @@
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from devops_support.data.file_source import FileLogSource, iter_record_texts, iter_records
+from devops_support.data.splunk_api import SPLUNK_SCHEMA
+
+RECORDS = [
+    {"timestamp": "2024-01-01T00:00:00Z", "level": "INFO", "application": "AuthService", "host": "host1",
+     "message": "User {42} logged in"},
+    {"timestamp": "2024-01-02T06:00:00Z", "level": "ERROR", "application": "AuthService", "host": "host2",
+     "message": 'Token "abc}" rejected'},
+    {"timestamp": "2024-01-03T00:00:00Z", "level": "WARNING", "application": "PaymentService", "host": "host1",
+     "message": "Retry {\n} payment"},
+]
+
+FORMATS = {
+    "jsonl": "\n".join(json.dumps(record) for record in RECORDS) + "\n",
+    "array": json.dumps(RECORDS, indent=2),
+    "compact_array": json.dumps(RECORDS),
+    "python_literal": repr(RECORDS),
+}
+
+
+@pytest.mark.parametrize("fmt", sorted(FORMATS))
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_iter_record_texts(fmt, chunk_size):
+    # Small chunks cut records and quoted strings (with braces inside) across reads
+    texts = list(iter_record_texts(io.StringIO(FORMATS[fmt]), chunk_size))
+    assert len(texts) == len(RECORDS)
+    assert all(text.startswith("{") and text.endswith("}") for text in texts)
+
+
+@pytest.mark.parametrize("fmt", sorted(FORMATS))
+@pytest.mark.parametrize("compress", [False, True])
+def test_iter_records_parses_every_format(tmp_path, fmt, compress):
+    path = tmp_path / f"dump.{fmt}"
+    data = FORMATS[fmt].encode("utf-8")
+    path.write_bytes(gzip.compress(data) if compress else data)
+    assert list(iter_records(str(path), chunk_size=16)) == RECORDS
+    assert [record["host"] for record in iter_records(str(path), contains="PaymentService")] == ["host1"]
+
+
+def test_iter_record_texts_empty_stream():
+    assert list(iter_record_texts(io.StringIO(""))) == []
+    assert list(iter_record_texts(io.StringIO("[]"))) == []
+
+
+def test_file_source_windows_end_at_newest_entry(tmp_path):
+    path = tmp_path / "dump.jsonl.gz"
+    path.write_bytes(gzip.compress(FORMATS["jsonl"].encode("utf-8")))
+    source = FileLogSource(str(path))
+    assert [r["level"] for r in source.get_logs("AuthService", 1)] == ["ERROR"]
+    assert [r["level"] for r in source.get_logs("AuthService", 5)] == ["INFO", "ERROR"]
+    assert source.get_logs("AuthService", 0) == []
+    many = source.get_logs_many(None, 5)
+    assert {app: len(entries) for app, entries in many.items()} == {"AuthService": 2, "PaymentService": 1}
+    assert source.get_logs_many(["Nope"], 5) == {"Nope": []}
+
+
+def test_file_source_windows_end_at_now(tmp_path):
+    path = tmp_path / "dump.jsonl"
+    path.write_text(FORMATS["jsonl"])
+    source = FileLogSource(str(path), now=datetime(2024, 1, 2, 12, tzinfo=timezone.utc))
+    assert [r["level"] for r in source.get_logs("AuthService", 1)] == ["ERROR"]
+    assert source.get_logs("PaymentService", 5) == []
+    assert {app: len(entries) for app, entries in source.get_logs_many(None, 5).items()} == {"AuthService": 2}
+
+
+def test_file_source_store_is_shared_and_reloaded(tmp_path):
+    path = tmp_path / "dump.jsonl"
+    path.write_text(FORMATS["jsonl"])
+    source = FileLogSource(str(path))
+    store = source.store(SPLUNK_SCHEMA)
+    assert source.store(SPLUNK_SCHEMA) is store and len(store.batch) == 3
+    path.write_text(FORMATS["jsonl"] + json.dumps(RECORDS[0]) + "\n")
+    reloaded = source.store(SPLUNK_SCHEMA)
+    assert reloaded is not store and len(reloaded.batch) == 4
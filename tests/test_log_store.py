@@ -0,0 +1,127 @@
+import threading
+from datetime import datetime, timezone
+
+from devops_support.data.columnar import parse_timestamp
+from devops_support.data.datadog_api import DATADOG_SCHEMA
+from devops_support.data.log_store import LogStore
+from devops_support.data.splunk_api import SPLUNK_SCHEMA
+
+NOW = datetime(2024, 1, 10, tzinfo=timezone.utc)
+
+
+def _entry(day: int, message: str, app: str = "AuthService", hour: int = 0) -> dict:
+    return {"timestamp": f"2024-01-{day:02d}T{hour:02d}:00:00Z", "level": "INFO", "application": app,
+            "host": "host1", "message": message}
+
+
+def _messages(entries):
+    return [entry["message"] for entry in entries]
+
+
+def _store(*entries) -> LogStore:
+    store = LogStore(SPLUNK_SCHEMA)
+    store.add_many(entries)
+    return store
+
+
+def test_query_window_is_sorted_and_bounded():
+    # Added out of time order
+    store = _store(_entry(9, "d9"), _entry(2, "d2"), _entry(8, "d8"), _entry(5, "d5"), _entry(9, "other", app="Pay"))
+    assert _messages(store.query("AuthService", 3, now=NOW)) == ["d8", "d9"]
+    assert _messages(store.query("AuthService", 30, now=NOW)) == ["d2", "d5", "d8", "d9"]
+    assert store.query("Unknown", 30, now=NOW) == []
+    start, end = parse_timestamp("2024-01-05T00:00:00Z"), parse_timestamp("2024-01-08T00:00:00Z")
+    assert _messages(store.query_between("AuthService", start, end)) == ["d5", "d8"]
+
+
+def test_query_many_and_app_id():
+    store = _store(_entry(2, "a"), _entry(3, "p", app="Pay"))
+    start = parse_timestamp("2024-01-01T00:00:00Z")
+    result = store.query_many(["AuthService", "Pay", "Nope"], start)
+    messages = {app: _messages(entries) for app, entries in result.items()}
+    assert messages == {"AuthService": ["a"], "Pay": ["p"], "Nope": []}
+    assert sorted(store.query_many(None, start)) == ["AuthService", "Pay"]
+
+    datadog = LogStore(DATADOG_SCHEMA)
+    datadog.add({"type": "log", "timestamp": "2024-01-09T00:00:00.000Z", "level": "ERROR", "message": "boom",
+                 "host": "h", "tags": ["app:web", "app_id:app-001"]})
+    assert _messages(datadog.query_app_id("app-001", 2, now=NOW)) == ["boom"]
+    assert datadog.query_app_id("app-001", 2, now=NOW)[0]["tags"] == ["app:web", "app_id:app-001"]
+
+
+def test_read_since_resumes_from_cursor():
+    store = _store(_entry(2, "a"), _entry(3, "b"))
+    entries, cursor = store.read_since("AuthService")
+    assert _messages(entries) == ["a", "b"]
+    assert store.read_since("AuthService", cursor) == ([], cursor)
+
+    # A late entry (older timestamp) still comes after the cursor, in time order
+    store.add_many([_entry(4, "d"), _entry(1, "late"), _entry(4, "other", app="Pay")])
+    entries, next_cursor = store.read_since("AuthService", cursor)
+    assert _messages(entries) == ["late", "d"]
+    assert store.read_since("AuthService", next_cursor)[0] == []
+
+
+def test_read_since_watermark_and_foreign_cursor():
+    store = _store(_entry(2, "a"), _entry(3, "b"), _entry(4, "c"))
+    assert _messages(store.read_since("AuthService", since="2024-01-03T00:00:00Z")[0]) == ["c"]
+    since = datetime(2024, 1, 2, 12, tzinfo=timezone.utc)
+    assert _messages(store.read_since("AuthService", since=since)[0]) == ["b", "c"]
+    # A token from another store (e.g. a regenerated dataset) is ignored: everything is returned
+    _, foreign = _store(_entry(2, "x")).read_since("AuthService")
+    assert _messages(store.read_since("AuthService", foreign)[0]) == ["a", "b", "c"]
+    entries, cursor = store.read_since("Unknown")
+    assert entries == [] and cursor == store.cursor()
+
+
+def test_follow_yields_new_entries_and_keeps_cursor():
+    store = _store(_entry(2, "a"))
+    stop = threading.Event()
+    tail = store.follow("AuthService", poll_interval=0.05, idle_timeout=2, stop=stop)
+    seen = []
+
+    def feed():
+        store.add(_entry(3, "b"))
+
+    for entry in tail:
+        seen.append(entry["message"])
+        if len(seen) == 1:
+            threading.Timer(0.05, feed).start()
+        else:
+            stop.set()
+    assert seen == ["a", "b"]
+    store.add(_entry(4, "c"))
+    assert _messages(store.read_since("AuthService", tail.cursor)[0]) == ["c"]
+
+
+def test_follow_ends_after_idle_timeout():
+    store = _store(_entry(2, "a"))
+    assert _messages(store.follow("AuthService", poll_interval=0.05, idle_timeout=0.1)) == ["a"]
+
+
+def test_follow_resumes_mid_batch_without_replaying():
+    store = _store(_entry(2, "a"), _entry(3, "b"), _entry(4, "other", app="Pay"), _entry(1, "late"), _entry(5, "c"))
+    tail = store.follow("AuthService", idle_timeout=0)
+    seen = []
+    for entry in tail:
+        seen.append(entry["message"])
+        if len(seen) == 2:
+            break
+    # Arrival order: the late entry comes where it was added
+    assert seen == ["a", "b"]
+    resumed = store.follow("AuthService", cursor=tail.cursor, idle_timeout=0)
+    assert _messages(resumed) == ["late", "c"]
+    assert store.read_since("AuthService", resumed.cursor)[0] == []
+
+
+def test_window_version_changes_with_the_window_content():
+    store = _store(_entry(2, "a"), _entry(5, "b"))
+    start = parse_timestamp("2024-01-03T00:00:00Z")
+    version = store.window_version("AuthService", start)
+    assert store.window_version("AuthService", start) == version
+    # Same entries in a wider window: same version
+    assert store.window_version("AuthService", parse_timestamp("2024-01-04T00:00:00Z")) == version
+    assert store.window_version("AuthService", parse_timestamp("2024-01-01T00:00:00Z")) != version
+    store.add(_entry(6, "c"))
+    assert store.window_version("AuthService", start) != version
+    assert store.query_version("Unknown", 3, now=NOW) == store.window_version("Unknown", 0)
@@ -0,0 +1,49 @@
+import threading
+
+from devops_support.session_memory import SessionMemory, SqliteSessionStore
+
+
+class SlowStore(SqliteSessionStore):
+    """Store whose load of the "slow" session waits until released."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.loading = threading.Event()
+        self.release = threading.Event()
+
+    def load(self, session_id: str):
+        if session_id == "slow":
+            self.loading.set()
+            assert self.release.wait(5)
+        return super().load(session_id)
+
+
+def test_evicted_session_is_reloaded_from_the_store(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.sqlite"))
+    memory = SessionMemory(max_sessions=1, store=store)
+    memory.append("a", {"query": "q1", "answer": "a1"})
+    memory.set("a", "app", "AuthService")
+    memory.append("b", {"query": "q2", "answer": "a2"})
+    assert list(memory._sessions) == ["b"]
+    assert memory.history("a") == [{"query": "q1", "answer": "a1"}]
+    assert memory.get("a", "app") == "AuthService"
+
+
+def test_loading_a_session_does_not_block_the_others(tmp_path):
+    store = SlowStore(str(tmp_path / "sessions.sqlite"))
+    memory = SessionMemory(store=store)
+    memory.append("fast", {"query": "q"})
+    loader = threading.Thread(target=memory.history, args=("slow",))
+    loader.start()
+    try:
+        assert store.loading.wait(5)
+        # The slow load holds no lock: another session is served meanwhile
+        done = threading.Thread(target=memory.append, args=("fast", {"query": "q2"}))
+        done.start()
+        done.join(5)
+        assert not done.is_alive()
+        assert len(memory.history("fast")) == 2
+    finally:
+        store.release.set()
+        loader.join(5)
+    assert memory.history("slow") == []
@@ -0,0 +1,58 @@
+from devops_support.analysis.templates import WILDCARD, TemplateMiner, mask_variables
+
+
+def test_mask_variables():
+    assert mask_variables("User 42 took 1.5s") == f"User {WILDCARD} took {WILDCARD}s"
+    assert mask_variables("req 123e4567-e89b-12d3-a456-426614174000 at 0xff") == f"req {WILDCARD} at {WILDCARD}"
+    assert mask_variables("Cache cleared") == "Cache cleared"
+
+
+def test_repeats_with_different_values_share_a_template():
+    miner = TemplateMiner()
+    for user in (101, 102, 103):
+        miner.add(f"User {user} successfully logged in.", "INFO", f"2024-01-0{user - 100}T00:00:00Z", "host1")
+    miner.add("User 104 successfully logged in.", "INFO", "2024-01-09T00:00:00Z", "host2")
+    assert len(miner) == 1
+    cluster = miner.clusters[0]
+    assert cluster.template == f"User {WILDCARD} successfully logged in."
+    assert cluster.count == 4
+    assert cluster.parameter_values() == [["101", "102", "103", "104"]]
+    assert (cluster.first_seen, cluster.last_seen) == ("2024-01-01T00:00:00Z", "2024-01-09T00:00:00Z")
+    assert cluster.hosts == {"host1", "host2"}
+
+
+def test_differing_word_becomes_a_wildcard():
+    miner = TemplateMiner()
+    first = miner.add("Connection to db-primary lost after timeout")
+    second = miner.add("Connection to db-replica lost after timeout")
+    assert first is second
+    assert first.template == f"Connection to {WILDCARD} lost after timeout"
+    assert first.parameter_values() == [["db-primary", "db-replica"]]
+
+
+def test_levels_lengths_and_dissimilar_messages_stay_apart():
+    miner = TemplateMiner()
+    miner.add("Database connection lost", "ERROR")
+    miner.add("Database connection lost", "INFO")
+    miner.add("Database connection lost again today", "ERROR")
+    miner.add("Out of memory error", "ERROR")
+    assert len(miner) == 4
+    assert [cluster.level for cluster in miner.clusters] == ["ERROR", "INFO", "ERROR", "ERROR"]
+
+
+def test_later_messages_join_the_generalized_template():
+    miner = TemplateMiner(similarity=0.5)
+    general = miner.add("job alpha done ok")
+    miner.add("job beta done ok")
+    assert general.template == f"job {WILDCARD} done ok"
+    assert miner.add("job gamma done ok") is general
+    assert len(miner) == 1
+
+
+def test_add_entries_uses_accessors():
+    entries = [{"message": f"Order {n} shipped", "level": "info", "timestamp": f"2024-01-0{n}T00:00:00Z",
+                "host": "h"} for n in range(1, 4)]
+    miner = TemplateMiner().add_entries(entries, lambda e: e["message"], lambda e: e["level"].upper())
+    assert len(miner) == 1
+    assert miner.clusters[0].count == 3
+    assert miner.clusters[0].level == "INFO"